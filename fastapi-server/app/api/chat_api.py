@@ -1,12 +1,42 @@
 from fastapi import APIRouter
 from app.schemas.chat import AgentRequest, AgentResponse, ChatResponse
 from app.services.chatbot import get_bot_response_with_new_history
+from app.services.chat_sessions import chat_sessions, trim_history
 from pydantic_ai.messages import ModelMessage
 
 router = APIRouter()
 
+
+def with_context(message: str, context: str) -> str:
+    return f"Context: {context}\n Query: {message}"
+
+
 @router.post("/", response_model=ChatResponse)
-def chat_endpoint(request: AgentRequest, history: list[ModelMessage] = []) -> ChatResponse:
-    chat_response, new_history = get_bot_response_with_new_history(request, history)
-    print("New History:", new_history)
+def chat_endpoint(request: AgentRequest, history: list[ModelMessage] | None = None) -> ChatResponse:
+    if request.chat_id is None or request.user_id is None:
+        if request.context:
+            request.message = with_context(request.message, request.context)
+        try:
+            chat_response, new_history = get_bot_response_with_new_history(request, history or [])
+        finally:
+            # Nothing refers to this request's data once it is answered
+            request.deps.close()
+        print("New History:", new_history)
+        return chat_response
+
+    # Follow-up turns reuse the chat's history and the DataFrames it already loaded
+    session = chat_sessions.get(request.user_id, request.chat_id, request.deps.mode)
+    with session.lock:
+        session.deps.plots_data = []
+        message = request.message
+        if not session.history and request.context:
+            # New or evicted session: the client's text context stands in for the lost history
+            message = with_context(message, request.context)
+        chat_response, new_history = get_bot_response_with_new_history(
+            AgentRequest(message=message, deps=session.deps, chat_id=request.chat_id, user_id=request.user_id),
+            trim_history(session.history),
+        )
+        session.history.extend(new_history)
+        session.history = trim_history(session.history)
+        session.turns += 1
     return chat_response
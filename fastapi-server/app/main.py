@@ -4,6 +4,13 @@ import uvicorn
 from sqlalchemy import text
 from app.db import engine
 from loguru import logger
+from app.services.argo_cache import argo_cache
+from app.services.prefetch import prefetcher
+from app.services.session_store import memory_budget
+from app.services.chat_sessions import chat_sessions
+from app.services.duckdb_session import query_cache_summary
+from app.services.source_health import source_health
+from app.services.tools import fetch_flights
 
 from contextlib import asynccontextmanager
 @asynccontextmanager
@@ -11,9 +18,12 @@ async def lifespan(app: FastAPI):
     """Handle startup and shutdown events"""
     # Startup
     logger.info("Starting up the application...")
+    prefetcher.start()
     yield
     # Shutdown
     logger.info("Shutting down the application...")
+    await prefetcher.stop()
+    argo_cache.flush()
 
 app = FastAPI(
     title="FloatChat API",
@@ -38,6 +48,19 @@ def root():
     return {"message": "Welcome to the FloatChat API. Use the /chat endpoint to interact with the AI assistant."}
     # The chat endpoint is defined at app.api.chat.router
 
+@app.get("/status")
+def get_status():
+    """Data layer health: prefetch progress, cache usage, in-flight fetches, source circuits, session memory, chat sessions and DuckDB query results."""
+    return {
+        "prefetch": prefetcher.summary(),
+        "cache": argo_cache.summary(),
+        "fetches": fetch_flights.summary(),
+        "sources": source_health.summary(),
+        "session_memory": memory_budget.summary(),
+        "chat_sessions": chat_sessions.summary(),
+        "query_cache": query_cache_summary(),
+    }
+
 @app.get("/count")
 async def get_count():
     with engine.connect() as conn:
@@ -2,8 +2,12 @@ from pydantic import BaseModel, Field, model_validator
 from typing_extensions import Self
 from dataclasses import dataclass, field
 from enum import Enum
+import threading
 import pandas as pd
+import pyarrow as pa
 from pydantic_ai import ModelRetry
+from app.services.duckdb_session import DuckDBSession
+from app.services.session_store import SessionStore
 #from argopy import DataFetcher as ArgopyDataFetcher
 
 kinds = {'line', 'bar', 'scatter'}
@@ -38,12 +42,43 @@ class Plot_Data(BaseModel):
 @dataclass
 class AgentDependencies:
     mode: UserMode = field(default_factory=lambda: UserMode.HYBRID, metadata={"description": "User mode: can be HYBRID, STUDENT, or RESEARCHER."})
-    output: dict[str, pd.DataFrame] = field(default_factory=dict)
+    output: SessionStore = field(default_factory=SessionStore, metadata={"description": "Memory-bounded Out[n] -> DataFrame store."})
     plots_data: list[Plot_Data] = field(default_factory=list, metadata={"description": "List of plot data to be rendered on the frontend. NOT to be edited or used or read by the LLM."})
+    ref_count: int = field(default=0, metadata={"description": "Number of Out[n] references handed out so far."})
+    reserved_refs: dict[str, str] = field(default_factory=dict, metadata={"description": "Out[n] reference reserved for each tool call id."})
+    duckdb: DuckDBSession = field(default_factory=DuckDBSession, repr=False, metadata={"description": "DuckDB connection on which the stored DataFrames are registered."})
+    _ref_lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False, metadata={"description": "Guards ref_count and reserved_refs: sync tools run in worker threads."})
 
-    def store_dataframe(self, value: pd.DataFrame) -> str:
+    def __post_init__(self):
+        self.ref_count = max(self.ref_count, len(self.output))
+        # A spilled or replaced reference must not stay registered (and resident) in DuckDB
+        self.output.release_callbacks.append(self.duckdb.unregister)
+
+    def close(self) -> None:
+        """Free the stored DataFrames, their spill files and the DuckDB connection."""
+        self.output.close()
+        self.duckdb.close()
+
+    def next_ref(self) -> str:
+        """Hand out the next Out[n] reference."""
+        with self._ref_lock:
+            self.ref_count += 1
+            return f'Out[{self.ref_count}]'
+
+    def reserve_refs(self, tool_call_ids: list[str]) -> None:
+        """Reserve Out[n] references for tool calls, in the given order.
+
+        Tools of one model turn run concurrently and finish in any order; reserving the
+        references up front in call order keeps the numbering deterministic.
+        """
+        with self._ref_lock:
+            for tool_call_id in tool_call_ids:
+                if tool_call_id not in self.reserved_refs:
+                    self.reserved_refs[tool_call_id] = self.next_ref()
+
+    def store_dataframe(self, value: pd.DataFrame, ref: str | None = None) -> str:
         """Store the output in deps and return the reference such as Out[1] to be used by the LLM."""
-        ref = f'Out[{len(self.output) + 1}]'
+        ref = ref or self.next_ref()
         self.output[ref] = value
         return ref
     
@@ -51,16 +86,31 @@ class AgentDependencies:
         """Store the plot data in deps to be sent to the frontend."""
         self.plots_data.append(plot_data)
 
-    def get(self, ref: str) -> pd.DataFrame:
+    def _check_ref(self, ref: str) -> None:
         if ref not in self.output:
             raise ModelRetry(
                 f'Error: {ref} is not a valid variable reference. Check the previous messages and try again.'
             )
+
+    def get(self, ref: str) -> pd.DataFrame:
+        self._check_ref(ref)
         return self.output[ref]
 
+    def get_table(self, ref: str) -> pa.Table | pd.DataFrame:
+        """The stored data as Arrow, without converting it to pandas (eg. for DuckDB)."""
+        self._check_ref(ref)
+        return self.output.get_table(ref)
+
+    def head(self, ref: str, n: int = 5) -> pd.DataFrame:
+        self._check_ref(ref)
+        return self.output.head(ref, n)
+
 class AgentRequest(BaseModel):
     message: str = Field(..., description="User's message to the assistant.")
     deps: AgentDependencies = Field(..., description="Dependencies for the agent.")
+    chat_id: str | None = Field(default=None, description="Chat id; turns of the same chat share their message history and loaded data.")
+    user_id: str | None = Field(default=None, description="Authenticated user owning the chat; sessions are only kept for chats with one.")
+    context: str | None = Field(default=None, description="Earlier messages of the chat as text, used only when the server holds no history for it.")
 
     class Config:
         arbitrary_types_allowed = True # AgentDependencies contains a pd.DataFrame which is not a pydantic type
@@ -0,0 +1,128 @@
+"""Read-only DuckDB access to the whole local Argo archive for the `query_argo_archive` tool.
+
+The archive is exposed as one view, `archive`, over either
+- the hive-partitioned Parquet dataset written by `utils/profiles.py --format parquet`
+  (`year=YYYY/month=M/*.parquet`): DuckDB prunes partitions from `year`/`month` filters
+  and skips row groups using the Parquet statistics, or
+- the `argo_profiles` table, through DuckDB's Postgres scanner, which sends the selected
+  columns and the filters to PostgreSQL.
+Either way only the columns and rows a query needs are read, so archive-wide aggregates
+never go through pandas or the network.
+
+The connection is locked down once the view exists: no file access outside the Parquet
+root, no writes to PostgreSQL, and no configuration changes from the queries. It is shared
+by every session, so only single SELECT statements are run on it (a `CREATE OR REPLACE VIEW
+archive ...` would change the archive for everyone).
+"""
+from pathlib import Path
+import os
+import threading
+import time
+
+import duckdb
+import pandas as pd
+from loguru import logger
+
+from app.db import DB_HOST, DB_NAME, DB_PASS, DB_PORT, DB_USER
+
+BASE_DIR = Path(__file__).parent
+
+PARQUET_ROOT = Path(os.getenv('ARGO_PARQUET_ROOT', str(BASE_DIR.parents[1] / 'utils' / 'argo_parquet')))
+# 'parquet', 'postgres', or 'auto': the Parquet dataset if it exists, else PostgreSQL
+ARCHIVE_BACKEND = os.getenv('ARGO_ARCHIVE_BACKEND', 'auto')
+MAX_ARCHIVE_ROWS = int(os.getenv('ARGO_ARCHIVE_MAX_ROWS', '1000000'))
+
+ARCHIVE_TABLE = 'archive'
+
+# argo_profiles columns also present in the Parquet dataset (the PostGIS `location` is left out)
+POSTGRES_COLUMNS = [
+    'float_id', 'cycle_number', 'datetime', 'latitude', 'longitude', 'pressure', 'temperature', 'salinity',
+    'pressure_qc', 'temperature_qc', 'salinity_qc', 'data_mode',
+]
+
+
+def postgres_dsn() -> str:
+    """libpq connection string of the app database."""
+    def quote(value: str) -> str:
+        return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+    return f"host={quote(DB_HOST)} port={quote(DB_PORT)} dbname={quote(DB_NAME)} user={quote(DB_USER)} password={quote(DB_PASS)}"
+
+
+class ArgoArchive:
+    """Lazily connected, read-only DuckDB view of the local archive."""
+
+    def __init__(self, backend: str = ARCHIVE_BACKEND, parquet_root: Path = PARQUET_ROOT):
+        self.requested_backend = backend
+        self.parquet_root = parquet_root
+        self.backend: str | None = None
+        self._con: duckdb.DuckDBPyConnection | None = None
+        self._lock = threading.Lock()
+
+    def _has_parquet(self) -> bool:
+        return self.parquet_root.is_dir() and any(self.parquet_root.glob('**/*.parquet'))
+
+    def _connect(self) -> duckdb.DuckDBPyConnection:
+        backend = self.requested_backend
+        if backend == 'auto':
+            backend = 'parquet' if self._has_parquet() else 'postgres'
+
+        con = duckdb.connect()
+        if backend == 'parquet':
+            if not self._has_parquet():
+                raise FileNotFoundError(f"No Parquet archive under {self.parquet_root}; convert files with utils/profiles.py --format parquet.")
+            root = self.parquet_root.resolve()
+            con.execute(f"""
+                CREATE VIEW {ARCHIVE_TABLE} AS
+                SELECT * FROM read_parquet('{root}/**/*.parquet', hive_partitioning = true, union_by_name = true)
+            """)
+            con.execute(f"SET allowed_directories = ['{root}/']")
+        elif backend == 'postgres':
+            con.execute("INSTALL postgres")
+            con.execute("LOAD postgres")
+            con.execute("ATTACH ? AS pg (TYPE postgres, READ_ONLY)", [postgres_dsn()])
+            con.execute("SET pg_experimental_filter_pushdown = true")
+            con.execute(f"CREATE VIEW {ARCHIVE_TABLE} AS SELECT {', '.join(POSTGRES_COLUMNS)} FROM pg.public.argo_profiles")
+        else:
+            raise ValueError(f"Unknown archive backend {backend!r}; use 'parquet', 'postgres' or 'auto'.")
+
+        con.execute("SET enable_external_access = false")
+        con.execute("SET lock_configuration = true")
+        self.backend = backend
+        logger.info(f"Connected the Argo archive ({backend})")
+        return con
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """A cursor on the shared connection; each thread querying needs its own."""
+        with self._lock:
+            if self._con is None:
+                self._con = self._connect()
+            return self._con.cursor()
+
+    def columns(self) -> list[str]:
+        with self.cursor() as cur:
+            return [row[0] for row in cur.sql(f"DESCRIBE {ARCHIVE_TABLE}").fetchall()]
+
+    @staticmethod
+    def select_statement(sql: str) -> str:
+        """`sql` if it is exactly one SELECT statement; raises ValueError otherwise."""
+        statements = duckdb.extract_statements(sql)
+        if len(statements) != 1:
+            raise ValueError(f"Expected one SQL statement, got {len(statements)}; send a single SELECT query.")
+        if statements[0].type != duckdb.StatementType.SELECT:
+            raise ValueError(f"Only SELECT queries can run on the archive, not {statements[0].type.name}.")
+        return statements[0].query
+
+    def query(self, sql: str, max_rows: int = MAX_ARCHIVE_ROWS) -> tuple[pd.DataFrame, bool, float]:
+        """Run `sql` against the archive.
+        Returns:
+            At most `max_rows` rows of the result, whether it was cut there, and the time taken.
+        """
+        statement = self.select_statement(sql)
+        start = time.perf_counter()
+        with self.cursor() as cur:
+            df = cur.sql(statement).limit(max_rows + 1).df()  # pyright: ignore[reportUnknownMemberType]
+        truncated = len(df) > max_rows
+        return df.iloc[:max_rows], truncated, time.perf_counter() - start
+
+
+argo_archive = ArgoArchive()
@@ -0,0 +1,263 @@
+"""On-disk Parquet cache for Argo data fetched by the agent tools.
+
+Each entry is one DataFrame stored as `<key hash>.parquet` under the cache directory,
+described in a JSON index (`_index.json`) with its size, creation time, last access
+time and TTL. The cache is bounded by a byte budget and evicts least recently used
+entries first; expired entries are treated as misses and removed.
+
+Hits read their file outside the cache lock and only touch the in-memory index; access
+times reach `_index.json` on the next put or eviction, at most INDEX_SAVE_INTERVAL
+seconds later, or on `flush()`.
+"""
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Callable
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+from loguru import logger
+
+BASE_DIR = Path(__file__).parent
+
+CACHE_DIR = Path(os.getenv('ARGO_CACHE_DIR', str(BASE_DIR / 'cache')))
+CACHE_MAX_BYTES = int(os.getenv('ARGO_CACHE_MAX_BYTES', str(2 * 1024**3)))  # 2 GiB
+CACHE_DEFAULT_TTL = int(os.getenv('ARGO_CACHE_TTL', str(7 * 24 * 3600)))  # 7 days, in seconds
+
+INDEX_NAME = '_index.json'
+INDEX_SAVE_INTERVAL = 60.0  # seconds between index writes caused by hits alone
+
+
+def cache_key(tool: str, **params) -> str:
+    """Build a stable cache key from the tool name and its (JSON-serializable) parameters.
+
+    Eg. cache_key('float', float_id=6902746, dataset='phy', source='erddap', mode='standard')
+    """
+    payload = json.dumps({'tool': tool, **params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    size: int
+    created: float
+    last_access: float
+    ttl: float
+    description: str = ''
+
+    def expired(self, now: float) -> bool:
+        return now - self.created > self.ttl
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+    writes: int = 0
+    errors: int = 0
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class ArgoCache:
+    """Parquet-backed LRU cache with per-entry TTL and a total size budget."""
+    root: Path = field(default_factory=lambda: CACHE_DIR)
+    max_bytes: int = CACHE_MAX_BYTES
+    default_ttl: float = CACHE_DEFAULT_TTL
+    stats: CacheStats = field(default_factory=CacheStats)
+
+    def __post_init__(self):
+        self.root = Path(self.root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._entries: dict[str, CacheEntry] = self._load_index()
+        self._dirty = False
+        self._saved_at = time.time()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f'{key}.parquet'
+
+    def _load_index(self) -> dict[str, CacheEntry]:
+        index_path = self.root / INDEX_NAME
+        if not index_path.exists():
+            return {}
+        try:
+            raw = json.loads(index_path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache index {index_path}: {e}")
+            return {}
+        # Drop entries whose file is gone (eg. cleaned up by hand)
+        return {
+            key: CacheEntry(**entry) for key, entry in raw.items()
+            if self._path(key).exists()
+        }
+
+    def _save_index(self) -> None:
+        index_path = self.root / INDEX_NAME
+        tmp_path = self.root / f'.{INDEX_NAME}.tmp'
+        tmp_path.write_text(json.dumps({key: asdict(entry) for key, entry in self._entries.items()}))
+        os.replace(tmp_path, index_path)
+        self._dirty = False
+        self._saved_at = time.time()
+
+    def _save_index_lazily(self) -> None:
+        self._dirty = True
+        if time.time() - self._saved_at > INDEX_SAVE_INTERVAL:
+            self._save_index()
+
+    def flush(self) -> None:
+        """Write pending access times to the index, eg. at shutdown."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def _remove(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._path(key).unlink(missing_ok=True)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.size for entry in self._entries.values())
+
+    def expires_in(self, key: str) -> float | None:
+        """Seconds until the entry for `key` expires (negative once expired), or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry.created + entry.ttl - time.time()
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """Return the cached DataFrame for `key`, or None on a miss or an expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.time()
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            if entry.expired(now):
+                self.stats.misses += 1
+                self.stats.expired += 1
+                self._remove(key)
+                self._save_index_lazily()
+                return None
+
+        # Concurrent hits read in parallel; a put of the same key swaps the file atomically
+        try:
+            df = pd.read_parquet(self._path(key))
+        except Exception as e:
+            with self._lock:
+                self.stats.misses += 1
+                # Unless the entry was evicted or replaced meanwhile, its file is broken
+                if self._entries.get(key) is entry:
+                    logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+                    self.stats.errors += 1
+                    self._remove(key)
+                    self._save_index_lazily()
+            return None
+
+        with self._lock:
+            entry.last_access = now
+            self.stats.hits += 1
+            self._save_index_lazily()
+        return df
+
+    def put(self, key: str, df: pd.DataFrame, ttl: float | None = None, description: str = '') -> bool:
+        """Store `df` under `key`, evicting least recently used entries to stay within budget.
+
+        Returns False (and caches nothing) if the DataFrame cannot be written as Parquet
+        or is larger than the whole budget.
+        """
+        path = self._path(key)
+        tmp_path = self.root / f'.{key}.parquet.tmp'
+        try:
+            df.to_parquet(tmp_path, index=False)
+        except Exception as e:
+            logger.warning(f"Not caching {description or key}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            with self._lock:
+                self.stats.errors += 1
+            return False
+
+        size = tmp_path.stat().st_size
+        if size > self.max_bytes:
+            tmp_path.unlink(missing_ok=True)
+            logger.info(f"Not caching {description or key}: {size} bytes exceeds the cache budget")
+            return False
+
+        with self._lock:
+            os.replace(tmp_path, path)
+            now = time.time()
+            self._entries[key] = CacheEntry(
+                key=key,
+                size=size,
+                created=now,
+                last_access=now,
+                ttl=self.default_ttl if ttl is None else ttl,
+                description=description,
+            )
+            self.stats.writes += 1
+            self._evict(keep=key)
+            self._save_index()
+        return True
+
+    def _evict(self, keep: str) -> None:
+        """Drop expired entries, then least recently used ones until the budget is met."""
+        now = time.time()
+        for key in [key for key, entry in self._entries.items() if entry.expired(now) and key != keep]:
+            self._remove(key)
+            self.stats.expired += 1
+
+        total = sum(entry.size for entry in self._entries.values())
+        for entry in sorted(self._entries.values(), key=lambda entry: entry.last_access):
+            if total <= self.max_bytes:
+                break
+            if entry.key == keep:
+                continue
+            total -= entry.size
+            self._remove(entry.key)
+            self.stats.evictions += 1
+
+    def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], pd.DataFrame],
+        ttl: float | None = None,
+        description: str = '',
+    ) -> tuple[pd.DataFrame, bool]:
+        """Return `(df, hit)`: the cached DataFrame, or the result of `fetch()` after caching it."""
+        df = self.get(key)
+        if df is not None:
+            logger.info(f"Cache hit for {description or key}")
+            return df, True
+
+        df = fetch()
+        self.put(key, df, ttl=ttl, description=description)
+        return df, False
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+            self._save_index()
+
+    def summary(self) -> dict:
+        """Hit/miss counters and current usage, eg. for a status endpoint."""
+        with self._lock:
+            return {
+                **asdict(self.stats),
+                'hit_rate': round(self.stats.hit_rate(), 3),
+                'entries': len(self._entries),
+                'bytes': sum(entry.size for entry in self._entries.values()),
+                'max_bytes': self.max_bytes,
+            }
+
+
+argo_cache = ArgoCache()
@@ -0,0 +1,216 @@
+"""Local catalog of Argo profiles for fast float/cycle discovery.
+
+The catalog holds one row per profile (float, cycle, direction) with its date and position,
+built from a GDAC profile index file (eg. `ar_index_global_prof.txt`, optionally gzipped)
+and/or the profiles already loaded into `argo_profiles`. It is saved as Parquet and
+searched in memory through a coarse spatio-temporal index: rows are sorted by 10-degree
+grid cell and by date within each cell, so a query only scans the date slices of the
+cells its box overlaps.
+
+Build it with:
+    uv run -m app.services.argo_catalog --index ar_index_global_prof.txt --from-db
+"""
+from pathlib import Path
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+BASE_DIR = Path(__file__).parent
+
+CATALOG_PATH = Path(os.getenv('ARGO_CATALOG_PATH', str(BASE_DIR / 'cache' / 'argo_catalog.parquet')))
+
+CELL_DEGREES = 10
+N_LAT_CELLS = 180 // CELL_DEGREES
+N_LON_CELLS = 360 // CELL_DEGREES
+NO_POSITION_CELL = N_LAT_CELLS * N_LON_CELLS  # profiles without a position
+
+# Low-cardinality text columns, kept as categoricals so row selection stays cheap
+CATEGORY_COLUMNS = ['direction', 'data_mode', 'ocean']
+CATALOG_COLUMNS = ['float_id', 'cycle_number', 'direction', 'date', 'latitude', 'longitude', 'data_mode', 'ocean', 'local']
+
+# eg. aoml/13857/profiles/R13857_001.nc, coriolis/6902746/profiles/SD6902746_012D.nc
+PROFILE_FILE_PATTERN = r'(?P<prefix>[A-Z]*)(?P<float_id>\d+)_(?P<cycle_number>\d+)(?P<direction>D?)\.nc$'
+
+
+def parse_gdac_index(path: str | Path) -> pd.DataFrame:
+    """Read a GDAC profile index file into catalog rows."""
+    index = pd.read_csv(path, comment='#', dtype={'file': str, 'date': str, 'ocean': str}, low_memory=False)
+    parts = index['file'].str.extract(PROFILE_FILE_PATTERN)
+    return pd.DataFrame({
+        'float_id': pd.to_numeric(parts['float_id'], errors='coerce'),
+        'cycle_number': pd.to_numeric(parts['cycle_number'], errors='coerce'),
+        'direction': np.where(parts['direction'] == 'D', 'D', 'A'),
+        'date': pd.to_datetime(index['date'], format='%Y%m%d%H%M%S', errors='coerce'),
+        'latitude': pd.to_numeric(index['latitude'], errors='coerce'),
+        'longitude': pd.to_numeric(index['longitude'], errors='coerce'),
+        # The last letter of the file prefix is the data mode: R(eal-time) or D(elayed)
+        'data_mode': parts['prefix'].str[-1:].replace('', pd.NA),
+        'ocean': index.get('ocean'),
+        'local': False,
+    }).dropna(subset=['float_id', 'cycle_number'])
+
+
+def load_db_headers() -> pd.DataFrame:
+    """One catalog row per profile already loaded into argo_profiles."""
+    from sqlalchemy import text
+    from app.db import engine
+
+    with engine.connect() as conn:
+        df = pd.read_sql_query(text("""
+            SELECT float_id, cycle_number, MIN(datetime) AS date,
+                   AVG(latitude) AS latitude, AVG(longitude) AS longitude, MIN(data_mode) AS data_mode
+            FROM argo_profiles
+            GROUP BY float_id, cycle_number
+        """), conn)
+    df['float_id'] = pd.to_numeric(df['float_id'], errors='coerce')
+    df['direction'] = 'A'
+    df['ocean'] = None
+    df['local'] = True
+    return df.dropna(subset=['float_id', 'cycle_number'])
+
+
+def merge_sources(gdac: pd.DataFrame | None, local: pd.DataFrame | None) -> pd.DataFrame:
+    """Combine index and database rows; index rows win, but are flagged `local` when loaded."""
+    frames = [df[CATALOG_COLUMNS] for df in (gdac, local) if df is not None and not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=CATALOG_COLUMNS)
+    catalog = pd.concat(frames, ignore_index=True)
+    catalog['float_id'] = catalog['float_id'].astype('int64')
+    catalog['cycle_number'] = catalog['cycle_number'].astype('int64')
+    if local is not None and not local.empty:
+        loaded = pd.MultiIndex.from_frame(local[['float_id', 'cycle_number']].astype('int64'))
+        catalog['local'] = pd.MultiIndex.from_frame(catalog[['float_id', 'cycle_number']]).isin(loaded)
+    return catalog.drop_duplicates(subset=['float_id', 'cycle_number', 'direction'], keep='first')
+
+
+def _lat_cells(latitude: np.ndarray) -> np.ndarray:
+    return np.clip(np.floor((latitude + 90) / CELL_DEGREES), 0, N_LAT_CELLS - 1)
+
+
+def _lon_cells(longitude: np.ndarray) -> np.ndarray:
+    return np.clip(np.floor((longitude + 180) / CELL_DEGREES), 0, N_LON_CELLS - 1)
+
+
+def grid_cells(latitude: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+    """10-degree grid cell of each position (NO_POSITION_CELL where it is missing)."""
+    cells = _lat_cells(latitude) * N_LON_CELLS + _lon_cells(longitude)
+    return np.where(np.isnan(cells), NO_POSITION_CELL, cells).astype(np.int64)
+
+
+class ArgoCatalog:
+    """In-memory profile catalog sorted by (grid cell, date) for box/time searches."""
+
+    def __init__(self, df: pd.DataFrame):
+        df = df.assign(cell=grid_cells(df['latitude'].to_numpy(float), df['longitude'].to_numpy(float)))
+        df = df.astype({col: 'category' for col in CATEGORY_COLUMNS})
+        self.df = df.sort_values(['cell', 'date'], kind='stable').reset_index(drop=True)
+        self._cells = self.df['cell'].to_numpy()
+        self._dates = self.df['date'].to_numpy('datetime64[ns]')
+        self._lat = self.df['latitude'].to_numpy(float)
+        self._lon = self.df['longitude'].to_numpy(float)
+        self._float_ids = self.df['float_id'].to_numpy()
+        # Rows of cell c are offsets[c]:offsets[c + 1]
+        self._offsets = np.searchsorted(self._cells, np.arange(NO_POSITION_CELL + 2))
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def save(self, path: Path = CATALOG_PATH) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.df.drop(columns='cell').to_parquet(path, index=False)
+
+    @classmethod
+    def load(cls, path: Path = CATALOG_PATH) -> 'ArgoCatalog':
+        return cls(pd.read_parquet(path))
+
+    def _candidate_rows(self, lon: list[float] | None, lat: list[float] | None,
+                        start: np.datetime64 | None, end: np.datetime64 | None) -> np.ndarray:
+        """Row numbers in the overlapping cells and inside the date window (not yet box-filtered)."""
+        if lon is None and lat is None:
+            cells = range(NO_POSITION_CELL + 1)
+        else:
+            lat_min, lat_max = _lat_cells(np.array(lat or [-90.0, 90.0], dtype=float)).astype(int)
+            lon_min, lon_max = _lon_cells(np.array(lon or [-180.0, 180.0], dtype=float)).astype(int)
+            cells = [
+                lat_cell * N_LON_CELLS + lon_cell
+                for lat_cell in range(lat_min, lat_max + 1)
+                for lon_cell in range(lon_min, lon_max + 1)
+            ]
+
+        slices = []
+        for cell in cells:
+            lo, hi = self._offsets[cell], self._offsets[cell + 1]
+            if lo == hi:
+                continue
+            if start is not None:
+                lo = lo + np.searchsorted(self._dates[lo:hi], start, side='left')
+            if end is not None:
+                hi = self._offsets[cell] + np.searchsorted(self._dates[self._offsets[cell]:hi], end, side='right')
+            if lo < hi:
+                slices.append(np.arange(lo, hi))
+        return np.concatenate(slices) if slices else np.array([], dtype=np.int64)
+
+    def search(self, lon: list[float] | None = None, lat: list[float] | None = None,
+               date: list[str] | None = None, float_id: int | list[int] | None = None) -> pd.DataFrame:
+        """Profiles inside the box [lon_min, lon_max] x [lat_min, lat_max], date window and float(s)."""
+        start = np.datetime64(pd.Timestamp(date[0])) if date else None
+        end = np.datetime64(pd.Timestamp(date[1])) if date else None
+
+        if float_id is not None and lon is None and lat is None:
+            float_ids = float_id if isinstance(float_id, list) else [float_id]
+            rows = np.flatnonzero(np.isin(self._float_ids, float_ids))
+            if start is not None:
+                rows = rows[(self._dates[rows] >= start) & (self._dates[rows] <= end)]
+        else:
+            rows = self._candidate_rows(lon, lat, start, end)
+            if lon is not None:
+                rows = rows[(self._lon[rows] >= lon[0]) & (self._lon[rows] <= lon[1])]
+            if lat is not None:
+                rows = rows[(self._lat[rows] >= lat[0]) & (self._lat[rows] <= lat[1])]
+            if float_id is not None:
+                rows = rows[np.isin(self._float_ids[rows], float_id if isinstance(float_id, list) else [float_id])]
+
+        return self.df.iloc[np.sort(rows)].drop(columns='cell').sort_values(['float_id', 'cycle_number'])
+
+
+_catalog: ArgoCatalog | None = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> ArgoCatalog | None:
+    """The saved catalog, loaded on first use (None if it has not been built)."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None and CATALOG_PATH.exists():
+            start = time.perf_counter()
+            _catalog = ArgoCatalog.load(CATALOG_PATH)
+            logger.info(f"Loaded Argo catalog with {len(_catalog)} profiles in {time.perf_counter() - start:.1f}s")
+        return _catalog
+
+
+def build_catalog(index_path: str | None = None, from_db: bool = False) -> ArgoCatalog:
+    """Build the catalog from a GDAC index file and/or argo_profiles and save it."""
+    global _catalog
+    gdac = parse_gdac_index(index_path) if index_path else None
+    local = load_db_headers() if from_db else None
+    catalog = ArgoCatalog(merge_sources(gdac, local))
+    catalog.save(CATALOG_PATH)
+    with _catalog_lock:
+        _catalog = catalog
+    logger.info(f"Saved Argo catalog with {len(catalog)} profiles to {CATALOG_PATH}")
+    return catalog
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the local Argo profile catalog used by the find_argo_profiles tool.")
+    parser.add_argument('--index', help="GDAC profile index file, eg. ar_index_global_prof.txt(.gz)")
+    parser.add_argument('--from-db', action='store_true', help="Add the profiles loaded into argo_profiles")
+    args = parser.parse_args()
+    if not (args.index or args.from_db):
+        parser.error("give --index and/or --from-db")
+    build_catalog(args.index, from_db=args.from_db)
@@ -0,0 +1,131 @@
+"""Server-side chat sessions: message history and loaded data kept between turns.
+
+Keyed by the authenticated user and chat id the Node server sends (a chat id alone
+would let anyone resume someone else's chat), a session holds the pydantic-ai message
+history and the `AgentDependencies` (stored `Out[n]` DataFrames and their DuckDB
+connection), so a follow-up turn can refer to data loaded earlier instead of fetching it
+again. Sessions idle for longer than SESSION_IDLE_SECONDS are closed, and at most
+MAX_SESSIONS are kept (least recently used first out).
+"""
+from dataclasses import dataclass, field
+import os
+import threading
+import time
+
+from loguru import logger
+from pydantic_ai.messages import ModelMessage, ModelRequest, UserPromptPart
+
+from app.schemas.chat import AgentDependencies, UserMode
+
+SESSION_IDLE_SECONDS = float(os.getenv('ARGO_SESSION_IDLE_SECONDS', str(30 * 60)))
+MAX_SESSIONS = int(os.getenv('ARGO_MAX_SESSIONS', '100'))
+MAX_TURNS = int(os.getenv('ARGO_SESSION_MAX_TURNS', '20'))  # turns of message history sent to the model
+
+
+def trim_history(history: list[ModelMessage], max_turns: int = MAX_TURNS) -> list[ModelMessage]:
+    """The last `max_turns` turns of `history`, cut where a user prompt starts so tool calls keep their returns."""
+    turn_starts = [
+        i for i, message in enumerate(history)
+        if isinstance(message, ModelRequest) and any(isinstance(part, UserPromptPart) for part in message.parts)
+    ]
+    if len(turn_starts) <= max_turns:
+        return history
+    return history[turn_starts[-max_turns]:]
+
+
+@dataclass
+class ChatSession:
+    chat_id: str
+    deps: AgentDependencies
+    history: list[ModelMessage] = field(default_factory=list)
+    last_used: float = field(default_factory=time.time)
+    turns: int = 0
+
+    def __post_init__(self):
+        # Turns of one chat run one at a time
+        self.lock = threading.Lock()
+
+    def close(self) -> None:
+        self.deps.close()
+
+
+class ChatSessionStore:
+    """Thread-safe chat id -> ChatSession map with idle-time eviction."""
+
+    def __init__(self, idle_seconds: float = SESSION_IDLE_SECONDS, max_sessions: int = MAX_SESSIONS):
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._sessions: dict[str, ChatSession] = {}
+        self.created = 0
+        self.resumed = 0
+        self.evicted = 0
+
+    @staticmethod
+    def key(user_id: str, chat_id: str) -> str:
+        return f'{user_id}/{chat_id}'
+
+    def get(self, user_id: str, chat_id: str, mode: UserMode) -> ChatSession:
+        """The session of `user_id`'s chat `chat_id`, created if it is new or was evicted."""
+        self.evict_idle()
+        key = self.key(user_id, chat_id)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = ChatSession(chat_id=key, deps=AgentDependencies(mode=mode))
+                self._sessions[key] = session
+                self.created += 1
+                self._evict_over_limit()
+            else:
+                self.resumed += 1
+            session.deps.mode = mode
+            session.last_used = time.time()
+            return session
+
+    def _close(self, chat_id: str) -> None:
+        session = self._sessions.pop(chat_id)
+        session.close()
+        self.evicted += 1
+        logger.info(f"Closed chat session {chat_id} after {session.turns} turns")
+
+    def _evict_over_limit(self) -> None:
+        for session in sorted(self._sessions.values(), key=lambda session: session.last_used):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            # Never close a session in the middle of a turn
+            if session.lock.acquire(blocking=False):
+                try:
+                    self._close(session.chat_id)
+                finally:
+                    session.lock.release()
+
+    def evict_idle(self) -> None:
+        """Close the sessions not used for `idle_seconds`."""
+        now = time.time()
+        with self._lock:
+            for session in list(self._sessions.values()):
+                if now - session.last_used > self.idle_seconds and session.lock.acquire(blocking=False):
+                    try:
+                        self._close(session.chat_id)
+                    finally:
+                        session.lock.release()
+
+    def drop(self, user_id: str, chat_id: str) -> None:
+        key = self.key(user_id, chat_id)
+        with self._lock:
+            if key in self._sessions:
+                self._close(key)
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'created': self.created,
+                'resumed': self.resumed,
+                'evicted': self.evicted,
+                'idle_seconds': self.idle_seconds,
+                'max_sessions': self.max_sessions,
+            }
+
+
+chat_sessions = ChatSessionStore()
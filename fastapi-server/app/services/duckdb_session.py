@@ -0,0 +1,267 @@
+"""Per-session DuckDB connection for the `run_duckdb` tool.
+
+Each stored `Out[n]` Arrow table (see `session_store`) is registered once on the session's
+connection as a view (`out_n`) that DuckDB scans in place, instead of being copied into a
+fresh connection for every query (scanning pandas directly converts its string columns on
+every query); one query can join or union any of them. Registrations are connection-scoped
+in DuckDB, so the session's queries share one connection and are serialized by a lock;
+each query still runs on all of DuckDB's threads.
+
+Benchmark against the per-query connection with:
+    uv run -m app.services.duckdb_session --rows 5000000
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+import argparse
+import hashlib
+import os
+import re
+import threading
+import time
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+
+def table_name(ref: str) -> str:
+    """DuckDB name of a stored reference, eg. Out[3] -> out_3."""
+    return re.sub(r'\W+', '_', ref).strip('_').lower()
+
+
+def referenced_refs(sql: str) -> list[str]:
+    """Stored references a query names as tables, eg. 'SELECT * FROM out_1 JOIN OUT_2 ...' -> ['Out[1]', 'Out[2]']."""
+    numbers = dict.fromkeys(int(n) for n in re.findall(r'\bout_(\d+)\b', sql, flags=re.IGNORECASE))
+    return [f'Out[{n}]' for n in numbers]
+
+
+QUERY_CACHE_SIZE = int(os.getenv('ARGO_QUERY_CACHE_SIZE', '128'))  # results remembered per session
+
+# SQL string literals and quoted identifiers, left untouched by `normalize_sql`
+_QUOTED = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")""")
+
+
+# Queries whose result changes between runs are never answered from the cache
+_NON_DETERMINISTIC = re.compile(r'\b(random|uuid|gen_random_uuid|now|current_date|current_time|current_timestamp)\b', re.IGNORECASE)
+
+
+def cacheable(sql: str) -> bool:
+    return _NON_DETERMINISTIC.search(sql) is None
+
+
+def normalize_sql(sql: str) -> str:
+    """Lower-case, whitespace-collapsed SQL without a trailing semicolon, quoted text kept as is."""
+    parts = _QUOTED.split(sql.strip().rstrip(';').strip())
+    return ''.join(part if i % 2 else re.sub(r'\s+', ' ', part.lower()) for i, part in enumerate(parts))
+
+
+@dataclass
+class QueryCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+# Across all sessions, eg. for a status endpoint
+query_cache_stats = QueryCacheStats()
+
+
+def query_cache_summary() -> dict:
+    return {**asdict(query_cache_stats), 'hit_rate': round(query_cache_stats.hit_rate(), 3)}
+
+
+class QueryCache:
+    """LRU map from (input fingerprints, normalized SQL) to the reference holding the result."""
+
+    def __init__(self, max_entries: int = QUERY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.stats = QueryCacheStats()
+        self._lock = threading.Lock()
+        self._results: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def key(sql: str, fingerprints: dict[str, str], alias_of: str | None = None, alias: str = 'db') -> str:
+        """Key of a query over `fingerprints` (reference -> content fingerprint).
+
+        Table names are replaced by the content they refer to, so the same query over a
+        reloaded copy of the same data is a hit too.
+        """
+        normalized = normalize_sql(sql)
+        for ref, content in fingerprints.items():
+            normalized = re.sub(rf'\b{table_name(ref)}\b', f'<{content}>', normalized)
+        if alias_of is not None:
+            normalized = re.sub(rf'\b{alias}\b', f'<{fingerprints[alias_of]}>', normalized)
+        return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            ref = self._results.get(key)
+            for stats in (self.stats, query_cache_stats):
+                if ref is None:
+                    stats.misses += 1
+                else:
+                    stats.hits += 1
+            if ref is not None:
+                self._results.move_to_end(key)
+            return ref
+
+    def put(self, key: str, ref: str) -> None:
+        with self._lock:
+            self._results[key] = ref
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+                self.stats.evictions += 1
+                query_cache_stats.evictions += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {**asdict(self.stats), 'hit_rate': round(self.stats.hit_rate(), 3), 'entries': len(self._results)}
+
+
+class DuckDBSession:
+    """One DuckDB connection per chat session, with each reference registered once."""
+
+    def __init__(self):
+        self._con: duckdb.DuckDBPyConnection | None = None
+        self._lock = threading.Lock()
+        self._registered: dict[str, int] = {}  # table name -> id() of the registered DataFrame
+        self._stale: set[str] = set()  # table names to unregister once no query is running
+        self.results = QueryCache()
+
+    @property
+    def con(self) -> duckdb.DuckDBPyConnection:
+        if self._con is None:
+            self._con = duckdb.connect()
+        return self._con
+
+    def _register(self, ref: str, data: pa.Table | pd.DataFrame) -> str:
+        name = table_name(ref)
+        if self._registered.get(name) != id(data):
+            view = data
+            if isinstance(data, pd.DataFrame):
+                try:
+                    view = pa.Table.from_pandas(data, preserve_index=False)
+                except (pa.ArrowException, TypeError, ValueError) as e:
+                    # eg. object columns mixing types; DuckDB can still scan the DataFrame itself
+                    logger.warning(f"Registering {ref} as a pandas view: {e}")
+            self.con.register(name, view)
+            self._registered[name] = id(data)
+        return name
+
+    def _drop_stale(self) -> None:
+        while self._stale:
+            name = self._stale.pop()
+            if self._registered.pop(name, None) is not None and self._con is not None:
+                self._con.unregister(name)
+
+    def query(self, sql: str, tables: dict[str, pa.Table | pd.DataFrame], alias_of: str | None = None,
+              alias: str = 'db') -> pd.DataFrame:
+        """Run `sql` over `tables` (stored reference -> data, each visible as `out_n`), materializing the result once.
+        Args:
+            alias_of: a reference of `tables` also made visible as `alias`
+        """
+        with self._lock:
+            try:
+                names = {ref: self._register(ref, data) for ref, data in tables.items()}
+                if alias_of is not None:
+                    self.con.execute(f'CREATE OR REPLACE TEMP VIEW "{alias}" AS SELECT * FROM "{names[alias_of]}"')
+                else:
+                    self.con.execute(f'DROP VIEW IF EXISTS "{alias}"')
+                relation = self.con.sql(sql)
+                if relation is None:
+                    raise ValueError("The SQL statement did not return any rows; use a SELECT query.")
+                return relation.df()  # pyright: ignore[reportUnknownMemberType]
+            finally:
+                # References spilled or dropped meanwhile, possibly registered by this very query
+                self._drop_stale()
+
+    def unregister(self, ref: str) -> None:
+        """Stop scanning the data registered for `ref`, so its memory can be freed.
+
+        Does not wait for a running query: the registration is then dropped when it ends.
+        """
+        self._stale.add(table_name(ref))
+        if self._lock.acquire(blocking=False):
+            try:
+                self._drop_stale()
+            finally:
+                self._lock.release()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
+            self._registered.clear()
+            self._stale.clear()
+
+
+def float_dataset(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic float measurements shaped like a `load_argo_float` result."""
+    rng = np.random.default_rng(seed)
+    profiles = max(rows // 100, 1)
+    return pd.DataFrame({
+        'N_POINTS': np.arange(rows),
+        'PLATFORM_NUMBER': rng.choice(np.arange(2900000, 2900050), rows),
+        'CYCLE_NUMBER': rng.integers(1, profiles, rows),
+        'DATA_MODE': rng.choice(['R', 'A', 'D'], rows),
+        'LATITUDE': rng.uniform(-10, 25, rows),
+        'LONGITUDE': rng.uniform(50, 100, rows),
+        'TIME': pd.to_datetime('2020-01-01') + pd.to_timedelta(rng.integers(0, 5 * 365 * 86400, rows), unit='s'),
+        'PRES': rng.uniform(0, 2000, rows),
+        'TEMP': rng.uniform(2, 30, rows),
+        'PSAL': rng.uniform(33, 37, rows),
+    })
+
+
+BENCHMARK_QUERIES = {
+    'aggregate': "SELECT ROUND(PRES / 100) * 100 AS PRES_BIN, AVG(TEMP) AS TEMP, AVG(PSAL) AS PSAL FROM db GROUP BY 1 ORDER BY 1",
+    'filter': "SELECT PLATFORM_NUMBER, CYCLE_NUMBER, PRES, TEMP FROM db WHERE PRES < 10 AND DATA_MODE = 'D'",
+    'profile': "SELECT * FROM db WHERE PLATFORM_NUMBER = 2900007 AND CYCLE_NUMBER = 12 ORDER BY PRES",
+}
+
+
+def _per_query_connection(data: pd.DataFrame, sql: str) -> pd.DataFrame:
+    """The previous `run_duckdb` path: a fresh connection per query, the result materialized twice."""
+    with duckdb.connect() as con:
+        con.register('db', data)
+        relation = con.sql(sql)
+        result = relation.df()
+        relation.df()  # the row count log re-materialized the result
+        return result
+
+
+def benchmark(rows: int, repeats: int) -> None:
+    """Compare per-query connections with a session connection over the same stored frame."""
+    data = float_dataset(rows)
+    logger.info(f"Float dataset: {rows:,} rows, {data.memory_usage(deep=True).sum() / 1024**2:.0f} MiB")
+    session = DuckDBSession()
+    for name, sql in BENCHMARK_QUERIES.items():
+        timings = {}
+        for label, run in [
+            ('per-query connection', lambda: _per_query_connection(data, sql)),
+            ('session connection', lambda: session.query(sql, {'Out[1]': data}, alias_of='Out[1]')),
+        ]:
+            run()  # warm-up
+            start = time.perf_counter()
+            for _ in range(repeats):
+                run()
+            timings[label] = (time.perf_counter() - start) / repeats
+        old, new = timings['per-query connection'], timings['session connection']
+        logger.info(f"{name}: per-query {old * 1000:.1f} ms, session {new * 1000:.1f} ms ({old / new:.1f}x)")
+    session.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark run_duckdb's session connection.")
+    parser.add_argument('--rows', type=int, default=5_000_000, help="Rows in the synthetic float dataset")
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+    benchmark(args.rows, args.repeats)
@@ -0,0 +1,177 @@
+"""Local data source for the agent tools, backed by the `argo_profiles` table.
+
+`utils/postgres.py` loads the Argo GDAC files into PostgreSQL/PostGIS; this module
+answers profile, float and region requests from that table and returns DataFrames
+with the column names argopy's `erddap`/`argovis` fetchers produce, so the rest of
+the tools (and the LLM) cannot tell the difference.
+"""
+import pandas as pd
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db import engine
+
+LOCAL_SOURCE = 'local'
+
+# argo_profiles column -> argopy column
+COLUMN_MAP = {
+    'cycle_number': 'CYCLE_NUMBER',
+    'data_mode': 'DATA_MODE',
+    'float_id': 'PLATFORM_NUMBER',
+    'pressure': 'PRES',
+    'pressure_qc': 'PRES_QC',
+    'salinity': 'PSAL',
+    'salinity_qc': 'PSAL_QC',
+    'temperature': 'TEMP',
+    'temperature_qc': 'TEMP_QC',
+    'latitude': 'LATITUDE',
+    'longitude': 'LONGITUDE',
+    'datetime': 'TIME',
+}
+INTEGER_COLUMNS = ['CYCLE_NUMBER', 'PLATFORM_NUMBER', 'PRES_QC', 'PSAL_QC', 'TEMP_QC']
+
+# Measured parameters available locally; PRES is always selected as the vertical coordinate
+PARAMETER_COLUMNS = {
+    'TEMP': ['temperature', 'temperature_qc'],
+    'PSAL': ['salinity', 'salinity_qc'],
+}
+BASE_COLUMNS = [col for col in COLUMN_MAP if not any(col in cols for cols in PARAMETER_COLUMNS.values())]
+
+# Degrees added around a region's geography envelope, which only prefilters on the index
+ENVELOPE_PADDING = 0.5
+
+# PostgreSQL regex capturing the day of a GDAC global daily file, eg. argo_data/2025/01/20250101_prof.nc
+DAILY_FILE_PATTERN = r'(?:^|/)(\d{8})_prof\.(?:nc|csv)$'
+
+
+def local_supports(parameters: list[str] | None) -> bool:
+    """True if the local source holds every requested parameter."""
+    return not parameters or {param.upper() for param in parameters} <= {'PRES', *PARAMETER_COLUMNS}
+
+
+def select_columns(parameters: list[str] | None = None) -> str:
+    """SELECT list for the requested Argo parameters (all of them by default)."""
+    if not parameters:
+        return ', '.join(COLUMN_MAP)
+    wanted = {param.upper() for param in parameters}
+    unknown = wanted - set(PARAMETER_COLUMNS) - {'PRES'}
+    if unknown:
+        raise ValueError(f"Parameters {sorted(unknown)} are not available from the local source, only {['PRES', *PARAMETER_COLUMNS]}.")
+    columns = BASE_COLUMNS + [col for param in PARAMETER_COLUMNS if param in wanted for col in PARAMETER_COLUMNS[param]]
+    return ', '.join(col for col in COLUMN_MAP if col in columns)
+
+
+def to_argopy_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Rename argo_profiles columns to argopy's and add the `N_POINTS` index column."""
+    df = df.rename(columns=COLUMN_MAP)
+    for col in INTEGER_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
+    df['TIME'] = pd.to_datetime(df['TIME'])
+    df.insert(0, 'N_POINTS', range(len(df)))
+    return df
+
+
+def _query(sql: str, params: dict) -> pd.DataFrame:
+    with engine.connect() as conn:
+        df = pd.read_sql_query(text(sql), conn, params=params)
+    return to_argopy_frame(df)
+
+
+def fetch_local_profile(float_id: int, cyc: int | list[int], parameters: list[str] | None = None) -> pd.DataFrame:
+    """Profiles `cyc` of float `float_id` from argo_profiles."""
+    cycles = cyc if isinstance(cyc, list) else [cyc]
+    return _query(f"""
+        SELECT {select_columns(parameters)} FROM argo_profiles
+        WHERE float_id = :float_id AND cycle_number = ANY(:cycles)
+        ORDER BY cycle_number, pressure
+    """, {'float_id': str(float_id), 'cycles': cycles})
+
+
+def fetch_local_float(float_id: int | list[int], parameters: list[str] | None = None) -> pd.DataFrame:
+    """Every profile of one or more floats from argo_profiles."""
+    float_ids = float_id if isinstance(float_id, list) else [float_id]
+    return _query(f"""
+        SELECT {select_columns(parameters)} FROM argo_profiles
+        WHERE float_id = ANY(:float_ids)
+        ORDER BY float_id, cycle_number, pressure
+    """, {'float_ids': [str(f) for f in float_ids]})
+
+
+def fetch_local_region(box: list, parameters: list[str] | None = None) -> pd.DataFrame:
+    """Rows inside an argopy region box [lon_min, lon_max, lat_min, lat_max, dpt_min, dpt_max(, date_min, date_max)].
+
+    Like argopy, the box is a plain latitude/longitude rectangle, tested with BETWEEN.
+    A geography envelope has great-circle edges, so it is only used as a slightly larger
+    `&&` prefilter for the GIST index: its edges are segmentized along the parallels and
+    padded by ENVELOPE_PADDING degrees. A box spanning every longitude skips it.
+    """
+    lon_min, lon_max, lat_min, lat_max, dpt_min, dpt_max = box[:6]
+    params = {
+        'lon_min': lon_min, 'lon_max': lon_max,
+        'lat_min': lat_min, 'lat_max': lat_max,
+        'dpt_min': dpt_min, 'dpt_max': dpt_max,
+        'env_lat_min': max(lat_min - ENVELOPE_PADDING, -90), 'env_lat_max': min(lat_max + ENVELOPE_PADDING, 90),
+    }
+    index_filter = ''
+    if lon_max - lon_min < 360:
+        index_filter = """AND location && ST_Segmentize(
+              ST_MakeEnvelope(:lon_min, :env_lat_min, :lon_max, :env_lat_max, 4326), 1)::geography"""
+    date_filter = ''
+    if len(box) == 8:
+        date_filter = 'AND datetime >= :date_min AND datetime < :date_max'
+        params.update(date_min=pd.Timestamp(box[6]).to_pydatetime(), date_max=pd.Timestamp(box[7]).to_pydatetime())
+
+    return _query(f"""
+        SELECT {select_columns(parameters)} FROM argo_profiles
+        WHERE latitude BETWEEN :lat_min AND :lat_max
+          AND longitude BETWEEN :lon_min AND :lon_max
+          {index_filter}
+          AND pressure BETWEEN :dpt_min AND :dpt_max
+          {date_filter}
+        ORDER BY datetime, float_id, pressure
+    """, params)
+
+
+def local_cycles_covered(float_id: int, cyc: int | list[int]) -> bool:
+    """True if every requested cycle of the float is in argo_profiles."""
+    cycles = sorted(set(cyc if isinstance(cyc, list) else [cyc]))
+    try:
+        with engine.connect() as conn:
+            found = conn.execute(text("""
+                SELECT COUNT(DISTINCT cycle_number) FROM argo_profiles
+                WHERE float_id = :float_id AND cycle_number = ANY(:cycles)
+            """), {'float_id': str(float_id), 'cycles': cycles}).scalar()
+    except SQLAlchemyError as e:
+        logger.warning(f"Local database unavailable: {e}")
+        return False
+    return found == len(cycles)
+
+
+def local_dates_covered(date_min: str, date_max: str) -> bool:
+    """True if every day in [date_min, date_max) has a loaded daily file.
+
+    A day counts as covered only by its own global daily file (`YYYYMMDD_prof.nc`, or the
+    `.csv` made from it): other files, eg. a per-float `<WMO>_prof.nc` spanning years, hold
+    a few floats, not the whole ocean. Uses the per-file summary kept by the loaders
+    (`argo_file_stats`), so it does not touch argo_profiles itself.
+    """
+    start, end = pd.Timestamp(date_min).normalize(), pd.Timestamp(date_max).normalize()
+    days = max((end - start).days, 1)
+    try:
+        with engine.connect() as conn:
+            covered = conn.execute(text("""
+                SELECT COUNT(DISTINCT day) FROM (
+                    SELECT substring(source_file FROM :pattern) AS day FROM argo_file_stats WHERE row_count > 0
+                ) files
+                WHERE day >= :start AND day < :end
+            """), {
+                'pattern': DAILY_FILE_PATTERN,
+                'start': start.strftime('%Y%m%d'),
+                'end': max(end, start + pd.Timedelta(days=1)).strftime('%Y%m%d'),
+            }).scalar()
+    except SQLAlchemyError as e:
+        logger.warning(f"Local database unavailable: {e}")
+        return False
+    return covered >= days
@@ -0,0 +1,192 @@
+"""Background prefetching of frequently requested Argo data into the tool cache.
+
+A list of regions and floats (`prefetch.json`, or the file named by ARGO_PREFETCH_CONFIG)
+is fetched when the server starts and every PREFETCH_INTERVAL seconds afterwards, through
+the same tiling and cache keys as the `load_argo_*` tools, so the first user request of
+the day is answered from the cache. Entries that would still be fresh at the next run are
+skipped; the others are downloaded again and replace the cached copy. Refreshes have their
+own in-flight key, so while one runs, tool calls keep being served the cached copy until it
+expires; after that they download the data themselves rather than wait on the refresh.
+
+Region targets use a rolling window of the last `days` days (ending today, so the boxes
+and cache keys stay the same all day) or a fixed `date` range. Eg.
+    {"regions": [{"name": "Arabian Sea", "lon": [50, 78], "lat": [0, 30], "dpt": [0, 2000], "days": 30}],
+     "floats": [{"float_id": 2902746}]}
+"""
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+import asyncio
+import json
+import os
+import time
+
+import pandas as pd
+from argopy.errors import DataNotFound
+from loguru import logger
+
+from app.services.argo_cache import argo_cache
+from app.services.local_argo import LOCAL_SOURCE
+from app.services.tools import (
+    AUTO_SOURCE, RECENT_DATA_TTL, data_cache_key, fetch_remote_data, normalize_parameters,
+    region_ttl, resolve_source, run_blocking, split_region,
+)
+
+BASE_DIR = Path(__file__).parent
+
+PREFETCH_CONFIG = Path(os.getenv('ARGO_PREFETCH_CONFIG', str(BASE_DIR / 'prefetch.json')))
+PREFETCH_ENABLED = os.getenv('ARGO_PREFETCH', '1') != '0'
+PREFETCH_INTERVAL = float(os.getenv('ARGO_PREFETCH_INTERVAL', str(6 * 3600)))
+# Prefetches share the tools' fetch workers, so keep some of them free for users
+PREFETCH_CONCURRENCY = int(os.getenv('ARGO_PREFETCH_CONCURRENCY', '2'))
+
+
+@dataclass
+class PrefetchTarget:
+    """One region or float to keep in the cache."""
+    name: str
+    access_point: str  # 'region' or 'float'
+    dataset: str = 'phy'
+    parameters: list[str] | None = None
+    float_id: int | None = None
+    lon: list[float] | None = None
+    lat: list[float] | None = None
+    dpt: list[float] | None = None
+    days: int | None = None
+    date: list[str] | None = None
+
+    def jobs(self) -> list[tuple[str, tuple, float]]:
+        """The (access_point, args, ttl) fetches a tool call for this target would make."""
+        if self.access_point == 'float':
+            return [('float', (self.float_id,), RECENT_DATA_TTL)]
+
+        date = self.date
+        if self.days is not None:
+            today = pd.Timestamp.now().normalize()
+            date = [(today - pd.Timedelta(days=self.days)).strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')]
+        box = self.lon + self.lat + self.dpt + (date or [])
+        return [('region', (tile,), region_ttl(tile[6:8] or None)) for tile in split_region(box)]
+
+
+@dataclass
+class TargetStatus:
+    last_run: float | None = None
+    seconds: float | None = None
+    fresh: int = 0
+    fetched: int = 0
+    joined: int = 0  # another refresh of the same data was already running
+    empty: int = 0
+    local: int = 0
+    failed: int = 0
+    last_error: str = ''
+
+
+def load_targets(path: Path = PREFETCH_CONFIG) -> list[PrefetchTarget]:
+    """Read the prefetch targets; a missing file means nothing to prefetch."""
+    if not path.exists():
+        return []
+    config = json.loads(path.read_text())
+    targets = [PrefetchTarget(access_point='region', **region) for region in config.get('regions', [])]
+    targets += [
+        PrefetchTarget(name=f"float {item['float_id']}", access_point='float', **item)
+        for item in config.get('floats', [])
+    ]
+    return targets
+
+
+@dataclass
+class Prefetcher:
+    """Periodically warms the tool cache for the configured targets."""
+    targets: list[PrefetchTarget]
+    interval: float = PREFETCH_INTERVAL
+    concurrency: int = PREFETCH_CONCURRENCY
+    runs: int = 0
+    running: bool = False
+    next_run: float | None = None
+    status: dict[str, TargetStatus] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._task: asyncio.Task | None = None
+
+    def _warm(self, access_point: str, args: tuple, ttl: float, target: PrefetchTarget) -> str:
+        """Fetch one job unless its cache entry outlives the next run. Returns the outcome."""
+        parameters = normalize_parameters(target.parameters)
+        source = resolve_source(access_point, args, target.dataset, AUTO_SOURCE, parameters)
+        if source == LOCAL_SOURCE:
+            return 'local'
+        expires_in = argo_cache.expires_in(data_cache_key(access_point, args, target.dataset, source, parameters))
+        if expires_in is not None and expires_in > self.interval:
+            return 'fresh'
+        try:
+            _, shared = fetch_remote_data(access_point, args, target.dataset, source, ttl=ttl,
+                                          parameters=parameters, refresh=True)
+        except DataNotFound:
+            return 'empty'
+        return 'joined' if shared else 'fetched'
+
+    async def _run_target(self, target: PrefetchTarget, semaphore: asyncio.Semaphore) -> None:
+        counts = TargetStatus(last_run=time.time())
+        start = time.perf_counter()
+
+        async def run_job(job: tuple[str, tuple, float]) -> None:
+            async with semaphore:
+                try:
+                    outcome = await run_blocking(self._warm, *job, target)
+                except Exception as e:
+                    logger.warning(f"Prefetch of {target.name} {job[1]} failed: {e}")
+                    counts.failed += 1
+                    counts.last_error = str(e)[:200]
+                    return
+                setattr(counts, outcome, getattr(counts, outcome) + 1)
+
+        await asyncio.gather(*(run_job(job) for job in target.jobs()))
+        counts.seconds = round(time.perf_counter() - start, 1)
+        self.status[target.name] = counts
+        logger.info(f"Prefetched {target.name}: {counts.fetched} fetched, {counts.joined} joined, {counts.fresh} fresh, "
+                    f"{counts.failed} failed in {counts.seconds}s")
+
+    async def run_once(self) -> None:
+        """Warm every target once, with at most `concurrency` fetches in flight."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        self.running = True
+        try:
+            await asyncio.gather(*(self._run_target(target, semaphore) for target in self.targets))
+        finally:
+            self.running = False
+            self.runs += 1
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Prefetch run failed: {e}")
+            self.next_run = time.time() + self.interval
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None and self.targets:
+            logger.info(f"Starting prefetch of {len(self.targets)} targets every {self.interval:g}s")
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def summary(self) -> dict:
+        return {
+            'enabled': self._task is not None,
+            'interval': self.interval,
+            'concurrency': self.concurrency,
+            'runs': self.runs,
+            'running': self.running,
+            'next_run': self.next_run,
+            'targets': {name: asdict(status) for name, status in self.status.items()},
+        }
+
+
+prefetcher = Prefetcher(load_targets() if PREFETCH_ENABLED else [])
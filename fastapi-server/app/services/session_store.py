@@ -0,0 +1,263 @@
+"""Memory-bounded store for the DataFrames a chat session keeps as `Out[n]` references.
+
+Frames are kept as Arrow tables and their resident size is tracked per session and across
+all sessions. When a session goes over SESSION_MEMORY_BYTES, or all sessions together go
+over GLOBAL_MEMORY_BYTES, the least recently used references are spilled to Arrow IPC
+files under SPILL_DIR and replaced by memory-mapped tables: reading them back is
+transparent, and the OS pages the data in only when a query touches it.
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+import weakref
+
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+BASE_DIR = Path(__file__).parent
+
+SPILL_DIR = Path(os.getenv('ARGO_SPILL_DIR', str(BASE_DIR / 'cache' / 'spill')))
+SESSION_MEMORY_BYTES = int(os.getenv('ARGO_SESSION_MEMORY_BYTES', str(512 * 1024**2)))  # 512 MiB
+GLOBAL_MEMORY_BYTES = int(os.getenv('ARGO_GLOBAL_MEMORY_BYTES', str(4 * 1024**3)))  # 4 GiB
+
+
+def _hash_array(digest, array: pa.Array) -> None:
+    digest.update(f"{array.type}|{array.offset}|{len(array)}".encode())
+    for buffer in array.buffers():
+        # sizes keep adjacent buffers from running into each other
+        digest.update(b'-' if buffer is None else f"{buffer.size}:".encode())
+        if buffer is not None:
+            digest.update(memoryview(buffer))
+    if isinstance(array, pa.DictionaryArray):
+        _hash_array(digest, array.dictionary)
+
+
+def fingerprint(data: pa.Table | pd.DataFrame) -> str:
+    """Content fingerprint: schema, row count and every data buffer.
+
+    Equal fingerprints mean equal data (a different chunking of the same data may still
+    get another fingerprint).
+    """
+    digest = hashlib.sha256()  # hardware-accelerated on most CPUs, hashes GB/s
+    if isinstance(data, pa.Table):
+        digest.update(f"{data.schema}|{data.num_rows}".encode())
+        for column in data.columns:
+            for chunk in column.chunks:
+                _hash_array(digest, chunk)
+    else:
+        digest.update(f"{list(data.columns)}|{list(data.dtypes)}|{len(data)}".encode())
+        try:
+            digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+        except TypeError:
+            # Unhashable values: never considered equal to anything else
+            digest.update(uuid.uuid4().bytes)
+    return digest.hexdigest()
+
+
+@dataclass
+class StoredFrame:
+    """One reference: an in-memory Arrow table, or a memory-mapped one once spilled."""
+    table: pa.Table | None
+    frame: pd.DataFrame | None  # only for frames Arrow cannot represent, never spilled
+    nbytes: int
+    last_access: float
+    path: Path | None = None
+    fingerprint: str = ''  # computed by `put`, before the table can be spilled
+
+    @property
+    def resident(self) -> int:
+        return 0 if self.path is not None else self.nbytes
+
+
+class MemoryBudget:
+    """Resident bytes of every live session store, and the global budget they share."""
+
+    def __init__(self, max_bytes: int = GLOBAL_MEMORY_BYTES):
+        self.max_bytes = max_bytes
+        self.lock = threading.RLock()
+        self.stores: weakref.WeakSet['SessionStore'] = weakref.WeakSet()
+        self.spills = 0
+        self.spilled_bytes = 0
+
+    def resident(self) -> int:
+        with self.lock:
+            return sum(store.resident() for store in self.stores)
+
+    def enforce(self, keep: 'SessionStore') -> None:
+        """Spill the least recently used references of any session until within budget."""
+        with self.lock:
+            total = self.resident()
+            if total <= self.max_bytes:
+                return
+            candidates = sorted(
+                ((entry.last_access, store, ref) for store in self.stores for ref, entry in store.entries.items()
+                 if entry.resident and entry.table is not None and not (store is keep and ref == store.newest)),
+                key=lambda candidate: candidate[0],
+            )
+            for _, store, ref in candidates:
+                if total <= self.max_bytes:
+                    break
+                total -= store.spill(ref)
+
+    def summary(self) -> dict:
+        with self.lock:
+            return {
+                'sessions': len(self.stores),
+                'resident_bytes': self.resident(),
+                'max_bytes': self.max_bytes,
+                'spills': self.spills,
+                'spilled_bytes': self.spilled_bytes,
+            }
+
+
+memory_budget = MemoryBudget()
+
+
+def _remove_spill_dir(path: Path) -> None:
+    shutil.rmtree(path, ignore_errors=True)
+
+
+class SessionStore:
+    """Dict-like `Out[n]` -> DataFrame store with a per-session memory budget."""
+
+    def __init__(self, max_bytes: int = SESSION_MEMORY_BYTES, budget: MemoryBudget = memory_budget):
+        self.max_bytes = max_bytes
+        self.budget = budget
+        self.entries: dict[str, StoredFrame] = {}
+        self.newest: str | None = None
+        self.spill_dir = SPILL_DIR / uuid.uuid4().hex
+        # Called with a reference whose in-memory table was spilled or dropped, so other
+        # holders of it (eg. the session's DuckDB connection) can let it go
+        self.release_callbacks: list[Callable[[str], None]] = []
+        with budget.lock:
+            budget.stores.add(self)
+        # Spill files go with the session, however it ends
+        weakref.finalize(self, _remove_spill_dir, self.spill_dir)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, ref: object) -> bool:
+        return ref in self.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.entries))
+
+    def __getitem__(self, ref: str) -> pd.DataFrame:
+        return self.get(ref)
+
+    def __setitem__(self, ref: str, df: pd.DataFrame) -> None:
+        self.put(ref, df)
+
+    def resident(self) -> int:
+        return sum(entry.resident for entry in self.entries.values())
+
+    def _released(self, ref: str) -> None:
+        for callback in self.release_callbacks:
+            callback(ref)
+
+    def put(self, ref: str, df: pd.DataFrame) -> None:
+        """Store `df` as an Arrow table, spilling older references if over budget.
+
+        Converts and hashes the whole frame, so call it off the event loop for large ones.
+        """
+        try:
+            entry = StoredFrame(table=pa.Table.from_pandas(df, preserve_index=False), frame=None, nbytes=0,
+                                last_access=time.time())
+            entry.nbytes = entry.table.nbytes
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            # eg. object columns mixing types: kept as is and counted, but cannot be spilled
+            logger.warning(f"Keeping {ref} as a DataFrame: {e}")
+            entry = StoredFrame(table=None, frame=df, nbytes=int(df.memory_usage(deep=True).sum()),
+                                last_access=time.time())
+        # While the data is still in memory: a spilled table would be read back from disk to hash it
+        entry.fingerprint = fingerprint(entry.frame if entry.table is None else entry.table)
+
+        with self.budget.lock:
+            self.discard(ref)
+            self.entries[ref] = entry
+            self.newest = ref
+            self._enforce()
+        self.budget.enforce(keep=self)
+
+    def _enforce(self) -> None:
+        total = self.resident()
+        for ref, entry in sorted(self.entries.items(), key=lambda item: item[1].last_access):
+            if total <= self.max_bytes:
+                break
+            if ref == self.newest or not entry.resident or entry.table is None:
+                continue
+            total -= self.spill(ref)
+
+    def spill(self, ref: str) -> int:
+        """Write `ref` to an IPC file and memory-map it back. Returns the bytes freed."""
+        entry = self.entries[ref]
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spill_dir / f"{uuid.uuid4().hex}.arrow"
+        with pa.OSFile(str(path), 'wb') as sink, pa.ipc.new_file(sink, entry.table.schema) as writer:
+            writer.write_table(entry.table)
+        entry.table = pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+        entry.path = path
+        self._released(ref)
+        self.budget.spills += 1
+        self.budget.spilled_bytes += entry.nbytes
+        logger.info(f"Spilled {ref} ({entry.nbytes / 1024**2:.1f} MiB) to {path}")
+        return entry.nbytes
+
+    def _entry(self, ref: str) -> StoredFrame:
+        entry = self.entries[ref]
+        entry.last_access = time.time()
+        return entry
+
+    def get_table(self, ref: str) -> pa.Table | pd.DataFrame:
+        """The stored Arrow table (memory-mapped if spilled), eg. to register it with DuckDB.
+
+        Frames Arrow cannot represent are returned as the DataFrame itself.
+        """
+        entry = self._entry(ref)
+        return entry.frame if entry.table is None else entry.table
+
+    def fingerprint(self, ref: str) -> str:
+        """Content fingerprint of `ref`: references holding the same data share it."""
+        return self.entries[ref].fingerprint
+
+    def get(self, ref: str) -> pd.DataFrame:
+        entry = self._entry(ref)
+        return entry.frame if entry.table is None else entry.table.to_pandas()
+
+    def head(self, ref: str, n: int = 5) -> pd.DataFrame:
+        entry = self._entry(ref)
+        return entry.frame.head(n) if entry.table is None else entry.table.slice(0, n).to_pandas()
+
+    def discard(self, ref: str) -> None:
+        with self.budget.lock:
+            entry = self.entries.pop(ref, None)
+        if entry is None:
+            return
+        self._released(ref)
+        if entry.path is not None:
+            entry.table = None
+            entry.path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Drop every reference and the session's spill files."""
+        with self.budget.lock:
+            self.entries.clear()
+            self.budget.stores.discard(self)
+        _remove_spill_dir(self.spill_dir)
+
+    def summary(self) -> dict:
+        with self.budget.lock:
+            return {
+                'references': len(self.entries),
+                'resident_bytes': self.resident(),
+                'spilled_references': sum(entry.path is not None for entry in self.entries.values()),
+                'max_bytes': self.max_bytes,
+            }
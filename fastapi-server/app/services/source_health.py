@@ -0,0 +1,95 @@
+"""Health tracking and circuit breaking for the remote Argo data sources.
+
+Every real download from a source (cache hits excluded) is recorded with its duration
+and outcome. After FAILURE_THRESHOLD consecutive failures the source's circuit opens and
+requests skip it for OPEN_SECONDS; the next request after that is let through as a probe
+(half-open) and closes the circuit again if it succeeds.
+"""
+from dataclasses import dataclass, asdict
+import os
+import threading
+import time
+
+from loguru import logger
+
+FAILURE_THRESHOLD = int(os.getenv('ARGO_SOURCE_FAILURES', '3'))
+OPEN_SECONDS = float(os.getenv('ARGO_SOURCE_OPEN_SECONDS', '120'))
+SLOW_SECONDS = float(os.getenv('ARGO_SOURCE_SLOW_SECONDS', '30'))
+LATENCY_SMOOTHING = 0.3  # weight of the newest sample in the moving average
+
+
+@dataclass
+class SourceState:
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    avg_seconds: float | None = None
+    opened_at: float | None = None
+    last_error: str = ''
+
+    def circuit(self, now: float) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        return 'open' if now - self.opened_at < OPEN_SECONDS else 'half-open'
+
+
+class SourceHealth:
+    """Thread-safe per-source success/failure and latency tracking with a circuit breaker."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states: dict[str, SourceState] = {}
+
+    def _state(self, source: str) -> SourceState:
+        return self._states.setdefault(source, SourceState())
+
+    def _observe(self, state: SourceState, seconds: float) -> None:
+        if state.avg_seconds is None:
+            state.avg_seconds = seconds
+        else:
+            state.avg_seconds += LATENCY_SMOOTHING * (seconds - state.avg_seconds)
+
+    def record_success(self, source: str, seconds: float) -> None:
+        with self._lock:
+            state = self._state(source)
+            state.successes += 1
+            state.consecutive_failures = 0
+            self._observe(state, seconds)
+            if state.opened_at is not None:
+                logger.info(f"Source {source} recovered, closing its circuit")
+                state.opened_at = None
+
+    def record_failure(self, source: str, seconds: float, error: Exception) -> None:
+        with self._lock:
+            state = self._state(source)
+            state.failures += 1
+            state.consecutive_failures += 1
+            state.last_error = str(error)[:200]
+            self._observe(state, seconds)
+            now = time.time()
+            # A failed half-open probe re-opens the circuit for another full period
+            if state.consecutive_failures >= FAILURE_THRESHOLD and state.circuit(now) != 'open':
+                logger.warning(f"Source {source} failed {state.consecutive_failures} times in a row, opening its circuit")
+                state.opened_at = now
+
+    def is_open(self, source: str) -> bool:
+        """True while requests should skip the source."""
+        with self._lock:
+            return self._state(source).circuit(time.time()) == 'open'
+
+    def is_degraded(self, source: str) -> bool:
+        """True if the source's last request failed or it has been slow lately."""
+        with self._lock:
+            state = self._state(source)
+            return state.consecutive_failures > 0 or (state.avg_seconds or 0.0) > SLOW_SECONDS
+
+    def summary(self) -> dict:
+        with self._lock:
+            now = time.time()
+            return {
+                source: {**asdict(state), 'circuit': state.circuit(now)}
+                for source, state in self._states.items()
+            }
+
+
+source_health = SourceHealth()
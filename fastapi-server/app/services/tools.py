@@ -1,46 +1,559 @@
 from pydantic_ai import Tool, RunContext, ModelRetry
+from pydantic_ai.messages import ModelResponse, ToolCallPart
 
 #, WebSearchTool, CodeExecutionTool
 #from pydantic_ai.common_tools.tavily import tavily_search_tool
 # https://ai.pydantic.dev/third-party-tools/
 
 from app.schemas.chat import AgentDependencies, Plot_Data
+from app.services.argo_cache import argo_cache, cache_key
+from app.services.source_health import source_health
+from app.services.argo_archive import ARCHIVE_TABLE, MAX_ARCHIVE_ROWS, argo_archive
+from app.services.argo_catalog import get_catalog
+from app.services.duckdb_session import QueryCache, cacheable, referenced_refs, table_name
+from app.services.local_argo import (
+    LOCAL_SOURCE, fetch_local_float, fetch_local_profile, fetch_local_region,
+    local_cycles_covered, local_dates_covered, local_supports,
+)
 from argopy import DataFetcher as ArgopyDataFetcher
-import duckdb
+from argopy.errors import DataNotFound
 import pandas as pd
 
 from loguru import logger
 from pathlib import Path
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Callable, Generic, TypeVar
+import asyncio
+import math
+import os
+import threading
+import time
 
 BASE_DIR = Path(__file__).parent
-#CACHE_DIR = str(BASE_DIR / 'cache')
 
 sources = [
     'erddap',
     'argovis'
 ]
+AUTO_SOURCE = 'auto'  # local database when it holds the requested data, else erddap
 
 website_down_msg = f"""The `erddap` website, the site from where you get your data, may be down.
 Ask the user to check at `https://erddap.ifremer.fr/erddap` themselves.
 Retry using {[f"`{src}`" for src in sources if src != 'erddap']} as a source instead, if you haven't already!"""
 
-virtual_table_name = 'db'  # used in duckdb SQL queries
+virtual_table_name = 'db'  # alias of run_duckdb's dataframe_ref in SQL queries
 
+# Blocking argopy/database/DuckDB work runs here, so independent tool calls of one turn overlap
+FETCH_WORKERS = int(os.getenv('ARGO_FETCH_WORKERS', '4'))
+fetch_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='argo-fetch')
 
-def load_argo_profile(
+# Tools whose result is stored as an Out[n] reference
+DATAFRAME_TOOLS = {'find_argo_profiles', 'load_argo_profile', 'load_argo_float', 'load_argo_region', 'run_duckdb',
+                   'query_argo_archive'}
+
+T = TypeVar('T')
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking call in the bounded fetch executor."""
+    return await asyncio.get_running_loop().run_in_executor(fetch_executor, partial(func, *args, **kwargs))
+
+
+def reserve_ref(ctx: RunContext[AgentDependencies]) -> str:
+    """Out[n] reference for this tool call's result, numbered in the order the model made the calls.
+
+    Must be called before the tool's first `await`.
+    """
+    if ctx.tool_call_id is None:
+        return ctx.deps.next_ref()
+
+    call_ids = [ctx.tool_call_id]
+    for message in reversed(ctx.messages):
+        if isinstance(message, ModelResponse):
+            turn_ids = [
+                part.tool_call_id for part in message.parts
+                if isinstance(part, ToolCallPart) and part.tool_name in DATAFRAME_TOOLS
+            ]
+            if ctx.tool_call_id in turn_ids:
+                call_ids = turn_ids
+            break
+    ctx.deps.reserve_refs(call_ids)
+    return ctx.deps.reserved_refs[ctx.tool_call_id]
+
+
+class SingleFlight(Generic[T]):
+    """Let concurrent callers with the same key share one in-flight call.
+
+    Fetches run in executor threads of possibly different sessions (and event loops),
+    so this is thread-based: the first caller runs the call, the others block on its result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        self.executed = 0
+        self.deduplicated = 0
+
+    def do(self, key: str, func: Callable[[], T]) -> tuple[T, bool]:
+        """Return `(result, shared)`; `shared` is True if another caller's in-flight call was reused."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {'executed': self.executed, 'deduplicated': self.deduplicated, 'in_flight': len(self._calls)}
+
+
+fetch_flights: SingleFlight[pd.DataFrame] = SingleFlight()
+
+
+# Region requests larger than one tile are split and the tiles fetched in parallel
+TILE_DEGREES = 10.0
+TILE_DAYS = 365
+MAX_TILES = 64
+TILE_CONCURRENCY = int(os.getenv('ARGO_TILE_CONCURRENCY', str(FETCH_WORKERS)))
+TILE_RETRIES = 2
+
+
+def _spans(start: float, stop: float, step: float) -> list[tuple[float, float]]:
+    """Split [start, stop] into equal spans no longer than `step`."""
+    n = max(1, math.ceil((stop - start) / step - 1e-9))
+    edges = [start + (stop - start) * i / n for i in range(n + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def split_region(box: list) -> list[list]:
+    """Split an argopy region box into tiles of at most TILE_DEGREES x TILE_DEGREES and TILE_DAYS.
+
+    The depth range is never split. Neighbouring tiles share their edges; the merge
+    drops the duplicated rows.
+    """
+    date_spans: list[list[str]] = [[]]
+    if len(box) == 8:
+        start, end = pd.Timestamp(box[6]), pd.Timestamp(box[7])
+        n = max(1, math.ceil((end - start).days / TILE_DAYS))
+        edges = [(start + (end - start) * i / n).strftime('%Y-%m-%d') for i in range(n + 1)]
+        date_spans = [[a, b] for a, b in zip(edges[:-1], edges[1:])]
+
+    return [
+        [lon_min, lon_max, lat_min, lat_max, box[4], box[5], *dates]
+        for lon_min, lon_max in _spans(box[0], box[1], TILE_DEGREES)
+        for lat_min, lat_max in _spans(box[2], box[3], TILE_DEGREES)
+        for dates in date_spans
+    ]
+
+
+async def fetch_region_tiles(tiles: list[list], dataset: str, source: str,
+                             parameters: list[str] | None = None) -> tuple[pd.DataFrame, list[tuple[list, Exception]], Counter]:
+    """Fetch region tiles with bounded concurrency and per-tile retry, merging them as they arrive.
+    Returns:
+        The merged data, the tiles that still failed after retrying with their last error,
+        and how many tiles each source answered.
+        Tiles without any data (eg. over land) are not failures.
+    """
+    semaphore = asyncio.Semaphore(TILE_CONCURRENCY)
+
+    async def fetch_tile(tile: list) -> tuple[list, pd.DataFrame | None, Exception | None, str | None]:
+        async with semaphore:
+            for attempt in range(TILE_RETRIES + 1):
+                try:
+                    df, used, _ = await run_blocking(fetch_routed, 'region', (tile,), dataset, source,
+                                                     ttl=region_ttl(tile[6:8] or None), parameters=parameters)
+                    return tile, df, None, used
+                except DataNotFound:
+                    return tile, None, None, None
+                except Exception as e:
+                    if attempt == TILE_RETRIES:
+                        return tile, None, e, None
+                    logger.warning(f"Tile {tile} failed (attempt {attempt + 1}): {e}")
+                    await asyncio.sleep(2 ** attempt)
+        return tile, None, None, None
+
+    frames: list[pd.DataFrame] = []
+    failures: list[tuple[list, Exception]] = []
+    sources_used: Counter = Counter()
+    for next_tile in asyncio.as_completed([fetch_tile(tile) for tile in tiles]):
+        tile, df, error, used = await next_tile
+        if used:
+            sources_used[used] += 1
+        if error is not None:
+            failures.append((tile, error))
+        elif df is not None and not df.empty:
+            frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(), failures, sources_used
+
+    merged = pd.concat(frames, ignore_index=True)
+    merged = merged.drop_duplicates(subset=[col for col in merged.columns if col != 'N_POINTS'])
+    if 'TIME' in merged.columns:
+        merged = merged.sort_values('TIME', kind='stable')
+    merged = merged.reset_index(drop=True)
+    if 'N_POINTS' in merged.columns:
+        merged['N_POINTS'] = range(len(merged))
+    return merged, failures, sources_used
+
+
+# Cache lifetimes: float and open-ended data keep growing, old date ranges rarely change
+RECENT_DATA_TTL = 24 * 3600
+ARCHIVE_DATA_TTL = 30 * 24 * 3600
+
+
+def region_ttl(date: list[str] | None) -> float:
+    """Cache lifetime for a region request: long once the requested period is over a month old."""
+    if date and len(date) == 2 and pd.Timestamp(date[1]) < pd.Timestamp.now() - pd.Timedelta(days=30):
+        return ARCHIVE_DATA_TTL
+    return RECENT_DATA_TTL
+
+
+def resolve_source(access_point: str, args: tuple, dataset: str, source: str, parameters: list[str] | None = None) -> str:
+    """Pick the source for an 'auto' request: local if it covers the request, else erddap."""
+    if source != AUTO_SOURCE:
+        return source
+    if dataset == 'phy' and local_supports(parameters):
+        if access_point == 'profile' and local_cycles_covered(*args):
+            return LOCAL_SOURCE
+        # The local database is loaded from global daily files, so covered days mean covered boxes
+        if access_point == 'region' and len(args[0]) == 8 and local_dates_covered(*args[0][6:8]):
+            return LOCAL_SOURCE
+    return 'erddap'
+
+
+# Identification and position columns, kept whatever parameters are selected
+ID_COLUMNS = {
+    'N_POINTS', 'PLATFORM_NUMBER', 'CYCLE_NUMBER', 'DIRECTION', 'DATA_MODE',
+    'LATITUDE', 'LONGITUDE', 'TIME', 'POSITION_QC', 'TIME_QC',
+}
+# Per-parameter companion columns, eg. DOXY_QC or DOXY_ADJUSTED_ERROR
+PARAMETER_SUFFIXES = ('', '_QC', '_ERROR', '_ADJUSTED', '_ADJUSTED_QC', '_ADJUSTED_ERROR', '_DATA_MODE')
+
+
+def normalize_parameters(parameters: list[str] | None) -> list[str] | None:
+    """Upper-cased, sorted parameter names; PRES is always included as the vertical coordinate."""
+    if not parameters:
+        return None
+    return sorted({param.upper() for param in parameters} | {'PRES'})
+
+
+def project_columns(df: pd.DataFrame, parameters: list[str] | None) -> pd.DataFrame:
+    """Keep only the identification columns and the columns of the requested parameters."""
+    if not parameters:
+        return df
+    wanted = {param + suffix for param in parameters for suffix in PARAMETER_SUFFIXES}
+    return df[[col for col in df.columns if col in ID_COLUMNS or col in wanted]]
+
+
+def parameter_notes(df: pd.DataFrame, parameters: list[str] | None) -> list[str]:
+    """Tool output lines flagging requested parameters the data does not contain."""
+    missing = [param for param in normalize_parameters(parameters) or [] if param not in df.columns]
+    if not missing:
+        return []
+    return [f'⚠️ Requested parameters not present in the data: {missing}']
+
+
+local_fetchers = {
+    'profile': fetch_local_profile,
+    'float': fetch_local_float,
+    'region': fetch_local_region,
+}
+
+
+def remote_fetch_params(dataset: str, parameters: list[str] | None) -> list[str] | None:
+    """Parameters to request from the remote source (normalized `parameters`), or None for all of them.
+
+    BGC parameter selection is pushed down to ERDDAP, so it changes what is downloaded;
+    phy downloads are small and cached whole, then projected.
+    """
+    return [param for param in parameters if param != 'PRES'] if parameters and dataset == 'bgc' else None
+
+
+def data_cache_key(access_point: str, args: tuple, dataset: str, source: str, parameters: list[str] | None = None) -> str:
+    """Cache key of a remote fetch; `parameters` must already be normalized."""
+    mode = 'standard' if dataset == 'phy' else 'expert'
+    fetch_params = remote_fetch_params(dataset, parameters)
+    return cache_key(access_point, args=list(args), dataset=dataset, source=source, mode=mode,
+                     **({'params': fetch_params} if fetch_params else {}))
+
+
+def fetch_argo_data(access_point: str, args: tuple, dataset: str, source: str, ttl: float | None = None,
+                    parameters: list[str] | None = None, refresh: bool = False) -> tuple[pd.DataFrame, str]:
+    """Fetch Argo data from the local database, or with argopy through the on-disk cache.
+    Args:
+        access_point: the argopy access point, 'profile', 'float' or 'region'
+        args: positional arguments of the access point
+        dataset: 'phy' or 'bgc'
+        source: 'auto', 'local', 'erddap' or 'argovis'
+        ttl: cache lifetime in seconds (default: the cache's default TTL)
+        parameters: Argo parameters to keep (default: all); see `normalize_parameters`
+        refresh: download again even if the cache holds the data, and replace the cached copy
+    Returns:
+        The data, and the source it actually came from.
+    """
+    parameters = normalize_parameters(parameters)
+    source = resolve_source(access_point, args, dataset, source, parameters)
+    if source == LOCAL_SOURCE:
+        if dataset != 'phy':
+            raise ValueError(f"Only 'phy' data is available from the `{LOCAL_SOURCE}` source. For BGC data, use 'erddap'.")
+        # Already indexed locally, so not worth caching
+        return local_fetchers[access_point](*args, parameters=parameters), source
+
+    df, _ = fetch_remote_data(access_point, args, dataset, source, ttl=ttl, parameters=parameters, refresh=refresh)
+    # Concurrent callers share the fetched DataFrame: each gets its own shallow copy, so adding,
+    # replacing or dropping columns stays private (none writes values in place; with pandas 3
+    # copy-on-write even that would be)
+    return project_columns(df.copy(deep=False), parameters), source
+
+
+def fetch_remote_data(access_point: str, args: tuple, dataset: str, source: str, ttl: float | None = None,
+                      parameters: list[str] | None = None, refresh: bool = False) -> tuple[pd.DataFrame, bool]:
+    """Fetch Argo data with argopy through the on-disk cache; concurrent fetches of the same data run once.
+    Args:
+        access_point, args, dataset, ttl, refresh: as for `fetch_argo_data`
+        source: 'erddap' or 'argovis'
+        parameters: normalized Argo parameters (see `normalize_parameters`)
+    Returns:
+        The data, shared with concurrent callers so not to be modified, and whether it came
+        from another caller's in-flight fetch.
+    """
+    mode = 'standard' if dataset == 'phy' else 'expert'
+    fetch_params = remote_fetch_params(dataset, parameters)
+    key = data_cache_key(access_point, args, dataset, source, parameters)
+
+    def fetch() -> pd.DataFrame:
+        start = time.perf_counter()
+        try:
+            fetcher = ArgopyDataFetcher(
+                mode=mode,
+                src=source, # 'erddap' or 'argovis'
+                ds=dataset, # 'phy' or 'bgc'
+                #parallel=True,
+                progress=True,
+                **({'params': fetch_params} if fetch_params else {}),
+            )
+            df = getattr(fetcher, access_point)(*args).to_dataframe().reset_index()
+        except DataNotFound:
+            # The source answered; there is just nothing there
+            source_health.record_success(source, time.perf_counter() - start)
+            raise
+        except Exception as e:
+            source_health.record_failure(source, time.perf_counter() - start, e)
+            raise
+        source_health.record_success(source, time.perf_counter() - start)
+        return df
+
+    description = f"{access_point}{list(args)} {dataset}/{source}"
+    if refresh:
+        # Its own flight: callers that can use the cached copy do not wait for the download
+        df, shared = fetch_flights.do(key + ':refresh', fetch)
+        if not shared:
+            argo_cache.put(key, df, ttl=ttl, description=description)
+    else:
+        df = argo_cache.get(key)
+        if df is not None:
+            logger.info(f"Cache hit for {description}")
+            return df, False
+        # Checked again by the leader, in case a flight cached the data since
+        df, shared = fetch_flights.do(key, lambda: argo_cache.get_or_fetch(key, fetch, ttl=ttl, description=description)[0])
+    if shared:
+        logger.info(f"Shared in-flight fetch of {description}")
+    return df, shared
+
+
+# Source routing: an alternative source is raced in when the first one is degraded
+HEDGE_DELAY = float(os.getenv('ARGO_HEDGE_DELAY', '10'))
+# Separate from fetch_executor: routed fetches wait on these while holding a fetch worker
+source_executor = ThreadPoolExecutor(max_workers=2 * FETCH_WORKERS, thread_name_prefix='argo-source')
+
+
+def fallback_source(source: str, dataset: str) -> str | None:
+    """The other remote source able to serve `dataset`, if any (only erddap has BGC data)."""
+    for candidate in sources:
+        if candidate != source and (dataset == 'phy' or candidate == 'erddap'):
+            return candidate
+    return None
+
+
+def _race(access_point: str, args: tuple, dataset: str, ttl: float | None, parameters: list[str] | None,
+          primary: str, backup: str | None, hedge_delay: float | None) -> tuple[pd.DataFrame, str]:
+    """Fetch from `primary`; start `backup` when primary fails, or after `hedge_delay` seconds.
+    The first answer wins; a slower source still finishes in the background and fills the cache.
+    """
+    def submit(source: str) -> Future:
+        return source_executor.submit(fetch_argo_data, access_point, args, dataset, source, ttl, parameters)
+
+    futures = {submit(primary): primary}
+    errors: list[Exception] = []
+    while futures:
+        hedging = backup is not None and hedge_delay is not None
+        done, _ = wait(futures, timeout=hedge_delay if hedging else None, return_when=FIRST_COMPLETED)
+        if not done:
+            logger.info(f"{primary} has not answered after {hedge_delay}s, hedging with {backup}")
+            futures[submit(backup)] = backup
+            backup = None
+            continue
+
+        for future in done:
+            source = futures.pop(future)
+            try:
+                df, _ = future.result()
+                return df, source
+            except DataNotFound:
+                raise
+            except Exception as e:
+                logger.warning(f"Fetching from {source} failed: {e}")
+                errors.append(e)
+
+        if backup is not None:
+            logger.info(f"Failing over from {primary} to {backup}")
+            futures[submit(backup)] = backup
+            backup = None
+
+    raise errors[0]
+
+
+def fetch_routed(access_point: str, args: tuple, dataset: str, source: str, ttl: float | None = None,
+                 parameters: list[str] | None = None) -> tuple[pd.DataFrame, str, str]:
+    """Fetch Argo data, routing around unhealthy remote sources.
+
+    - the requested source's circuit is open: go straight to the other source
+    - `phy` data and the source has been failing or slow: race the other source after HEDGE_DELAY
+    - otherwise: the requested source, failing over to the other one on error
+    Returns:
+        The data, the source that answered, and the routing decision with its timing.
+    """
+    start = time.perf_counter()
+    source = resolve_source(access_point, args, dataset, source, normalize_parameters(parameters))
+    backup = fallback_source(source, dataset) if source in sources else None
+
+    if backup is None:
+        df, source = fetch_argo_data(access_point, args, dataset, source, ttl, parameters)
+        return df, source, f"{source} only, {time.perf_counter() - start:.1f}s"
+
+    hedge_delay = None
+    if source_health.is_open(source) and not source_health.is_open(backup):
+        decision = f"{source} circuit open, went straight to {backup}"
+        source, backup = backup, None
+    elif dataset == 'phy' and source_health.is_degraded(source):
+        decision = f"{source} degraded, hedged with {backup} after {HEDGE_DELAY:g}s"
+        hedge_delay = HEDGE_DELAY
+    else:
+        decision = f"{source} first, {backup} on failure"
+
+    df, used = _race(access_point, args, dataset, ttl, parameters, source, backup, hedge_delay)
+    elapsed = time.perf_counter() - start
+    logger.info(f"Routing: {decision}; answered by {used} in {elapsed:.1f}s")
+    return df, used, f"{decision}; answered by {used} in {elapsed:.1f}s"
+
+
+MAX_LISTED_FLOATS = 30
+
+
+def cycle_ranges(cycles: list[int]) -> str:
+    """Compact a sorted list of cycle numbers, eg. [1, 2, 3, 7] -> '1-3, 7'."""
+    ranges = []
+    for cycle in cycles:
+        if ranges and cycle == ranges[-1][1] + 1:
+            ranges[-1][1] = cycle
+        else:
+            ranges.append([cycle, cycle])
+    return ', '.join(str(lo) if lo == hi else f'{lo}-{hi}' for lo, hi in ranges)
+
+
+async def find_argo_profiles(
+    ctx: RunContext[AgentDependencies],
+    lon: list[float] | None = None,
+    lat: list[float] | None = None,
+    date: list[str] | None = None,
+    float_id: int | list[int] | None = None,
+) -> str:
+    """List which Argo floats and cycles exist in a region, time window and/or for given floats, without loading any measurements.
+    Use it to answer discovery questions ("which floats were near ...", "how many profiles ...") and to pick
+    precise `load_argo_profile` calls instead of loading a whole region.
+    Args:
+        lon: optional longitude bounds [lon_min, lon_max]
+        lat: optional latitude bounds [lat_min, lat_max]
+        date: optional date bounds [date_min, date_max], eg. ['2023-01-01', '2023-03-31']
+        float_id: optional WMO identifier(s) of the float(s)
+
+    The matching profiles are also stored as a dataframe (float_id, cycle_number, direction, date, latitude,
+    longitude, data_mode, ocean, local) for run_duckdb; `local` is true for profiles in FloatChat's own database.
+    """
+    logger.info(f"Searching Argo catalog: lon={lon}, lat={lat}, date={date}, float={float_id}")
+    if lon is None and lat is None and date is None and float_id is None:
+        raise ModelRetry("Give at least one of lon/lat, date or float_id.")
+
+    ref = reserve_ref(ctx)
+    catalog = await run_blocking(get_catalog)
+    if catalog is None:
+        raise ModelRetry("The Argo catalog has not been built on this server; use the load_argo_* tools instead.")
+
+    start = time.perf_counter()
+    try:
+        found = await run_blocking(catalog.search, lon=lon, lat=lat, date=date, float_id=float_id)
+    except Exception as e:
+        logger.error(f"Error searching the Argo catalog: {e}")
+        raise ModelRetry(f"Error searching the Argo catalog: {e}")
+    elapsed = time.perf_counter() - start
+
+    await run_blocking(ctx.deps.store_dataframe, found.reset_index(drop=True), ref)
+    floats = found.groupby('float_id')
+    output = [
+        f'Found {len(found)} profiles from {floats.ngroups} floats in {elapsed * 1000:.0f} ms, stored in `{ref}`.',
+    ]
+    for wmo, group in list(floats)[:MAX_LISTED_FLOATS]:
+        first, last = f"{group['date'].min():%Y-%m-%d}", f"{group['date'].max():%Y-%m-%d}"
+        local = ' (all in local database)' if group['local'].all() else ''
+        output.append(
+            f"- float {wmo}: cycles {cycle_ranges(sorted(group['cycle_number'].unique()))}, "
+            f"{first if first == last else f'{first} to {last}'}{local}"
+        )
+    if floats.ngroups > MAX_LISTED_FLOATS:
+        output.append(f'... {floats.ngroups - MAX_LISTED_FLOATS} more floats, query `{ref}` with run_duckdb to see them.')
+    return '\n'.join(output)
+
+
+async def load_argo_profile(
     ctx: RunContext[AgentDependencies],
     float_id: int,
     cyc: int | list[int],
     dataset: str = 'phy',
-    source: str = 'erddap',
+    source: str = AUTO_SOURCE,
+    parameters: list[str] | None = None,
 ) -> str:
     """Load Argo data for a specific profile.
     Args:
         float_id: the WMO identifier of the float
         cyc: the cycle number or list of cycle numbers
         dataset: the type of data to load, either 'phy' (physical) or 'bgc' (biogeochemical)
-        source: the data source, either 'erddap' or 'argovis' (default is 'erddap')
-            ⚠️ You cannot get BGC data from 'argovis', only 'phy' data is available there. For BGC data, use 'erddap'.
+        source: the data source: 'auto', 'local', 'erddap' or 'argovis' (default is 'auto')
+            'auto' uses FloatChat's own database ('local') when it holds the requested data, and 'erddap' otherwise.
+            ⚠️ You cannot get BGC data from 'argovis' or 'local', only 'phy' data is available there. For BGC data, use 'erddap'.
+        parameters: optional list of Argo parameters to load, eg. ['DOXY'] or ['TEMP', 'PSAL'] (default: all).
+            Position, time and identification columns, PRES and each parameter's QC/ADJUSTED/ERROR columns are always kept.
+            Select only what the question needs, especially for 'bgc' data, which has dozens of parameters.
     
     For instance, to retrieve temperature (physical property) data for the 12th profile of float WMO 6902755:
     float_id=6902755, cyc=12
@@ -49,17 +562,10 @@ def load_argo_profile(
     float_id=6902755, cyc=[3, 12]
     """
     logger.info(f"Loading Argo profile data: float={float_id}, cyc={cyc}, dataset={dataset}, source={source}")
+    ref = reserve_ref(ctx)
 
     try:
-        fetcher = ArgopyDataFetcher(
-            mode='standard' if dataset == 'phy' else 'expert',
-            src=source, # 'erddap' or 'argovis'
-            ds=dataset, # 'phy' or 'bgc'
-            #parallel=True,
-            progress=True,
-            #cache=True, cachedir=CACHE_DIR
-        )
-        df = fetcher.profile(float_id, cyc).to_dataframe().reset_index()
+        df, source, route = await run_blocking(fetch_routed, 'profile', (float_id, cyc), dataset, source, parameters=parameters)
     except FileNotFoundError as e:
         logger.error(f"Error: {e}\nWebsite may be down.")
         raise ModelRetry(f"Error: {e}\n{website_down_msg}")
@@ -67,46 +573,48 @@ def load_argo_profile(
         logger.error(f"Error loading Argo profile data: {e}")
         raise ModelRetry(f"Error loading Argo profile data: {e}")
     
-    desc = f"Argo float ID {float_id}, cycle{'s' if isinstance(cyc, list) else ''} {cyc}, dataset {dataset}"
-    ref: str = ctx.deps.store_dataframe(df)
+    desc = f"Argo float ID {float_id}, cycle{'s' if isinstance(cyc, list) else ''} {cyc}, dataset {dataset}" + (f", parameters {normalize_parameters(parameters)}" if parameters else "")
+    await run_blocking(ctx.deps.store_dataframe, df, ref)
     output = [
         f'Loaded Argo data inside reference `{ref}`.',
         f'Description: {desc}',
+        f'Source: {source}',
+        f'Route: {route}',
         f'Columns: {list(df.columns)}',
         f'Rows: {len(df)}'
     ]
+    output.extend(parameter_notes(df, parameters))
     logger.info(f"Loaded Argo data with rows={len(df)}.")
     return '\n'.join(output)
 
 
-def load_argo_float(
+async def load_argo_float(
     ctx: RunContext[AgentDependencies],
     float_id: int | list[int],
     dataset: str = 'phy',
-    source: str = 'erddap',
+    source: str = AUTO_SOURCE,
+    parameters: list[str] | None = None,
 ) -> str:
     """Load Argo data for a specific float.
     Args:
         float_id: the WMO identifier(s) of the float. Use a list to load multiple floats.
         dataset: the type of data to load, either 'phy' (physical) or 'bgc' (biogeochemical)
-        source: the data source, either 'erddap' or 'argovis' (default is 'erddap')
-            ⚠️ You cannot get BGC data from 'argovis', only 'phy' data is available there. For BGC data, use 'erddap'.
+        source: the data source: 'auto', 'local', 'erddap' or 'argovis' (default is 'auto')
+            'auto' uses FloatChat's own database ('local') when it holds the requested data, and 'erddap' otherwise.
+            ⚠️ You cannot get BGC data from 'argovis' or 'local', only 'phy' data is available there. For BGC data, use 'erddap'.
+        parameters: optional list of Argo parameters to load, eg. ['DOXY'] or ['TEMP', 'PSAL'] (default: all).
+            Position, time and identification columns, PRES and each parameter's QC/ADJUSTED/ERROR columns are always kept.
+            Select only what the question needs, especially for 'bgc' data, which has dozens of parameters.
 
     Eg. float_id=[6902746, 6902755] (for multiple floats)
     Eg. float_id=6902746 (for a single float)
     """
     logger.info(f"Loading Argo float data: float={float_id}, dataset={dataset}, source={source}")
+    ref = reserve_ref(ctx)
 
     try:
-        fetcher = ArgopyDataFetcher(
-            mode='standard' if dataset == 'phy' else 'expert',
-            src=source, # 'erddap' or 'argovis'
-            ds=dataset, # 'phy' or 'bgc'
-            #parallel=True,
-            progress=True,
-            #cache=True, cachedir=CACHE_DIR
-        )
-        df = fetcher.float(float_id).to_dataframe().reset_index()
+        df, source, route = await run_blocking(fetch_routed, 'float', (float_id,), dataset, source, ttl=RECENT_DATA_TTL,
+                                               parameters=parameters)
     except FileNotFoundError as e:
         logger.error(f"Error: {e}\nWebsite may be down.")
         raise ModelRetry(f"Error: {e}\n{website_down_msg}")
@@ -114,26 +622,30 @@ def load_argo_float(
         logger.error(f"Error loading Argo float data: {e}")
         raise ModelRetry(f"Error loading Argo float data: {e}")
     
-    desc = f"Argo float {float_id}, dataset {dataset}"
-    ref = ctx.deps.store_dataframe(df)
+    desc = f"Argo float {float_id}, dataset {dataset}" + (f", parameters {normalize_parameters(parameters)}" if parameters else "")
+    await run_blocking(ctx.deps.store_dataframe, df, ref)
     output = [
         f'Loaded Argo data inside reference `{ref}`.',
         f'Description: {desc}',
+        f'Source: {source}',
+        f'Route: {route}',
         f'Columns: {list(df.columns)}',
         f'Rows: {len(df)}'
     ]
+    output.extend(parameter_notes(df, parameters))
     logger.info(f"Loaded Argo data with rows={len(df)}.")
     return '\n'.join(output)
 
 
-def load_argo_region(
+async def load_argo_region(
     ctx: RunContext[AgentDependencies],
     lon: list[float],
     lat: list[float],
     dpt: list[float],
     date: list[str] | None = None,
     dataset: str = 'phy',
-    source: str = 'erddap',
+    source: str = AUTO_SOURCE,
+    parameters: list[str] | None = None,
 ) -> str:
     """Load Argo data for a specific region.
     The region is defined by:
@@ -142,30 +654,51 @@ def load_argo_region(
         dpt: list of two floats [dpt_min, dpt_max]
         date: optional list of two strings [date_min, date_max] in 'YYYY-MM-DD' format
         dataset: the type of data to load, either 'phy' (physical) or 'bgc' (biogeochemical)
-        source: the data source, either 'erddap' or 'argovis' (default is 'erddap')
-            ⚠️ You cannot get BGC data from 'argovis', only 'phy' data is available there. For BGC data, use 'erddap'.
+        source: the data source: 'auto', 'local', 'erddap' or 'argovis' (default is 'auto')
+            'auto' uses FloatChat's own database ('local') when it holds the requested data, and 'erddap' otherwise.
+            ⚠️ You cannot get BGC data from 'argovis' or 'local', only 'phy' data is available there. For BGC data, use 'erddap'.
+        parameters: optional list of Argo parameters to load, eg. ['DOXY'] or ['TEMP', 'PSAL'] (default: all).
+            Position, time and identification columns, PRES and each parameter's QC/ADJUSTED/ERROR columns are always kept.
+            Select only what the question needs, especially for 'bgc' data, which has dozens of parameters.
     
     If `date` is not specified, the entire time series is fetched.
 
     Eg: lon=[-60.0, -55.0], lat=[40.0, 45.0], dpt=[0.0, 10.0], date=['2007-08-01', '2007-09-01'], dataset='phy'
+    Eg: the whole Arabian Sea: lon=[50.0, 78.0], lat=[0.0, 30.0], dpt=[0.0, 100.0], date=['2021-01-01', '2021-12-31']
 
-    Always think about the size of the data you are requesting!
-    If your box is too large, ie. larger than the box above, the data request will likely fail!
-    Make sure the distance between lon_min and lon_max is less than 10.0.
-    You are allowed to use smaller boxes for approximation.
+    Boxes larger than 10 x 10 degrees or 365 days are split into tiles that are fetched in parallel,
+    so basin-scale boxes work; requests needing more than 64 tiles are refused.
+    Always think about the size of the data you are requesting: narrow the depth and date range where you can.
+    If some tiles fail, the result says which boxes are missing.
     """
     box = lon + lat + dpt + (date if date else [])
     logger.info(f"Loading Argo region data: box={box}, dataset={dataset}, source={source}")
+    ref = reserve_ref(ctx)
+    failures: list[tuple[list, Exception]] = []
     try:
-        fetcher = ArgopyDataFetcher(
-            'standard' if dataset == 'phy' else 'expert',
-            src=source, # 'erddap' or 'argovis'
-            ds=dataset, # 'phy' or 'bgc'
-            #parallel=True,
-            progress=True,
-            #cache=True, cachedir=CACHE_DIR
-        )
-        df = fetcher.region(box).to_dataframe().reset_index()
+        source = await run_blocking(resolve_source, 'region', (box,), dataset, source, normalize_parameters(parameters))
+        # The local database answers any box in one indexed query
+        tiles = [box] if source == LOCAL_SOURCE else split_region(box)
+        if len(tiles) > MAX_TILES:
+            raise ModelRetry(
+                f"Error: this request would need {len(tiles)} tiles (at most {MAX_TILES} are allowed). "
+                "Narrow the box or the date range."
+            )
+
+        if len(tiles) == 1:
+            df, source, route = await run_blocking(fetch_routed, 'region', (box,), dataset, source, ttl=region_ttl(date),
+                                                   parameters=parameters)
+        else:
+            logger.info(f"Fetching region as {len(tiles)} tiles from {source}")
+            df, failures, sources_used = await fetch_region_tiles(tiles, dataset, source, parameters)
+            route = f"{len(tiles)} tiles, answered by {dict(sources_used)}"
+            source = ', '.join(sources_used) or source
+            if len(failures) == len(tiles):
+                raise failures[0][1]
+            if df.empty and not failures:
+                raise DataNotFound(f"No data found in any of the {len(tiles)} tiles of {box}")
+    except ModelRetry:
+        raise
     except FileNotFoundError as e:
         logger.error(f"Error: {e}\nWebsite may be down.")
         raise ModelRetry(f"Error: {e}\n{website_down_msg}")
@@ -173,60 +706,139 @@ def load_argo_region(
         logger.error(f"Error loading Argo region data: {e}")
         raise ModelRetry(f"Error loading Argo region data: {e}")
 
-    desc = f"Argo region {box}, dataset {dataset}"
-    ref = ctx.deps.store_dataframe(df)
+    desc = f"Argo region {box}, dataset {dataset}" + (f", parameters {normalize_parameters(parameters)}" if parameters else "")
+    await run_blocking(ctx.deps.store_dataframe, df, ref)
     output = [
         f'Loaded Argo data inside reference `{ref}`.',
         f'Description: {desc}',
+        f'Source: {source}',
+        f'Route: {route}',
         f'Columns: {list(df.columns)}',
         f'Rows: {len(df)}'
     ]
+    output.extend(parameter_notes(df, parameters))
+    if len(tiles) > 1:
+        output.append(f'Tiles: {len(tiles)} fetched in parallel, {len(failures)} failed')
+    if failures:
+        output.append('⚠️ Data is MISSING for these failed tiles [lon_min, lon_max, lat_min, lat_max, dpt_min, dpt_max(, date_min, date_max)]:')
+        output.extend(f'  {tile}: {error}' for tile, error in failures)
+        logger.warning(f"{len(failures)} of {len(tiles)} tiles failed for region {box}")
     logger.info(f"Loaded Argo data with rows={len(df)}.")
     return '\n'.join(output)
 
 
-def run_duckdb(
+async def run_duckdb(
     ctx: RunContext[AgentDependencies],
-    dataframe_ref: str,
-    sql: str
+    sql: str,
+    dataframe_ref: str | None = None,
 ) -> str:
-    f"""Run DuckDB SQL query on the DataFrame.
+    """Run a DuckDB SQL query on the stored DataFrames.
     Args:
-        dataframe_ref: reference string, which refers to the DataFrame
         sql: the query to be executed using DuckDB
-    
-    The DataFrame is made available as a virtual table named `{virtual_table_name}`.
+        dataframe_ref: optional reference string of a DataFrame to expose as the table `db`
+
+    Every stored DataFrame is available as a table named after its reference: `Out[1]` is `out_1`,
+    `Out[2]` is `out_2`, and so on. One query can join, union or compare several of them.
     You can use standard SQL syntax to query the data.
-    Example SQL query:
-        SELECT AVG(TEMP) FROM {virtual_table_name} WHERE PRES >= 490.0;
-    Make sure that the table name `{virtual_table_name}` is used in your SQL query, not `{dataframe_ref}`!
+    Example SQL queries:
+        SELECT AVG(TEMP) FROM out_1 WHERE PRES >= 490.0;
+        SELECT 'a' AS float, AVG(TEMP) FROM out_1 UNION ALL SELECT 'b', AVG(TEMP) FROM out_2;
+    Never write `Out[1]` in SQL, it is not a valid table name.
 
     Note: The result of the query is stored as a new DataFrame reference, not given directly to you.
     """
     logger.info(f"Running DuckDB SQL on dataframe={dataframe_ref}, sql={sql}")
+    ref = reserve_ref(ctx)
 
+    refs = referenced_refs(sql)
+    if dataframe_ref is not None and dataframe_ref not in refs:
+        refs.append(dataframe_ref)
     try:
-        data = ctx.deps.get(dataframe_ref)
+        tables = {table_ref: ctx.deps.get_table(table_ref) for table_ref in refs}
     except Exception as e:
         logger.error(f"Error retrieving dataframe: {e}")
         raise ModelRetry(f"Error retrieving dataframe: {e}")
-    
+
+    # The same query over the same data already has a stored result
+    results = ctx.deps.duckdb.results
+    key = None
+    if cacheable(sql):
+        fingerprints = {table_ref: ctx.deps.output.fingerprint(table_ref) for table_ref in refs}
+        key = QueryCache.key(sql, fingerprints, alias_of=dataframe_ref, alias=virtual_table_name)
+        cached = results.get(key)
+        if cached is not None and cached in ctx.deps.output:
+            logger.info(f"DuckDB query result already stored as {cached}")
+            return f'This query was already executed on the same data; its result is in reference `{cached}`.'
+
     try:
-        result = duckdb.query_df(df=data, virtual_table_name=virtual_table_name, sql_query=sql)
+        result = await run_blocking(ctx.deps.duckdb.query, sql, tables, alias_of=dataframe_ref, alias=virtual_table_name)
     except Exception as e:
-        if 'Catalog Error: Table' in str(e) and virtual_table_name not in sql:
-            if dataframe_ref in sql:
-                raise ModelRetry(f"Error: You must use the table name `{virtual_table_name}` in your SQL query, not `{dataframe_ref}`.")
-            raise ModelRetry(f"Error: You must use the table name `{virtual_table_name}` in your SQL query, not whatever you used.")
+        if 'Catalog Error: Table' in str(e):
+            available = [table_name(stored) for stored in ctx.deps.output]
+            raise ModelRetry(
+                f"Error: {e}\nThe stored DataFrames are available as the tables {available}"
+                + (f" and `{virtual_table_name}` for {dataframe_ref}" if dataframe_ref else "")
+                + ", eg. `Out[1]` is `out_1`."
+            )
         logger.error(f"Error running DuckDB SQL: {e}")
         raise ModelRetry(f"Error running DuckDB SQL: {e}")
-    
+
     # pass the result as ref (because DuckDB SQL can select many rows, creating another huge dataframe)
-    ref = ctx.deps.store_dataframe(result.df())  # pyright: ignore[reportUnknownMemberType]
+    await run_blocking(ctx.deps.store_dataframe, result, ref)
+    if key is not None:
+        results.put(key, ref)
     output = [
         f'Executed SQL query and stored result inside reference `{ref}`.',
     ]
-    logger.info(f"DuckDB query result stored as {ref}, rows={len(result.df())}") # pyright: ignore[reportUnknownMemberType]
+    logger.info(f"DuckDB query result stored as {ref}, rows={len(result)}")
+    return '\n'.join(output)
+
+
+async def query_argo_archive(
+    ctx: RunContext[AgentDependencies],
+    sql: str,
+) -> str:
+    """Run a DuckDB SQL query over the whole local Argo archive, without downloading anything.
+    Args:
+        sql: the query to be executed using DuckDB, on the table `archive`
+
+    Use it for questions spanning many floats or years, eg. decadal trends in a basin.
+    `archive` has one row per measurement, with the columns float_id, cycle_number, datetime,
+    latitude, longitude, pressure, temperature, salinity, their *_qc flags and data_mode
+    (and year, month when the archive is stored as Parquet).
+    Only the columns and rows the query needs are read, so select just the columns you use,
+    aggregate in SQL and always filter on time and position; filters on `year` and `month`
+    skip whole files.
+    Example SQL queries:
+        SELECT year, AVG(temperature) AS temperature FROM archive
+        WHERE longitude BETWEEN 50 AND 78 AND latitude BETWEEN 0 AND 30 AND pressure < 10
+          AND year BETWEEN 2010 AND 2020 GROUP BY year ORDER BY year;
+
+    Note: The result of the query is stored as a new DataFrame reference, not given directly to you.
+    """
+    logger.info(f"Running DuckDB SQL on the Argo archive, sql={sql}")
+    ref = reserve_ref(ctx)
+
+    try:
+        result, truncated, seconds = await run_blocking(argo_archive.query, sql)
+    except Exception as e:
+        if 'Catalog Error' in str(e) or 'Binder Error' in str(e):
+            try:
+                columns = await run_blocking(argo_archive.columns)
+            except Exception:
+                columns = []
+            raise ModelRetry(f"Error: {e}\nQuery the table `{ARCHIVE_TABLE}`, with the columns {columns}.")
+        logger.error(f"Error querying the Argo archive: {e}")
+        raise ModelRetry(f"Error querying the Argo archive: {e}")
+
+    await run_blocking(ctx.deps.store_dataframe, result, ref)
+    output = [
+        f'Executed SQL query on the {argo_archive.backend} archive in {seconds:.1f}s and stored result inside reference `{ref}`.',
+        f'Rows: {len(result)}, columns: {list(result.columns)}',
+    ]
+    if truncated:
+        output.append(f'⚠️ The result was cut at {MAX_ARCHIVE_ROWS} rows; aggregate or filter more in SQL.')
+    logger.info(f"Archive query result stored as {ref}, rows={len(result)}")
     return '\n'.join(output)
 
 
@@ -241,12 +853,12 @@ def get_some_rows(
     logger.info(f"Displaying dataframe={dataframe_ref}")
 
     try:
-        df = ctx.deps.get(dataframe_ref)
+        df = ctx.deps.head(dataframe_ref)
     except Exception as e:
         logger.error(f"Error retrieving dataframe: {e}")
         raise ModelRetry(f"Error retrieving dataframe: {e}")
 
-    return df.head().to_string()  # pyright: ignore[reportUnknownMemberType]
+    return df.to_string()  # pyright: ignore[reportUnknownMemberType]
 
 
 def plot_saved_data(
@@ -368,12 +980,16 @@ def plot_saved_data(
     ctx.deps.store_plot_data(plot_data)
 
 
+# Data tools run concurrently within a turn; plots stay sequential so they reach the
+# frontend in the order the model asked for them
 all_tools = [
-    Tool(load_argo_float, sequential=True),
-    Tool(load_argo_profile, sequential=True),
-    Tool(load_argo_region, sequential=True),
-    Tool(run_duckdb, sequential=True),
-    Tool(get_some_rows, sequential=True),
+    Tool(find_argo_profiles),
+    Tool(load_argo_float),
+    Tool(load_argo_profile),
+    Tool(load_argo_region),
+    Tool(run_duckdb),
+    Tool(query_argo_archive),
+    Tool(get_some_rows),
     Tool(plot_saved_data, sequential=True),
 ]
 
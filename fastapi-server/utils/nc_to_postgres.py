@@ -0,0 +1,249 @@
+import xarray as xr
+import pandas as pd
+from pathlib import Path
+from typing import Iterator, Optional
+import argparse
+import sys
+import time
+
+from profiles import extract_profile_arrays, flatten_profiles, find_netcdf_files
+from postgres import ArgoPostgresManager, prepare_profile_frame, get_database_config, logger, LAYOUT_TABLES
+
+# Profiles flattened per batch; with ~1000 levels per profile this bounds a batch to ~200k rows
+DEFAULT_CHUNK_PROFILES = 200
+
+
+def iter_profile_batches(nc_file: str, source_file: str,
+                         chunk_profiles: int = DEFAULT_CHUNK_PROFILES) -> Iterator[pd.DataFrame]:
+    """
+    Read a NetCDF file in blocks of profiles and yield rows ready for argo_profiles.
+
+    Only one block of `chunk_profiles` profiles is read from disk and flattened at a time,
+    and each block goes through the same quality filters as `read_and_prepare_csv`.
+
+    Args:
+        nc_file: Path to the NetCDF file
+        source_file: Value stored in the `source_file` column
+        chunk_profiles: Number of profiles per batch
+
+    Yields:
+        Prepared DataFrame for each non-empty block
+    """
+    with xr.open_dataset(nc_file) as ds:
+        n_profiles = ds.sizes.get('N_PROF', 0)
+
+        for start in range(0, n_profiles, chunk_profiles):
+            block = ds.isel(N_PROF=slice(start, start + chunk_profiles))
+            df = flatten_profiles(extract_profile_arrays(block))
+            if df.empty:
+                continue
+
+            # profile_id is the profile index within the whole file, not within the block
+            df['profile_id'] += start
+            batch = prepare_profile_frame(df, source_file)
+            if not batch.empty:
+                yield batch
+
+
+def stream_netcdf_file(pg_manager: ArgoPostgresManager, nc_file: str, source_file: str,
+                       chunk_profiles: int = DEFAULT_CHUNK_PROFILES) -> Optional[int]:
+    """
+    Stream one NetCDF file into argo_profiles in bounded COPY batches.
+
+    All batches of a file and its ingestion ledger entry are written in a single
+    transaction, so a failure part way through leaves no rows from that file behind,
+    and a later `--incremental` run skips the file.
+
+    Args:
+        pg_manager: Connected ArgoPostgresManager
+        nc_file: Path to the NetCDF file
+        source_file: Value stored in the `source_file` column
+        chunk_profiles: Number of profiles per batch
+
+    Returns:
+        Number of rows inserted (0 if no row passed the filters), or None if the file failed
+    """
+    total_rows = 0
+
+    try:
+        with pg_manager.transaction():
+            for batch in iter_profile_batches(nc_file, source_file, chunk_profiles):
+                if not pg_manager.copy_dataframe(batch):
+                    raise RuntimeError(f"COPY failed for batch starting at row {total_rows}")
+                total_rows += len(batch)
+            pg_manager.record_ledger_entry(nc_file, source_file, total_rows)
+
+        return total_rows
+
+    except Exception as e:
+        logger.error(f"❌ Error streaming {nc_file}: {e}")
+        return None
+
+
+def stream_all_netcdf_files(pg_manager: ArgoPostgresManager, nc_root_dir: str,
+                            chunk_profiles: int = DEFAULT_CHUNK_PROFILES,
+                            incremental: bool = False) -> bool:
+    """
+    Stream every NetCDF file under a directory into argo_profiles.
+
+    Args:
+        pg_manager: Connected ArgoPostgresManager
+        nc_root_dir: Root directory containing NetCDF files
+        chunk_profiles: Number of profiles per batch
+        incremental: Skip files the ingestion ledger shows as unchanged and atomically
+            replace the rows of changed files
+
+    Returns:
+        bool: True if at least one file was loaded (or, incrementally, none failed)
+    """
+    nc_files = find_netcdf_files(nc_root_dir)
+
+    if not nc_files:
+        logger.warning(f"No NetCDF files found in {nc_root_dir}")
+        return False
+
+    logger.info(f"📅 Streaming {len(nc_files)} NetCDF files into PostgreSQL")
+
+    # Same shape as the CSV loader's source_file, e.g. argo_data/2025/01/20250101_prof.nc
+    source_root = Path(nc_root_dir).parent
+
+    processed_count = 0
+    empty_count = 0
+    skipped_count = 0
+    failed_count = 0
+    total_records = 0
+    run_start = time.perf_counter()
+
+    for i, nc_file in enumerate(nc_files, 1):
+        file_name = Path(nc_file).name
+        logger.info(f"\n⏰ [{i}/{len(nc_files)}] Streaming: {file_name}")
+
+        start = time.perf_counter()
+        source_file = str(Path(nc_file).relative_to(source_root))
+        if incremental:
+            status, rows = pg_manager.load_file_incremental(
+                nc_file, source_file,
+                lambda: iter_profile_batches(nc_file, source_file, chunk_profiles)
+            )
+            if status == 'unchanged':
+                skipped_count += 1
+                logger.info(f"⏭️  {file_name} unchanged since last load, skipping")
+                continue
+            rows = None if status == 'failed' else rows
+        else:
+            rows = stream_netcdf_file(pg_manager, nc_file, source_file, chunk_profiles)
+        elapsed = time.perf_counter() - start
+
+        if rows:
+            processed_count += 1
+            total_records += rows
+            logger.info(f"✅ Successfully streamed {file_name} ({rows} records in {elapsed:.1f}s)")
+        elif rows == 0:
+            # Loaded (and recorded in the ledger), but nothing passed the filters
+            empty_count += 1
+            logger.warning(f"⚠️ No valid data in {file_name}")
+        else:
+            failed_count += 1
+            logger.error(f"❌ Failed to stream {file_name}")
+
+    elapsed = time.perf_counter() - run_start
+    logger.info(f"\n🎉 Streaming complete!")
+    logger.info(f"✅ Successfully processed: {processed_count} files")
+    logger.info(f"⚪ Files without valid data: {empty_count}")
+    if incremental:
+        logger.info(f"⏭️  Unchanged files skipped: {skipped_count}")
+    logger.info(f"❌ Failed to process: {failed_count} files")
+    logger.info(f"📊 Total records inserted: {total_records} ({total_records / elapsed if elapsed > 0 else 0:,.0f} rows/sec)")
+
+    pg_manager.log_table_stats()
+
+    if incremental:
+        return failed_count == 0
+    return processed_count + empty_count > 0
+
+
+def main(argv=None):
+    """
+    Stream ARGO NetCDF files directly into PostgreSQL, skipping the CSV stage.
+    """
+    parser = argparse.ArgumentParser(description="Stream ARGO NetCDF files directly into PostgreSQL/PostGIS.")
+    parser.add_argument('--input', default=str(Path(__file__).parent.parent.parent / "argo_data"),
+                        help="Directory containing NetCDF files")
+    parser.add_argument('--chunk-profiles', type=int, default=DEFAULT_CHUNK_PROFILES,
+                        help="Number of profiles read and inserted per batch")
+    parser.add_argument('--append', action='store_true',
+                        help="Append to the existing argo_profiles table instead of recreating it")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Keep the existing table and load only new or changed files (per the ingestion ledger)")
+    parser.add_argument('--bulk', action='store_true',
+                        help="Load into an unindexed table and build indexes in parallel afterwards")
+    parser.add_argument('--index-workers', type=int, default=4,
+                        help="Number of indexes built concurrently in bulk mode")
+    parser.add_argument('--layout', choices=list(LAYOUT_TABLES), default='wide',
+                        help="Wide argo_profiles table, normalized profiles/measurements tables behind an "
+                             "argo_profiles view, or argo_profiles partitioned by month")
+    args = parser.parse_args(argv)
+
+    # Get database configuration with authentication handling
+    DB_CONFIG = get_database_config()
+
+    logger.info("🚀 Starting ARGO NetCDF → PostgreSQL streaming import...")
+    logger.info(f"📁 NetCDF files directory: {args.input}")
+    logger.info(f"🗄️  Database: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
+
+    pg_manager = ArgoPostgresManager(**DB_CONFIG, layout=args.layout)
+
+    try:
+        if not pg_manager.create_database_if_not_exists():
+            logger.error("Failed to create/access database")
+            return False
+
+        if not pg_manager.connect():
+            logger.error("Failed to connect to database")
+            return False
+
+        phase_times = {}
+
+        start = time.perf_counter()
+        recreate = not (args.append or args.incremental)
+        if not pg_manager.create_argo_table(recreate=recreate, with_indexes=not args.bulk):
+            logger.error("Failed to create table schema")
+            return False
+
+        if not pg_manager.create_ingestion_ledger():
+            logger.error("Failed to create ingestion ledger")
+            return False
+        phase_times['create_table'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        success = stream_all_netcdf_files(pg_manager, args.input, args.chunk_profiles,
+                                          incremental=args.incremental)
+        phase_times['load'] = time.perf_counter() - start
+
+        if args.bulk:
+            start = time.perf_counter()
+            pg_manager.build_indexes(workers=args.index_workers)
+            phase_times['build_indexes'] = time.perf_counter() - start
+
+        logger.info("⏱️  Phase timings:")
+        for phase, seconds in phase_times.items():
+            logger.info(f"   {phase}: {seconds:.1f}s")
+
+        if success:
+            logger.info("🎉 ARGO data import completed successfully!")
+        else:
+            logger.error("❌ ARGO data import failed")
+
+        return success
+
+    except Exception as e:
+        logger.error(f"❌ Unexpected error: {e}")
+        return False
+
+    finally:
+        pg_manager.close()
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,9 +1,14 @@
 import psycopg2
 import pandas as pd
+import io
+import time
+import hashlib
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
 from pathlib import Path
 import os
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Callable, Iterable, Tuple
 import logging
 from datetime import datetime
 import glob
@@ -21,6 +26,376 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Minimum number of rows serialized per COPY buffer
+COPY_CHUNK_ROWS = 50000
+
+# Integer table columns; CSV round trips turn them into floats (e.g. 12.0), which COPY rejects
+INTEGER_COLUMNS = ['profile_id', 'cycle_number']
+
+
+def prepare_copy_chunk(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Prepare a slice of rows for COPY: restore integer columns and add `location` as EWKT.
+    
+    PostGIS parses `SRID=4326;POINT(lon lat)` text directly into the geography column,
+    so no follow-up UPDATE is needed.
+    
+    Args:
+        df: Rows to load; `location` is only added when `latitude` and `longitude` are present
+        
+    Returns:
+        DataFrame ready to be written as COPY CSV input
+    """
+    converted = {}
+    for col in INTEGER_COLUMNS:
+        if col in df.columns:
+            converted[col] = pd.to_numeric(df[col], errors='coerce').round().astype('Int64')
+    if 'latitude' in df.columns and 'longitude' in df.columns:
+        converted['location'] = (
+            "SRID=4326;POINT(" + df['longitude'].astype(str) + " " + df['latitude'].astype(str) + ")"
+        )
+    return df.assign(**converted)
+
+
+# Indexes on argo_profiles, created with the table or built after a bulk load
+ARGO_INDEXES = {
+    # Spatial index (GIST) for geography column - most important for spatial queries
+    "idx_argo_location_gist": "CREATE INDEX idx_argo_location_gist ON argo_profiles USING GIST(location)",
+    
+    # Regular indexes for common queries
+    "idx_argo_lat_lon": "CREATE INDEX idx_argo_lat_lon ON argo_profiles(latitude, longitude)",
+    "idx_argo_datetime": "CREATE INDEX idx_argo_datetime ON argo_profiles(datetime)",
+    "idx_argo_float_id": "CREATE INDEX idx_argo_float_id ON argo_profiles(float_id)",
+    "idx_argo_pressure": "CREATE INDEX idx_argo_pressure ON argo_profiles(pressure)",
+    "idx_argo_source_file": "CREATE INDEX idx_argo_source_file ON argo_profiles(source_file)",
+    
+    # Composite indexes for common query patterns
+    "idx_argo_float_cycle": "CREATE INDEX idx_argo_float_cycle ON argo_profiles(float_id, cycle_number)",
+    "idx_argo_datetime_location": "CREATE INDEX idx_argo_datetime_location ON argo_profiles(datetime, latitude, longitude)",
+    "idx_argo_pressure_location": "CREATE INDEX idx_argo_pressure_location ON argo_profiles(pressure, latitude, longitude)"
+}
+
+
+# Normalized layout: one `profiles` row per station, narrow `measurements` rows per level
+NORMALIZED_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id BIGSERIAL PRIMARY KEY,
+    source_file VARCHAR(500),
+    profile_id INTEGER,
+    float_id VARCHAR(50),
+    cycle_number INTEGER,
+    latitude DOUBLE PRECISION NOT NULL,
+    longitude DOUBLE PRECISION NOT NULL,
+    datetime TIMESTAMP,
+    project_name TEXT,
+    pi_name TEXT,
+    platform_type VARCHAR(100),
+    data_mode VARCHAR(10),
+    data_centre VARCHAR(50),
+    location GEOGRAPHY(POINT, 4326),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    CONSTRAINT valid_profile_lat CHECK (latitude >= -90 AND latitude <= 90),
+    CONSTRAINT valid_profile_lon CHECK (longitude >= -180 AND longitude <= 180)
+);
+
+CREATE TABLE IF NOT EXISTS measurements (
+    profile_ref BIGINT NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    pressure DOUBLE PRECISION NOT NULL,
+    temperature DOUBLE PRECISION NOT NULL,
+    salinity DOUBLE PRECISION NOT NULL,
+    pressure_qc VARCHAR(10),
+    temperature_qc VARCHAR(10),
+    salinity_qc VARCHAR(10),
+    
+    CONSTRAINT valid_measurement_pressure CHECK (pressure >= -5.0)
+);
+"""
+
+# Compatibility view exposing the normalized tables with the wide argo_profiles columns
+NORMALIZED_VIEW_SQL = """
+CREATE OR REPLACE VIEW argo_profiles AS
+SELECT
+    p.profile_id, p.float_id, p.cycle_number, p.latitude, p.longitude, p.datetime,
+    m.pressure, m.temperature, m.salinity, m.pressure_qc, m.temperature_qc, m.salinity_qc,
+    p.project_name, p.pi_name, p.platform_type, p.data_mode, p.data_centre,
+    p.location, p.source_file, p.created_at
+FROM profiles p
+JOIN measurements m ON m.profile_ref = p.id
+"""
+
+NORMALIZED_INDEXES = {
+    # Spatial and time indexes hold one entry per station instead of one per measurement
+    "idx_profiles_location_gist": "CREATE INDEX idx_profiles_location_gist ON profiles USING GIST(location)",
+    "idx_profiles_datetime": "CREATE INDEX idx_profiles_datetime ON profiles(datetime)",
+    "idx_profiles_lat_lon": "CREATE INDEX idx_profiles_lat_lon ON profiles(latitude, longitude)",
+    "idx_profiles_float_cycle": "CREATE INDEX idx_profiles_float_cycle ON profiles(float_id, cycle_number)",
+    "idx_profiles_source_profile": "CREATE UNIQUE INDEX idx_profiles_source_profile ON profiles(source_file, profile_id)",
+    
+    # Measurement lookups by station (ordered by depth) and by depth
+    "idx_measurements_profile_pressure": "CREATE INDEX idx_measurements_profile_pressure ON measurements(profile_ref, pressure)",
+    "idx_measurements_pressure": "CREATE INDEX idx_measurements_pressure ON measurements(pressure)"
+}
+
+# Tables and indexes that make up each layout
+LAYOUT_TABLES = {
+    "wide": ["argo_profiles"],
+    "normalized": ["profiles", "measurements"],
+    "partitioned": ["argo_profiles"]
+}
+LAYOUT_INDEXES = {
+    "wide": ARGO_INDEXES,
+    "normalized": NORMALIZED_INDEXES,
+    # Indexes on the partitioned parent cascade to every current and future partition
+    "partitioned": ARGO_INDEXES
+}
+
+# Catch-all partition of the partitioned layout (rows with a NULL datetime)
+DEFAULT_PARTITION = "argo_profiles_default"
+
+
+def partition_name(month: pd.Period) -> str:
+    """Return the name of the monthly argo_profiles partition, e.g. argo_profiles_y2025m01."""
+    return f"argo_profiles_y{month.year:04d}m{month.month:02d}"
+
+HEADER_COLUMNS = [
+    'source_file', 'profile_id', 'float_id', 'cycle_number', 'latitude', 'longitude', 'datetime',
+    'project_name', 'pi_name', 'platform_type', 'data_mode', 'data_centre'
+]
+MEASUREMENT_COLUMNS = [
+    'pressure', 'temperature', 'salinity', 'pressure_qc', 'temperature_qc', 'salinity_qc'
+]
+
+
+# Per-source-file aggregates behind the fast path of `get_table_stats`
+FILE_STATS_SQL = """
+CREATE TABLE IF NOT EXISTS argo_file_stats (
+    source_file VARCHAR(500) PRIMARY KEY,
+    row_count BIGINT NOT NULL DEFAULT 0,
+    geometry_count BIGINT NOT NULL DEFAULT 0,
+    min_datetime TIMESTAMP,
+    max_datetime TIMESTAMP,
+    min_lat DOUBLE PRECISION,
+    max_lat DOUBLE PRECISION,
+    min_lon DOUBLE PRECISION,
+    max_lon DOUBLE PRECISION,
+    float_ids TEXT[] NOT NULL DEFAULT '{}',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# Merges a batch into the file's running aggregates (LEAST/GREATEST ignore NULLs)
+FILE_STATS_UPSERT_SQL = """
+INSERT INTO argo_file_stats AS s
+    (source_file, row_count, geometry_count, min_datetime, max_datetime,
+     min_lat, max_lat, min_lon, max_lon, float_ids)
+VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+ON CONFLICT (source_file) DO UPDATE SET
+    row_count = s.row_count + EXCLUDED.row_count,
+    geometry_count = s.geometry_count + EXCLUDED.geometry_count,
+    min_datetime = LEAST(s.min_datetime, EXCLUDED.min_datetime),
+    max_datetime = GREATEST(s.max_datetime, EXCLUDED.max_datetime),
+    min_lat = LEAST(s.min_lat, EXCLUDED.min_lat),
+    max_lat = GREATEST(s.max_lat, EXCLUDED.max_lat),
+    min_lon = LEAST(s.min_lon, EXCLUDED.min_lon),
+    max_lon = GREATEST(s.max_lon, EXCLUDED.max_lon),
+    float_ids = ARRAY(SELECT DISTINCT f FROM unnest(s.float_ids || EXCLUDED.float_ids) AS f ORDER BY f),
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+# Recomputes the aggregates of the files matched by {where} from the rows in argo_profiles
+FILE_STATS_REBUILD_SQL = """
+INSERT INTO argo_file_stats
+    (source_file, row_count, geometry_count, min_datetime, max_datetime,
+     min_lat, max_lat, min_lon, max_lon, float_ids)
+SELECT
+    COALESCE(source_file, ''),
+    COUNT(*),
+    COUNT(location),
+    MIN(datetime), MAX(datetime),
+    MIN(latitude) FILTER (WHERE location IS NOT NULL),
+    MAX(latitude) FILTER (WHERE location IS NOT NULL),
+    MIN(longitude) FILTER (WHERE location IS NOT NULL),
+    MAX(longitude) FILTER (WHERE location IS NOT NULL),
+    COALESCE(ARRAY_AGG(DISTINCT float_id) FILTER (WHERE float_id IS NOT NULL), '{{}}')
+FROM argo_profiles
+{where}
+GROUP BY COALESCE(source_file, '')
+"""
+
+
+def summarize_file_stats(df: pd.DataFrame) -> List[Tuple]:
+    """
+    Aggregate a batch of rows per source file for the `argo_file_stats` upsert.
+    
+    Latitude/longitude bounds only cover rows that get a `location`, matching what
+    `get_table_stats` reports.
+    
+    Args:
+        df: Rows about to be (or just) loaded into argo_profiles
+        
+    Returns:
+        One parameter tuple per source file, in FILE_STATS_UPSERT_SQL order
+    """
+    if df.empty:
+        return []
+    
+    has_geo = df['latitude'].notna() & df['longitude'].notna()
+    frame = pd.DataFrame({
+        'source_file': df['source_file'].fillna('') if 'source_file' in df.columns else '',
+        'has_geo': has_geo,
+        'datetime': pd.to_datetime(df['datetime'], errors='coerce') if 'datetime' in df.columns else pd.NaT,
+        'latitude': df['latitude'].where(has_geo),
+        'longitude': df['longitude'].where(has_geo),
+        'float_id': df['float_id'] if 'float_id' in df.columns else None,
+    }, index=df.index)
+    
+    rows = []
+    for source_file, group in frame.groupby('source_file', sort=False):
+        values = [
+            group['datetime'].min(), group['datetime'].max(),
+            group['latitude'].min(), group['latitude'].max(),
+            group['longitude'].min(), group['longitude'].max(),
+        ]
+        rows.append((
+            source_file,
+            len(group),
+            int(group['has_geo'].sum()),
+            *[None if pd.isna(value) else value for value in values],
+            sorted(group['float_id'].dropna().astype(str).unique()),
+        ))
+    return rows
+
+
+def file_checksum(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hex digest of a file without reading it into memory at once.
+    
+    Args:
+        file_path: Path to the file
+        block_size: Bytes read per iteration
+        
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Columns loaded into argo_profiles, matching the CSV/NetCDF converter output
+PROFILE_COLUMNS = [
+    'profile_id', 'float_id', 'cycle_number', 'latitude', 'longitude',
+    'datetime', 'pressure', 'temperature', 'salinity', 'pressure_qc',
+    'temperature_qc', 'salinity_qc', 'project_name', 'pi_name',
+    'platform_type', 'data_mode', 'data_centre', 'source_file'
+]
+
+
+def prepare_profile_frame(df: pd.DataFrame, source_file: str) -> pd.DataFrame:
+    """
+    Apply type coercion and data quality filters to flattened profile rows.
+    
+    Shared by the CSV loader and the direct NetCDF streaming pipeline so both
+    insert exactly the same rows.
+    
+    Args:
+        df: Flattened profile rows (CSV contents or `flatten_profiles` output)
+        source_file: Value stored in the `source_file` column
+        
+    Returns:
+        DataFrame restricted to the argo_profiles columns
+    """
+    # Add source file information
+    df['source_file'] = source_file
+    
+    # Handle datetime conversion
+    if 'datetime' in df.columns:
+        df['datetime'] = pd.to_datetime(df['datetime'], errors='coerce')
+    
+    # Handle NaN values for numeric columns
+    numeric_columns = ['profile_id', 'cycle_number', 'latitude', 'longitude', 
+                     'pressure', 'temperature', 'salinity']
+    for col in numeric_columns:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    
+    # Drop rows with invalid essential data
+    essential_cols = ['latitude', 'longitude', 'pressure', 'temperature', 'salinity']
+    df = df.dropna(subset=essential_cols)
+    
+    # Additional data quality filters
+    initial_count = len(df)
+    
+    # Filter out extreme negative pressures (likely sensor errors)
+    if 'pressure' in df.columns:
+        df = df[df['pressure'] >= -5.0]  # Allow small negative values but reject extreme ones
+        extreme_pressure_removed = initial_count - len(df)
+        if extreme_pressure_removed > 0:
+            logger.info(f"   Filtered out {extreme_pressure_removed} records with extreme negative pressure")
+    
+    # Filter out invalid temperature and salinity ranges
+    if 'temperature' in df.columns:
+        temp_before = len(df)
+        df = df[(df['temperature'] >= -5.0) & (df['temperature'] <= 50.0)]  # Reasonable ocean temp range
+        temp_filtered = temp_before - len(df)
+        if temp_filtered > 0:
+            logger.info(f"   Filtered out {temp_filtered} records with invalid temperature")
+    
+    if 'salinity' in df.columns:
+        sal_before = len(df)
+        df = df[(df['salinity'] >= 0.0) & (df['salinity'] <= 50.0)]  # Reasonable salinity range
+        sal_filtered = sal_before - len(df)
+        if sal_filtered > 0:
+            logger.info(f"   Filtered out {sal_filtered} records with invalid salinity")
+    
+    # Create PostGIS geometry column using raw SQL approach
+    # We'll handle this in the insert method since pandas can't directly create PostGIS geometry
+    
+    # Select only the columns that exist in the DataFrame
+    available_columns = [col for col in PROFILE_COLUMNS if col in df.columns]
+    return df[available_columns].copy()
+
+
+class CsvChunkReader(io.TextIOBase):
+    """
+    Read-only file object that serializes a DataFrame to CSV lazily for `copy_expert`.
+    
+    Only one chunk of `chunk_size` rows is rendered at a time, so memory stays bounded
+    regardless of the DataFrame size.
+    """
+    
+    def __init__(self, df: pd.DataFrame, chunk_size: int = COPY_CHUNK_ROWS):
+        self.df = df
+        self.chunk_size = chunk_size
+        self.offset = 0
+        self.buffer = io.StringIO()
+    
+    def readable(self) -> bool:
+        return True
+    
+    def _next_chunk(self) -> bool:
+        if self.offset >= len(self.df):
+            return False
+        chunk = prepare_copy_chunk(self.df.iloc[self.offset:self.offset + self.chunk_size])
+        self.offset += self.chunk_size
+        self.buffer = io.StringIO(chunk.to_csv(index=False, header=False, lineterminator='\n'))
+        return True
+    
+    def read(self, size: int = -1) -> str:
+        parts = []
+        remaining = size
+        while size < 0 or remaining > 0:
+            data = self.buffer.read(remaining if size >= 0 else -1)
+            if data:
+                parts.append(data)
+                remaining -= len(data)
+            elif not self._next_chunk():
+                break
+        return ''.join(parts)
+
 
 class ArgoPostgresManager:
     """
@@ -33,7 +408,8 @@ class ArgoPostgresManager:
                  port: int = 5432,
                  database: str = "argo_data",
                  username: str = "postgres",
-                 password: str = "password"):
+                 password: str = "password",
+                 layout: str = "wide"):
         """
         Initialize PostgreSQL connection parameters.
         
@@ -43,12 +419,19 @@ class ArgoPostgresManager:
             database: Database name
             username: Database username
             password: Database password
+            layout: Table layout: 'wide' (one argo_profiles row per measurement),
+                'normalized' (profiles + measurements tables behind an argo_profiles view)
+                or 'partitioned' (argo_profiles range-partitioned by month of `datetime`)
         """
+        if layout not in LAYOUT_TABLES:
+            raise ValueError(f"Unknown table layout: {layout}. Must be one of {list(LAYOUT_TABLES)}.")
+        
         self.host = host
         self.port = port
         self.database = database
         self.username = username
         self.password = password
+        self.layout = layout
         self.connection = None
         self.engine = None
         
@@ -120,10 +503,16 @@ class ArgoPostgresManager:
             logger.error(f"❌ Failed to create database: {e}")
             return False
     
-    def create_argo_table(self) -> bool:
+    def create_argo_table(self, recreate: bool = True, with_indexes: bool = True) -> bool:
         """
         Create the ARGO data table with PostGIS support and schema matching CSV columns.
         
+        Args:
+            recreate: Drop and recreate the table; when False an existing table and its
+                indexes are left in place (used by incremental ingestion)
+            with_indexes: Create the indexes now; bulk loads pass False and call
+                `build_indexes` once the data is in
+        
         Returns:
             bool: True if table created successfully
         """
@@ -135,11 +524,21 @@ class ArgoPostgresManager:
             logger.info("✅ PostGIS extension enabled")
             
             # Drop table if exists (for fresh start)
-            cursor.execute("DROP TABLE IF EXISTS argo_profiles CASCADE")
+            if recreate:
+                self._drop_argo_objects(cursor)
+                # The ledger describes the rows of the dropped table, so it starts over too
+                cursor.execute("DROP TABLE IF EXISTS argo_ingestion_ledger")
+                cursor.execute("DROP TABLE IF EXISTS argo_file_stats")
+            
+            if self.layout == "normalized":
+                self._create_normalized_tables(cursor, with_indexes)
+                self._create_file_stats_table(cursor)
+                cursor.close()
+                return True
             
             # Create table with exact CSV column structure + PostGIS geometry
             create_table_sql = """
-            CREATE TABLE argo_profiles (
+            CREATE TABLE IF NOT EXISTS argo_profiles (
                 id SERIAL PRIMARY KEY,
                 
                 -- Exact columns from CSV files
@@ -175,30 +574,26 @@ class ArgoPostgresManager:
             )
             """
             
+            if self.layout == "partitioned":
+                # A primary key on a partitioned table must include datetime, which may be NULL
+                create_table_sql = create_table_sql.replace("id SERIAL PRIMARY KEY", "id BIGSERIAL")
+                create_table_sql += " PARTITION BY RANGE (datetime)"
+            
             cursor.execute(create_table_sql)
             
-            # Create spatial and regular indexes for performance
-            indexes = [
-                # Spatial index (GIST) for geography column - most important for spatial queries
-                "CREATE INDEX idx_argo_location_gist ON argo_profiles USING GIST(location)",
-                
-                # Regular indexes for common queries
-                "CREATE INDEX idx_argo_lat_lon ON argo_profiles(latitude, longitude)",
-                "CREATE INDEX idx_argo_datetime ON argo_profiles(datetime)",
-                "CREATE INDEX idx_argo_float_id ON argo_profiles(float_id)",
-                "CREATE INDEX idx_argo_pressure ON argo_profiles(pressure)",
-                "CREATE INDEX idx_argo_source_file ON argo_profiles(source_file)",
-                
-                # Composite indexes for common query patterns
-                "CREATE INDEX idx_argo_float_cycle ON argo_profiles(float_id, cycle_number)",
-                "CREATE INDEX idx_argo_datetime_location ON argo_profiles(datetime, latitude, longitude)",
-                "CREATE INDEX idx_argo_pressure_location ON argo_profiles(pressure, latitude, longitude)"
-            ]
+            if self.layout == "partitioned":
+                # Rows without a datetime; monthly partitions are added as data arrives
+                cursor.execute(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF argo_profiles DEFAULT")
             
-            for index_sql in indexes:
-                cursor.execute(index_sql)
-                logger.info(f"✅ Created index: {index_sql.split('idx_')[1].split(' ')[0]}")
+            # Create spatial and regular indexes for performance
+            if with_indexes:
+                for name, index_sql in ARGO_INDEXES.items():
+                    cursor.execute(index_sql.replace("INDEX ", "INDEX IF NOT EXISTS ", 1))
+                    logger.info(f"✅ Created index: {name.split('idx_')[1]}")
+            else:
+                logger.info("⏭️  Index creation deferred until after the bulk load")
             
+            self._create_file_stats_table(cursor)
             cursor.close()
             logger.info("✅ Created argo_profiles table with PostGIS support and optimized indexes")
             return True
@@ -207,6 +602,340 @@ class ArgoPostgresManager:
             logger.error(f"❌ Failed to create table: {e}")
             return False
     
+    def _drop_argo_objects(self, cursor):
+        """Drop argo_profiles (a table or, in the normalized layout, a view) and the normalized tables."""
+        relkind = self._argo_profiles_relkind(cursor)
+        if relkind == 'v':
+            cursor.execute("DROP VIEW argo_profiles")
+        elif relkind:
+            cursor.execute("DROP TABLE argo_profiles CASCADE")
+        cursor.execute("DROP TABLE IF EXISTS measurements, profiles CASCADE")
+    
+    @staticmethod
+    def _argo_profiles_relkind(cursor) -> Optional[str]:
+        """pg_class.relkind of argo_profiles on the search path ('r', 'p', 'v'), or None if it does not exist."""
+        cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('argo_profiles')")
+        row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def is_partitioned(self) -> bool:
+        """
+        Check whether argo_profiles is a partitioned table.
+        
+        The catalog decides rather than `layout`, which comes from a CLI flag that
+        defaults to 'wide': loads into a partitioned table need their monthly
+        partitions whatever layout the manager was created with.
+        
+        Returns:
+            bool: True if argo_profiles is partitioned
+        """
+        cursor = self.connection.cursor()
+        relkind = self._argo_profiles_relkind(cursor)
+        cursor.close()
+        return relkind == 'p'
+    
+    def _create_normalized_tables(self, cursor, with_indexes: bool = True):
+        """
+        Create the normalized `profiles` / `measurements` tables and the argo_profiles view.
+        
+        Args:
+            cursor: Cursor on the managed connection
+            with_indexes: Create the indexes now instead of after a bulk load
+        """
+        cursor.execute(NORMALIZED_TABLES_SQL)
+        
+        if with_indexes:
+            for name, index_sql in NORMALIZED_INDEXES.items():
+                cursor.execute(index_sql.replace("INDEX ", "INDEX IF NOT EXISTS ", 1))
+                logger.info(f"✅ Created index: {name.split('idx_')[1]}")
+        else:
+            logger.info("⏭️  Index creation deferred until after the bulk load")
+        
+        # Existing queries (including the Node getProfile query) keep reading argo_profiles
+        cursor.execute(NORMALIZED_VIEW_SQL)
+        logger.info("✅ Created normalized profiles/measurements tables with argo_profiles compatibility view")
+    
+    def delete_source_file(self, source_file: str) -> int:
+        """
+        Delete all rows loaded from a source file.
+        
+        Args:
+            source_file: Value of the `source_file` column
+            
+        Returns:
+            Number of rows deleted (stations, in the normalized layout)
+        """
+        cursor = self.connection.cursor()
+        if self.layout == "normalized":
+            # Measurements follow through ON DELETE CASCADE
+            cursor.execute("DELETE FROM profiles WHERE source_file = %s", (source_file,))
+        else:
+            cursor.execute("DELETE FROM argo_profiles WHERE source_file = %s", (source_file,))
+        deleted = cursor.rowcount
+        cursor.execute("DELETE FROM argo_file_stats WHERE source_file = %s", (source_file,))
+        cursor.close()
+        return deleted
+    
+    def list_partitions(self) -> List[Dict]:
+        """
+        List the partitions of a partitioned argo_profiles table.
+        
+        Returns:
+            List of dictionaries with `name`, `bounds`, estimated `rows` and `size_bytes`
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::BIGINT,
+                   pg_total_relation_size(c.oid)
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass('argo_profiles')
+            ORDER BY c.relname
+        """)
+        partitions = [
+            {'name': name, 'bounds': bounds, 'rows': max(rows, 0), 'size_bytes': size}
+            for name, bounds, rows, size in cursor.fetchall()
+        ]
+        cursor.close()
+        return partitions
+    
+    def ensure_partitions(self, df: pd.DataFrame) -> List[str]:
+        """
+        Create the monthly partitions needed to hold the rows of `df`.
+        
+        Existing partitions are read from the catalog on each call rather than cached,
+        so a partition created in a rolled-back transaction is simply created again.
+        
+        Args:
+            df: Rows about to be loaded
+            
+        Returns:
+            Names of the partitions created
+        """
+        if 'datetime' not in df.columns:
+            return []
+        
+        months = pd.to_datetime(df['datetime'], errors='coerce').dropna().dt.to_period('M').unique()
+        existing = {partition['name'] for partition in self.list_partitions()}
+        
+        created = []
+        cursor = self.connection.cursor()
+        for month in sorted(months):
+            name = partition_name(month)
+            if name in existing:
+                continue
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF argo_profiles "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                (month.start_time.to_pydatetime(), (month + 1).start_time.to_pydatetime())
+            )
+            created.append(name)
+            logger.info(f"🗓️  Created partition {name}")
+        cursor.close()
+        return created
+    
+    def detach_partition(self, month: str, drop: bool = False) -> bool:
+        """
+        Detach one month from the partitioned argo_profiles table.
+        
+        The detached partition becomes a plain table, `<partition>_detached`, that can be
+        archived or dropped without touching (or vacuuming) the rest of argo_profiles. In the same
+        transaction, the source files that had rows in that month get their
+        `argo_file_stats` recomputed from the rows left (or removed if none are left)
+        and their ledger rows deleted, so they can be loaded again.
+        
+        Args:
+            month: Month to detach, as 'YYYY-MM'
+            drop: Drop the detached table as well
+            
+        Returns:
+            bool: True if the partition was detached
+        """
+        if not self.is_partitioned():
+            logger.error("❌ Partitions can only be detached from a partitioned argo_profiles table")
+            return False
+        
+        name = partition_name(pd.Period(month, freq='M'))
+        try:
+            with self.transaction():
+                cursor = self.connection.cursor()
+                cursor.execute(f"SELECT DISTINCT COALESCE(source_file, '') FROM {name}")
+                files = [row[0] for row in cursor.fetchall()]
+                
+                cursor.execute(f"ALTER TABLE argo_profiles DETACH PARTITION {name}")
+                logger.info(f"✅ Detached partition {name}")
+                
+                cursor.execute("SELECT to_regclass('argo_file_stats') IS NOT NULL, "
+                               "to_regclass('argo_ingestion_ledger') IS NOT NULL")
+                has_stats, has_ledger = cursor.fetchone()
+                if files and has_stats:
+                    cursor.execute("DELETE FROM argo_file_stats WHERE source_file = ANY(%s)", (files,))
+                    cursor.execute(
+                        FILE_STATS_REBUILD_SQL.format(where="WHERE COALESCE(source_file, '') = ANY(%s)"),
+                        (files,)
+                    )
+                    logger.info(f"📊 Recomputed statistics of {len(files)} source files ({cursor.rowcount} still have rows)")
+                if files and has_ledger:
+                    cursor.execute("DELETE FROM argo_ingestion_ledger WHERE source_file = ANY(%s)", (files,))
+                    logger.info(f"📒 Removed {cursor.rowcount} ledger entries; their files load again on the next run")
+                
+                if drop:
+                    cursor.execute(f"DROP TABLE {name}")
+                    logger.info(f"🗑️  Dropped table {name}")
+                else:
+                    # Frees the partition name for a reload of the same month
+                    cursor.execute(f"ALTER TABLE {name} RENAME TO {name}_detached")
+                    logger.info(f"📦 Kept the detached rows as {name}_detached")
+                cursor.close()
+            return True
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Failed to detach partition {name}: {e}")
+            return False
+    
+    def create_ingestion_ledger(self) -> bool:
+        """
+        Create the ingestion ledger that records which source files are loaded.
+        
+        One row per `source_file` with the file checksum, the number of rows it
+        contributed to argo_profiles and when it was loaded.
+        
+        Returns:
+            bool: True if the ledger exists or was created
+        """
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS argo_ingestion_ledger (
+                source_file VARCHAR(500) PRIMARY KEY,
+                checksum CHAR(64) NOT NULL,
+                file_size BIGINT,
+                row_count INTEGER NOT NULL,
+                loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """)
+            cursor.close()
+            logger.info("✅ Ingestion ledger ready")
+            return True
+            
+        except psycopg2.Error as e:
+            logger.error(f"❌ Failed to create ingestion ledger: {e}")
+            return False
+    
+    def get_ledger_entry(self, source_file: str) -> Optional[Dict]:
+        """
+        Look up the ledger row for a source file.
+        
+        Args:
+            source_file: Value of the `source_file` column
+            
+        Returns:
+            Dictionary with checksum, file_size, row_count and loaded_at, or None
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT checksum, file_size, row_count, loaded_at FROM argo_ingestion_ledger WHERE source_file = %s",
+            (source_file,)
+        )
+        row = cursor.fetchone()
+        cursor.close()
+        
+        if row is None:
+            return None
+        return {'checksum': row[0], 'file_size': row[1], 'row_count': row[2], 'loaded_at': row[3]}
+    
+    def record_ledger_entry(self, file_path: str, source_file: str, row_count: int,
+                            checksum: Optional[str] = None):
+        """
+        Mark a source file as loaded in the ingestion ledger.
+        
+        Full loads record their files too, so a later incremental run skips them.
+        
+        Args:
+            file_path: Path of the file on disk
+            source_file: Value of the `source_file` column for its rows
+            row_count: Rows the file contributed (0 if none passed the filters)
+            checksum: File checksum, computed when not given
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            INSERT INTO argo_ingestion_ledger (source_file, checksum, file_size, row_count, loaded_at)
+            VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
+            ON CONFLICT (source_file) DO UPDATE SET
+                checksum = EXCLUDED.checksum,
+                file_size = EXCLUDED.file_size,
+                row_count = EXCLUDED.row_count,
+                loaded_at = EXCLUDED.loaded_at
+        """, (source_file, checksum or file_checksum(file_path), Path(file_path).stat().st_size, row_count))
+        cursor.close()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Run the enclosed statements in a single transaction.
+        
+        The connection is otherwise in autocommit mode; it is restored on exit and the
+        transaction is rolled back if the block raises. Nested use joins the outer
+        transaction.
+        """
+        if not self.connection.autocommit:
+            yield self.connection
+            return
+        
+        self.connection.autocommit = False
+        try:
+            yield self.connection
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            self.connection.autocommit = True
+    
+    def load_file_incremental(self, file_path: str, source_file: str,
+                              load_batches: Callable[[], Iterable[pd.DataFrame]]) -> Tuple[str, int]:
+        """
+        Load a source file only if it is new or changed since it was last loaded.
+        
+        A changed file has its previous rows deleted and its new rows inserted in the
+        same transaction as the ledger update, so readers never see a half-replaced file.
+        
+        Args:
+            file_path: Path of the file on disk (used for the checksum)
+            source_file: Value of the `source_file` column for its rows
+            load_batches: Callable returning the prepared DataFrames to insert; only
+                called when the file actually needs loading
+            
+        Returns:
+            Tuple of status ('new', 'replaced', 'unchanged' or 'failed') and row count
+        """
+        checksum = file_checksum(file_path)
+        entry = self.get_ledger_entry(source_file)
+        
+        if entry and entry['checksum'].strip() == checksum:
+            return 'unchanged', entry['row_count']
+        
+        try:
+            row_count = 0
+            with self.transaction():
+                # Also clears rows loaded outside the ledger (e.g. by a full reload)
+                removed = self.delete_source_file(source_file)
+                if removed:
+                    logger.info(f"   Removed {removed} rows of the previous version")
+                
+                for batch in load_batches():
+                    if not self.copy_dataframe(batch):
+                        raise RuntimeError(f"COPY failed after {row_count} rows")
+                    row_count += len(batch)
+                
+                self.record_ledger_entry(file_path, source_file, row_count, checksum)
+            
+            return ('replaced' if entry else 'new'), row_count
+            
+        except Exception as e:
+            logger.error(f"❌ Error loading {source_file}: {e}")
+            return 'failed', 0
+    
     def find_csv_files(self, root_dir: str) -> List[str]:
         """
         Recursively find all CSV files in the given directory and sort by date (latest first).
@@ -277,186 +1006,573 @@ class ArgoPostgresManager:
         
         return csv_files
     
-    def read_and_prepare_csv(self, csv_file_path: str) -> Optional[pd.DataFrame]:
+    def open_connection(self):
+        """
+        Open an additional autocommit connection with the same credentials.
+        
+        Returns:
+            psycopg2 connection
+        """
+        conn = psycopg2.connect(
+            host=self.host,
+            port=self.port,
+            database=self.database,
+            user=self.username,
+            password=self.password
+        )
+        conn.autocommit = True
+        return conn
+    
+    def get_index_status(self) -> Dict[str, Dict]:
+        """
+        Read the state of every index on the layout's tables from the catalog.
+        
+        Returns:
+            Dictionary keyed by index name with `valid`, `ready` and `size_bytes`
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("""
+            SELECT c.relname, i.indisvalid, i.indisready, pg_relation_size(c.oid)
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            JOIN pg_class t ON t.oid = i.indrelid
+            WHERE t.oid = ANY(ARRAY(SELECT to_regclass(name) FROM unnest(%s::text[]) AS name))
+        """, (LAYOUT_TABLES[self.layout],))
+        status = {
+            name: {'valid': valid, 'ready': ready, 'size_bytes': size}
+            for name, valid, ready, size in cursor.fetchall()
+        }
+        cursor.close()
+        return status
+    
+    def validate_indexes(self) -> Dict[str, List[str]]:
+        """
+        Check that every expected index exists and is valid.
+        
+        Returns:
+            Dictionary with the `missing` and `invalid` index names
+        """
+        status = self.get_index_status()
+        expected = LAYOUT_INDEXES[self.layout]
+        missing = [name for name in expected if name not in status]
+        invalid = [name for name, state in status.items() if not (state['valid'] and state['ready'])]
+        
+        for name in expected:
+            if name in status and name not in invalid:
+                logger.info(f"✅ {name}: valid ({status[name]['size_bytes'] / 1e6:,.1f} MB)")
+        for name in missing:
+            logger.warning(f"⚠️ {name}: missing")
+        for name in invalid:
+            logger.warning(f"⚠️ {name}: invalid")
+        
+        return {'missing': missing, 'invalid': invalid}
+    
+    def build_indexes(self, workers: int = 4, rebuild: bool = False,
+                      maintenance_work_mem: str = "512MB") -> Dict[str, float]:
+        """
+        Build the indexes of the current layout in parallel, one connection per index.
+        
+        Missing indexes are created and invalid ones dropped and recreated. With
+        `rebuild=True` existing indexes are rebuilt with REINDEX as well. The table
+        is analyzed afterwards so the planner sees the freshly loaded data.
+        
+        Args:
+            workers: Number of indexes built concurrently
+            rebuild: Also REINDEX indexes that already exist and are valid
+            maintenance_work_mem: Sort memory for each index build session
+            
+        Returns:
+            Dictionary of wall-clock seconds per index (plus 'analyze')
+        """
+        status = self.get_index_status()
+        jobs = {}
+        for name, index_sql in LAYOUT_INDEXES[self.layout].items():
+            state = status.get(name)
+            if state is None:
+                jobs[name] = [index_sql]
+            elif not (state['valid'] and state['ready']):
+                jobs[name] = [f"DROP INDEX IF EXISTS {name}", index_sql]
+            elif rebuild:
+                jobs[name] = [f"REINDEX INDEX {name}"]
+        
+        def run_job(name: str, statements: List[str]) -> Tuple[str, float]:
+            conn = self.open_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SET maintenance_work_mem = %s", (maintenance_work_mem,))
+                start = time.perf_counter()
+                for statement in statements:
+                    cursor.execute(statement)
+                elapsed = time.perf_counter() - start
+                cursor.close()
+                return name, elapsed
+            finally:
+                conn.close()
+        
+        timings = {}
+        if jobs:
+            logger.info(f"🔨 Building {len(jobs)} indexes with {workers} parallel workers")
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [executor.submit(run_job, name, statements) for name, statements in jobs.items()]
+            for future in as_completed(futures):
+                try:
+                    name, elapsed = future.result()
+                    timings[name] = elapsed
+                    logger.info(f"✅ Built index {name} in {elapsed:.1f}s")
+                except psycopg2.Error as e:
+                    logger.error(f"❌ Failed to build index: {e}")
+        
+        start = time.perf_counter()
+        cursor = self.connection.cursor()
+        for table in LAYOUT_TABLES[self.layout]:
+            cursor.execute(f"ANALYZE {table}")
+        cursor.close()
+        timings['analyze'] = time.perf_counter() - start
+        
+        return timings
+    
+    def csv_source_file(self, csv_file_path: str) -> str:
+        """Return the `source_file` value stored for rows of a CSV file."""
+        return str(Path(csv_file_path).relative_to(Path(__file__).parent))
+    
+    def read_and_prepare_csv(self, csv_file_path: str) -> Optional[pd.DataFrame]:
+        """
+        Read and prepare a CSV file for database insertion with PostGIS geometry.
+        
+        Args:
+            csv_file_path: Path to the CSV file
+            
+        Returns:
+            Prepared DataFrame (empty if no row passed the filters) or None if error
+        """
+        try:
+            # Read CSV file
+            df = pd.read_csv(csv_file_path)
+            
+            if df.empty:
+                logger.warning(f"Empty CSV file: {csv_file_path}")
+                return df
+            
+            result_df = prepare_profile_frame(df, self.csv_source_file(csv_file_path))
+            
+            logger.info(f"Prepared {len(result_df)} records from {Path(csv_file_path).name}")
+            return result_df
+            
+        except Exception as e:
+            logger.error(f"❌ Error reading CSV {csv_file_path}: {e}")
+            return None
+    
+    def insert_dataframe(self, df: pd.DataFrame, batch_size: int = 1000, method: str = "copy") -> bool:
+        """
+        Insert DataFrame into PostgreSQL with PostGIS geometry creation.
+        
+        Args:
+            df: DataFrame to insert
+            batch_size: Number of records per batch (rows per buffered chunk for COPY)
+            method: 'copy' streams rows through COPY with the location filled in the same
+                write; 'to_sql' uses pandas multi-row INSERTs followed by a geometry UPDATE
+            
+        Returns:
+            bool: True if insertion successful
+        """
+        if method == "copy":
+            return self.copy_dataframe(df, chunk_size=max(batch_size, COPY_CHUNK_ROWS))
+        return self.insert_dataframe_to_sql(df, batch_size=batch_size)
+    
+    def copy_dataframe(self, df: pd.DataFrame, chunk_size: int = 50000, table: Optional[str] = None) -> bool:
+        """
+        Bulk load a DataFrame with COPY ... FROM STDIN.
+        
+        Rows are serialized to CSV in chunks of `chunk_size` rows as COPY reads them, so
+        only one chunk is held in memory at a time. The `location` geography is written as
+        EWKT alongside the other columns, so every row is written exactly once. In the
+        normalized layout the rows are split into `profiles` and `measurements`.
+        
+        Args:
+            df: DataFrame with columns matching the argo_profiles table
+            chunk_size: Number of rows serialized per buffer
+            table: Target table name (default: argo_profiles, or the normalized tables)
+            
+        Returns:
+            bool: True if insertion successful
+        """
+        try:
+            with self.transaction():
+                if table is None and self.layout == "normalized":
+                    self._copy_normalized(df, chunk_size)
+                else:
+                    if table is None and self.is_partitioned():
+                        self.ensure_partitions(df)
+                    self._copy_rows(df, table or "argo_profiles", chunk_size)
+                
+                if table is None:
+                    self.record_file_stats(df)
+            
+            logger.info(f"✅ Copied {len(df)} records with PostGIS geometry")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error copying data: {e}")
+            return False
+    
+    def _copy_rows(self, df: pd.DataFrame, table: str, chunk_size: int):
+        """Stream `df` into `table` with a single COPY statement."""
+        columns = ", ".join(prepare_copy_chunk(df.iloc[:0]).columns)
+        
+        cursor = self.connection.cursor()
+        cursor.copy_expert(
+            f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)",
+            CsvChunkReader(df, chunk_size),
+            size=1 << 20
+        )
+        cursor.close()
+    
+    def _copy_normalized(self, df: pd.DataFrame, chunk_size: int):
+        """
+        Split flattened rows into station headers and measurements and COPY both.
+        
+        Station ids are reserved from the `profiles` sequence up front so measurements
+        can reference them without a round trip per station.
+        """
+        keys = [col for col in ('source_file', 'profile_id') if col in df.columns]
+        first_rows = ~df.duplicated(subset=keys)
+        # dropna=False: rows with a NULL key form a station too instead of getting code -1
+        stations = df.groupby(keys, sort=False, dropna=False)
+        station_codes = stations.ngroup().to_numpy()
+        
+        headers = df.loc[first_rows, [col for col in HEADER_COLUMNS if col in df.columns]]
+        if stations.ngroups != len(headers):
+            raise RuntimeError(f"{stations.ngroups} station groups but {len(headers)} station headers")
+        
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence('profiles', 'id')) FROM generate_series(1, %s)",
+            (len(headers),)
+        )
+        station_ids = np.array([row[0] for row in cursor.fetchall()], dtype=np.int64)
+        cursor.close()
+        
+        self._copy_rows(headers.assign(id=station_ids), "profiles", chunk_size)
+        
+        measurements = df[[col for col in MEASUREMENT_COLUMNS if col in df.columns]]
+        self._copy_rows(measurements.assign(profile_ref=station_ids[station_codes]), "measurements", chunk_size)
+    
+    def _require_wide_table(self, operation: str):
+        """Raise ValueError if argo_profiles is the normalized layout's view, which `operation` cannot load."""
+        cursor = self.connection.cursor()
+        relkind = self._argo_profiles_relkind(cursor)
+        cursor.close()
+        if self.layout == "normalized" or relkind == 'v':
+            raise ValueError(
+                f"{operation} inserts into argo_profiles, which is a view in the normalized layout; "
+                f"load it with the COPY loader (method='copy') instead."
+            )
+    
+    def insert_dataframe_to_sql(self, df: pd.DataFrame, batch_size: int = 1000) -> bool:
+        """
+        Insert DataFrame with pandas `to_sql`, then fill the geometry with an UPDATE pass.
+        
+        This writes every row twice; it is kept as the baseline for `benchmark_insert`.
+        It cannot load the normalized layout, whose argo_profiles is a view: that raises
+        ValueError before anything is written.
+        `to_sql` goes through the SQLAlchemy engine, so the UPDATE and the `argo_file_stats`
+        upsert run on the same SQLAlchemy connection, in the same transaction as the rows.
+        
+        Args:
+            df: DataFrame to insert
+            batch_size: Number of records per batch
+            
+        Returns:
+            bool: True if insertion successful
+        """
+        self._require_wide_table("The to_sql loader")
+        try:
+            if self.is_partitioned():
+                self.ensure_partitions(df)
+            
+            # First, insert the data without the geometry column using pandas
+            df_copy = df.copy()
+            
+            with self.engine.begin() as conn:
+                # Insert data using pandas to_sql
+                df_copy.to_sql(
+                    'argo_profiles',
+                    conn,
+                    if_exists='append',
+                    index=False,
+                    method='multi',
+                    chunksize=batch_size
+                )
+                
+                # Update the geometry column for the records we just inserted
+                # We identify them by finding records with NULL location that have the source file
+                source_file = df['source_file'].iloc[0] if 'source_file' in df.columns else None
+                
+                if source_file:
+                    update_geometry_sql = """
+                    UPDATE argo_profiles 
+                    SET location = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography
+                    WHERE location IS NULL AND source_file = %s
+                    """
+                    conn.exec_driver_sql(update_geometry_sql, (source_file,))
+                else:
+                    # Fallback: update all NULL geometries
+                    update_geometry_sql = """
+                    UPDATE argo_profiles 
+                    SET location = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography
+                    WHERE location IS NULL
+                    """
+                    conn.exec_driver_sql(update_geometry_sql)
+                
+                rows = summarize_file_stats(df)
+                if rows:
+                    conn.exec_driver_sql(FILE_STATS_UPSERT_SQL, rows)
+            
+            logger.info(f"✅ Inserted {len(df)} records with PostGIS geometry")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error inserting data: {e}")
+            return False
+    
+    def benchmark_insert(self, df: pd.DataFrame, batch_size: int = 1000) -> Dict:
         """
-        Read and prepare a CSV file for database insertion with PostGIS geometry.
+        Compare rows/sec of the `to_sql` + UPDATE path against the COPY loader.
+        
+        Each method loads the same rows under a dedicated `source_file` tag, which is
+        deleted again afterwards, so the benchmark leaves the table unchanged. Raises
+        ValueError in the normalized layout, where the `to_sql` path cannot load.
         
         Args:
-            csv_file_path: Path to the CSV file
+            df: Prepared DataFrame (e.g. from `read_and_prepare_csv`)
+            batch_size: Batch size passed to `insert_dataframe`
             
         Returns:
-            Prepared DataFrame or None if error
+            Dictionary with seconds and rows/sec per method, plus the COPY speedup
         """
-        try:
-            # Read CSV file
-            df = pd.read_csv(csv_file_path)
-            
-            if df.empty:
-                logger.warning(f"Empty CSV file: {csv_file_path}")
-                return None
-            
-            # Add source file information
-            df['source_file'] = str(Path(csv_file_path).relative_to(Path(__file__).parent))
-            
-            # Handle datetime conversion
-            if 'datetime' in df.columns:
-                df['datetime'] = pd.to_datetime(df['datetime'], errors='coerce')
-            
-            # Handle NaN values for numeric columns
-            numeric_columns = ['profile_id', 'cycle_number', 'latitude', 'longitude', 
-                             'pressure', 'temperature', 'salinity']
-            for col in numeric_columns:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # Drop rows with invalid essential data
-            essential_cols = ['latitude', 'longitude', 'pressure', 'temperature', 'salinity']
-            df = df.dropna(subset=essential_cols)
-            
-            # Additional data quality filters
-            initial_count = len(df)
-            
-            # Filter out extreme negative pressures (likely sensor errors)
-            if 'pressure' in df.columns:
-                df = df[df['pressure'] >= -5.0]  # Allow small negative values but reject extreme ones
-                extreme_pressure_removed = initial_count - len(df)
-                if extreme_pressure_removed > 0:
-                    logger.info(f"   Filtered out {extreme_pressure_removed} records with extreme negative pressure")
-            
-            # Filter out invalid temperature and salinity ranges
-            if 'temperature' in df.columns:
-                temp_before = len(df)
-                df = df[(df['temperature'] >= -5.0) & (df['temperature'] <= 50.0)]  # Reasonable ocean temp range
-                temp_filtered = temp_before - len(df)
-                if temp_filtered > 0:
-                    logger.info(f"   Filtered out {temp_filtered} records with invalid temperature")
-            
-            if 'salinity' in df.columns:
-                sal_before = len(df)
-                df = df[(df['salinity'] >= 0.0) & (df['salinity'] <= 50.0)]  # Reasonable salinity range
-                sal_filtered = sal_before - len(df)
-                if sal_filtered > 0:
-                    logger.info(f"   Filtered out {sal_filtered} records with invalid salinity")
-            
-            # Create PostGIS geometry column using raw SQL approach
-            # We'll handle this in the insert method since pandas can't directly create PostGIS geometry
-            
-            # Define expected columns based on actual CSV structure
-            expected_columns = [
-                'profile_id', 'float_id', 'cycle_number', 'latitude', 'longitude',
-                'datetime', 'pressure', 'temperature', 'salinity', 'pressure_qc',
-                'temperature_qc', 'salinity_qc', 'project_name', 'pi_name',
-                'platform_type', 'data_mode', 'data_centre', 'source_file'
-            ]
-            
-            # Select only the columns that exist in the DataFrame
-            available_columns = [col for col in expected_columns if col in df.columns]
-            result_df = df[available_columns].copy()
+        self._require_wide_table("benchmark_insert")
+        results = {}
+        
+        for method in ("to_sql", "copy"):
+            tag = f"__benchmark_{method}__"
+            bench_df = df.assign(source_file=tag)
             
-            logger.info(f"Prepared {len(result_df)} records from {Path(csv_file_path).name}")
-            return result_df
+            start = time.perf_counter()
+            ok = self.insert_dataframe(bench_df, batch_size=batch_size, method=method)
+            elapsed = time.perf_counter() - start
             
-        except Exception as e:
-            logger.error(f"❌ Error reading CSV {csv_file_path}: {e}")
-            return None
+            self.delete_source_file(tag)
+            results[method] = {
+                'ok': ok,
+                'rows': len(df),
+                'seconds': round(elapsed, 3),
+                'rows_per_second': len(df) / elapsed if elapsed > 0 else 0.0
+            }
+            logger.info(f"⏱️  {method}: {len(df):,} rows in {elapsed:.2f}s ({results[method]['rows_per_second']:,.0f} rows/sec)")
+        
+        if results['to_sql']['rows_per_second'] > 0:
+            results['copy_speedup'] = results['copy']['rows_per_second'] / results['to_sql']['rows_per_second']
+            logger.info(f"🚀 COPY is {results['copy_speedup']:.1f}x faster than to_sql + UPDATE")
+        
+        return results
     
-    def insert_dataframe(self, df: pd.DataFrame, batch_size: int = 1000) -> bool:
+    def compare_layouts(self, df: pd.DataFrame, repeats: int = 5) -> Dict:
         """
-        Insert DataFrame into PostgreSQL with PostGIS geometry creation.
+        Compare on-disk size and query latency of the table layouts.
+        
+        The same rows are loaded into each layout inside a scratch schema (dropped
+        afterwards), then a few representative queries are timed against
+        `argo_profiles`: the Node `getProfile` date lookup, a float lookup and a
+        region box query.
         
         Args:
-            df: DataFrame to insert
-            batch_size: Number of records per batch
+            df: Prepared DataFrame (e.g. from `read_and_prepare_csv`)
+            repeats: Number of timed runs per query (the median is reported)
             
         Returns:
-            bool: True if insertion successful
+            Dictionary per layout with load time, total size and median query latency in ms
         """
+        sample_date = df['datetime'].dropna().iloc[0].date()
+        sample_float = str(df['float_id'].dropna().iloc[0])
+        center_lat, center_lon = df['latitude'].median(), df['longitude'].median()
+        box = (center_lon - 5, center_lat - 5, center_lon + 5, center_lat + 5)
+        
+        queries = {
+            'profile_by_date': ("""
+                SELECT DISTINCT ON (profile_id) profile_id, latitude, longitude, datetime,
+                       pressure, temperature, salinity, project_name, platform_type
+                FROM argo_profiles
+                WHERE datetime >= %(day)s::date AND datetime < %(day)s::date + 1
+                ORDER BY profile_id, pressure ASC
+            """, {'day': sample_date}),
+            'float_lookup': (
+                "SELECT pressure, temperature, salinity FROM argo_profiles WHERE float_id = %s",
+                (sample_float,)
+            ),
+            'region_box': (
+                "SELECT COUNT(*) FROM argo_profiles "
+                "WHERE ST_Intersects(location, ST_MakeEnvelope(%s, %s, %s, %s, 4326)::geography)",
+                box
+            ),
+        }
+        
+        original_layout = self.layout
+        cursor = self.connection.cursor()
+        results = {}
+        
         try:
-            # First, insert the data without the geometry column using pandas
-            df_copy = df.copy()
-            
-            # Insert data using pandas to_sql
-            df_copy.to_sql(
-                'argo_profiles',
-                self.engine,
-                if_exists='append',
-                index=False,
-                method='multi',
-                chunksize=batch_size
-            )
-            
-            # Now update the location geometry column using raw SQL
+            for layout in LAYOUT_TABLES:
+                schema = f"layout_compare_{layout}"
+                cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+                cursor.execute(f"CREATE SCHEMA {schema}")
+                cursor.execute(f"SET search_path TO {schema}, public")
+                self.layout = layout
+                
+                self.create_argo_table(recreate=False)
+                start = time.perf_counter()
+                self.copy_dataframe(df)
+                load_seconds = time.perf_counter() - start
+                for table in LAYOUT_TABLES[layout]:
+                    cursor.execute(f"ANALYZE {table}")
+                
+                cursor.execute("""
+                    SELECT COALESCE(SUM(pg_total_relation_size(c.oid)), 0)
+                    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = %s AND c.relkind = 'r'
+                """, (schema,))
+                size_bytes = cursor.fetchone()[0]
+                
+                latencies = {}
+                for name, (sql, params) in queries.items():
+                    timings = []
+                    for _ in range(repeats):
+                        start = time.perf_counter()
+                        cursor.execute(sql, params)
+                        cursor.fetchall()
+                        timings.append((time.perf_counter() - start) * 1000)
+                    latencies[name] = float(np.median(timings))
+                
+                results[layout] = {
+                    'load_seconds': round(load_seconds, 3),
+                    'size_bytes': size_bytes,
+                    'query_ms': latencies
+                }
+                logger.info(f"📦 {layout}: {size_bytes / 1e6:,.1f} MB, loaded in {load_seconds:.2f}s")
+                for name, ms in latencies.items():
+                    logger.info(f"   {name}: {ms:.1f} ms")
+        
+        finally:
+            self.layout = original_layout
+            cursor.execute("SET search_path TO DEFAULT")
+            for layout in LAYOUT_TABLES:
+                cursor.execute(f"DROP SCHEMA IF EXISTS layout_compare_{layout} CASCADE")
+            cursor.close()
+        
+        if results.get('wide', {}).get('size_bytes'):
+            ratio = results['normalized']['size_bytes'] / results['wide']['size_bytes']
+            logger.info(f"📉 Normalized layout uses {ratio:.0%} of the wide table's space")
+        
+        return results
+    
+    def _create_file_stats_table(self, cursor):
+        """
+        Create the per-file statistics table, backfilling it when argo_profiles already has rows.
+        
+        Args:
+            cursor: Cursor on the managed connection
+        """
+        cursor.execute("SELECT to_regclass('argo_file_stats') IS NULL, to_regclass('argo_profiles') IS NOT NULL")
+        stats_missing, table_exists = cursor.fetchone()
+        cursor.execute(FILE_STATS_SQL)
+        
+        # Tables loaded before the statistics table existed get their summary now
+        if stats_missing and table_exists:
+            self.refresh_table_stats()
+    
+    def record_file_stats(self, df: pd.DataFrame):
+        """
+        Fold the aggregates of freshly loaded rows into `argo_file_stats`.
+        
+        Args:
+            df: Rows that were just inserted into argo_profiles
+        """
+        rows = summarize_file_stats(df)
+        if rows:
             cursor = self.connection.cursor()
-            
-            # Update the geometry column for the records we just inserted
-            # We identify them by finding records with NULL location that have the source file
-            source_file = df['source_file'].iloc[0] if 'source_file' in df.columns else None
-            
-            if source_file:
-                update_geometry_sql = """
-                UPDATE argo_profiles 
-                SET location = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography
-                WHERE location IS NULL AND source_file = %s
-                """
-                cursor.execute(update_geometry_sql, (source_file,))
-            else:
-                # Fallback: update all NULL geometries
-                update_geometry_sql = """
-                UPDATE argo_profiles 
-                SET location = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography
-                WHERE location IS NULL
-                """
-                cursor.execute(update_geometry_sql)
-            
+            cursor.executemany(FILE_STATS_UPSERT_SQL, rows)
             cursor.close()
+    
+    def refresh_table_stats(self) -> bool:
+        """
+        Rebuild `argo_file_stats` from argo_profiles in a single grouped scan.
+        
+        Returns:
+            bool: True if the summary was rebuilt
+        """
+        try:
+            start = time.perf_counter()
+            with self.transaction():
+                cursor = self.connection.cursor()
+                cursor.execute("DELETE FROM argo_file_stats")
+                cursor.execute(FILE_STATS_REBUILD_SQL.format(where=""))
+                files = cursor.rowcount
+                cursor.close()
             
-            logger.info(f"✅ Inserted {len(df)} records with PostGIS geometry")
+            logger.info(f"✅ Rebuilt statistics for {files} source files in {time.perf_counter() - start:.1f}s")
             return True
             
-        except Exception as e:
-            logger.error(f"❌ Error inserting data: {e}")
+        except psycopg2.Error as e:
+            logger.error(f"❌ Failed to rebuild table statistics: {e}")
             return False
     
-    def get_table_stats(self) -> Dict:
+    def get_table_stats(self, exact: bool = False) -> Dict:
         """
         Get statistics about the argo_profiles table including PostGIS spatial info.
         
+        By default the statistics are read from the `argo_file_stats` summary, which
+        loaders keep up to date per source file, so this takes milliseconds regardless
+        of table size; its `bbox_wkt` is then the envelope of the per-file lat/lon bounds,
+        not ST_Extent of the geometries. `exact=True` computes them from argo_profiles in
+        one scan instead (for audits; see also `refresh_table_stats`).
+        
+        Args:
+            exact: Scan argo_profiles instead of reading the summary
+            
         Returns:
             Dictionary with table statistics
         """
         try:
             cursor = self.connection.cursor()
             
-            # Get total count
-            cursor.execute("SELECT COUNT(*) FROM argo_profiles")
-            total_count = cursor.fetchone()[0]
-            
-            # Get unique floats
-            cursor.execute("SELECT COUNT(DISTINCT float_id) FROM argo_profiles WHERE float_id IS NOT NULL")
-            unique_floats = cursor.fetchone()[0]
-            
-            # Get date range
-            cursor.execute("""
-                SELECT MIN(datetime), MAX(datetime) 
-                FROM argo_profiles 
-                WHERE datetime IS NOT NULL
-            """)
-            date_range = cursor.fetchone()
-            
-            # Get geographic bounds using PostGIS functions
-            cursor.execute("""
-                SELECT 
-                    MIN(latitude), MAX(latitude), 
-                    MIN(longitude), MAX(longitude),
-                    ST_AsText(ST_Extent(location::geometry)) as bbox
-                FROM argo_profiles
-                WHERE location IS NOT NULL
-            """)
-            geo_result = cursor.fetchone()
-            
-            # Count records with geometry
-            cursor.execute("SELECT COUNT(*) FROM argo_profiles WHERE location IS NOT NULL")
-            geometry_count = cursor.fetchone()[0]
+            if exact:
+                cursor.execute("""
+                    SELECT
+                        COUNT(*),
+                        COUNT(DISTINCT float_id),
+                        COUNT(location),
+                        MIN(datetime), MAX(datetime),
+                        MIN(latitude) FILTER (WHERE location IS NOT NULL),
+                        MAX(latitude) FILTER (WHERE location IS NOT NULL),
+                        MIN(longitude) FILTER (WHERE location IS NOT NULL),
+                        MAX(longitude) FILTER (WHERE location IS NOT NULL),
+                        ST_AsText(ST_Extent(location::geometry))
+                    FROM argo_profiles
+                """)
+            else:
+                cursor.execute("""
+                    SELECT
+                        COALESCE(SUM(row_count), 0),
+                        (SELECT COUNT(DISTINCT f) FROM argo_file_stats, unnest(float_ids) AS f),
+                        COALESCE(SUM(geometry_count), 0),
+                        MIN(min_datetime), MAX(max_datetime),
+                        MIN(min_lat), MAX(max_lat),
+                        MIN(min_lon), MAX(max_lon),
+                        ST_AsText(ST_MakeEnvelope(MIN(min_lon), MIN(min_lat), MAX(max_lon), MAX(max_lat), 4326))
+                    FROM argo_file_stats
+                """)
+            (total_count, unique_floats, geometry_count, start, end,
+             min_lat, max_lat, min_lon, max_lon, bbox_wkt) = cursor.fetchone()
             
             cursor.close()
             
@@ -465,15 +1581,15 @@ class ArgoPostgresManager:
                 'unique_floats': unique_floats,
                 'records_with_geometry': geometry_count,
                 'date_range': {
-                    'start': date_range[0] if date_range and date_range[0] else None,
-                    'end': date_range[1] if date_range and date_range[1] else None
+                    'start': start,
+                    'end': end
                 },
                 'geographic_bounds': {
-                    'min_lat': geo_result[0] if geo_result else None,
-                    'max_lat': geo_result[1] if geo_result else None,
-                    'min_lon': geo_result[2] if geo_result else None,
-                    'max_lon': geo_result[3] if geo_result else None,
-                    'bbox_wkt': geo_result[4] if geo_result and len(geo_result) > 4 else None
+                    'min_lat': min_lat,
+                    'max_lat': max_lat,
+                    'min_lon': min_lon,
+                    'max_lon': max_lon,
+                    'bbox_wkt': bbox_wkt
                 }
             }
             
@@ -483,6 +1599,23 @@ class ArgoPostgresManager:
             logger.error(f"❌ Error getting table stats: {e}")
             return {}
     
+    def log_table_stats(self, exact: bool = False):
+        """Log the statistics returned by `get_table_stats`."""
+        stats = self.get_table_stats(exact=exact)
+        if stats:
+            logger.info(f"\n📈 Database Statistics:")
+            logger.info(f"   Total records: {stats['total_records']:,}")
+            logger.info(f"   Unique floats: {stats['unique_floats']:,}")
+            logger.info(f"   Records with PostGIS geometry: {stats['records_with_geometry']:,}")
+            if stats['date_range']['start']:
+                logger.info(f"   Date range: {stats['date_range']['start']} to {stats['date_range']['end']}")
+            
+            geo_bounds = stats['geographic_bounds']
+            if geo_bounds['min_lat'] is not None:
+                logger.info(f"   Geographic bounds: ({geo_bounds['min_lat']:.2f}, {geo_bounds['min_lon']:.2f}) to ({geo_bounds['max_lat']:.2f}, {geo_bounds['max_lon']:.2f})")
+                if geo_bounds['bbox_wkt']:
+                    logger.info(f"   Spatial extent (WKT): {geo_bounds['bbox_wkt']}")
+    
     def process_all_csv_files(self, csv_root_dir: str) -> bool:
         """
         Process all CSV files in chronological order (latest first) and insert into database.
@@ -503,6 +1636,7 @@ class ArgoPostgresManager:
         logger.info(f"📅 Processing {len(csv_files)} CSV files in chronological order (latest → oldest)")
         
         processed_count = 0
+        empty_count = 0
         failed_count = 0
         total_records = 0
         
@@ -517,6 +1651,7 @@ class ArgoPostgresManager:
             if df is not None and not df.empty:
                 # Insert into database
                 if self.insert_dataframe(df):
+                    self.record_ledger_entry(csv_file, self.csv_source_file(csv_file), len(df))
                     processed_count += 1
                     total_records += len(df)
                     
@@ -534,34 +1669,78 @@ class ArgoPostgresManager:
                 else:
                     failed_count += 1
                     logger.error(f"❌ Failed to insert data from {file_name}")
+            elif df is not None:
+                # Read fine, but nothing passed the filters: loaded, with no rows
+                self.record_ledger_entry(csv_file, self.csv_source_file(csv_file), 0)
+                empty_count += 1
+                logger.warning(f"⚠️ No valid data in {file_name}")
             else:
                 failed_count += 1
-                logger.warning(f"⚠️ No valid data in {file_name}")
+                logger.error(f"❌ Failed to read {file_name}")
         
         # Print summary
         logger.info(f"\n🎉 Processing complete!")
         logger.info(f"✅ Successfully processed: {processed_count} files")
+        logger.info(f"⚪ Files without valid data: {empty_count}")
         logger.info(f"❌ Failed to process: {failed_count} files")
         logger.info(f"📊 Total records inserted: {total_records}")
         logger.info(f"📅 Data inserted in chronological order (latest first)")
         
         # Print table statistics
-        stats = self.get_table_stats()
-        if stats:
-            logger.info(f"\n📈 Database Statistics:")
-            logger.info(f"   Total records: {stats['total_records']:,}")
-            logger.info(f"   Unique floats: {stats['unique_floats']:,}")
-            logger.info(f"   Records with PostGIS geometry: {stats['records_with_geometry']:,}")
-            if stats['date_range']['start']:
-                logger.info(f"   Date range: {stats['date_range']['start']} to {stats['date_range']['end']}")
+        self.log_table_stats()
+        
+        return processed_count + empty_count > 0
+    
+    def process_csv_files_incremental(self, csv_root_dir: str) -> bool:
+        """
+        Load only CSV files that are new or changed according to the ingestion ledger.
+        
+        Unchanged files are skipped, changed files have their rows atomically replaced,
+        and the argo_profiles table and its indexes are kept in place.
+        
+        Args:
+            csv_root_dir: Root directory containing CSV files
             
-            geo_bounds = stats['geographic_bounds']
-            if geo_bounds['min_lat'] is not None:
-                logger.info(f"   Geographic bounds: ({geo_bounds['min_lat']:.2f}, {geo_bounds['min_lon']:.2f}) to ({geo_bounds['max_lat']:.2f}, {geo_bounds['max_lon']:.2f})")
-                if geo_bounds['bbox_wkt']:
-                    logger.info(f"   Spatial extent (WKT): {geo_bounds['bbox_wkt']}")
+        Returns:
+            bool: True if no file failed
+        """
+        csv_files = self.find_csv_files(csv_root_dir)
+        
+        if not csv_files:
+            logger.warning(f"No CSV files found in {csv_root_dir}")
+            return False
+        
+        counts = {'new': 0, 'replaced': 0, 'unchanged': 0, 'failed': 0}
+        total_records = 0
+        
+        for i, csv_file in enumerate(csv_files, 1):
+            file_name = Path(csv_file).name
+            
+            def load_batches(csv_file=csv_file):
+                df = self.read_and_prepare_csv(csv_file)
+                if df is None:
+                    raise RuntimeError(f"could not read {csv_file}")
+                return [df] if not df.empty else []
+            
+            status, rows = self.load_file_incremental(csv_file, self.csv_source_file(csv_file), load_batches)
+            counts[status] += 1
+            
+            if status in ('new', 'replaced'):
+                total_records += rows
+                logger.info(f"✅ [{i}/{len(csv_files)}] {file_name}: {status} ({rows} records)")
+            elif status == 'failed':
+                logger.error(f"❌ [{i}/{len(csv_files)}] Failed to load {file_name}")
+        
+        logger.info(f"\n🎉 Incremental load complete!")
+        logger.info(f"🆕 New files: {counts['new']}")
+        logger.info(f"🔁 Replaced (changed) files: {counts['replaced']}")
+        logger.info(f"⏭️  Unchanged files skipped: {counts['unchanged']}")
+        logger.info(f"❌ Failed files: {counts['failed']}")
+        logger.info(f"📊 Total records inserted: {total_records}")
+        
+        self.log_table_stats()
         
-        return processed_count > 0
+        return counts['failed'] == 0
     
     def close(self):
         """Close database connections."""
@@ -713,9 +1892,15 @@ def test_connection(config):
         return False
 
 
-def main():
+def main(incremental: bool = False, bulk: bool = False, index_workers: int = 4, layout: str = "wide"):
     """
     Main function to process all ARGO CSV files and load them into PostgreSQL.
+    
+    Args:
+        incremental: Keep the existing table and load only new or changed files
+        bulk: Load into an unindexed table and build the indexes in parallel afterwards
+        index_workers: Number of indexes built concurrently in bulk mode
+        layout: Table layout, 'wide' or 'normalized'
     """
     # Get database configuration with authentication handling
     DB_CONFIG = get_database_config()
@@ -729,7 +1914,7 @@ def main():
     logger.info(f"🗄️  Database: {DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}")
     
     # Initialize PostgreSQL manager
-    pg_manager = ArgoPostgresManager(**DB_CONFIG)
+    pg_manager = ArgoPostgresManager(**DB_CONFIG, layout=layout)
     
     try:
         # Create database if it doesn't exist
@@ -742,13 +1927,35 @@ def main():
             logger.error("Failed to connect to database")
             return False
         
+        phase_times = {}
+        
         # Create table schema
-        if not pg_manager.create_argo_table():
+        start = time.perf_counter()
+        if not pg_manager.create_argo_table(recreate=not incremental, with_indexes=not bulk):
             logger.error("Failed to create table schema")
             return False
         
+        if not pg_manager.create_ingestion_ledger():
+            logger.error("Failed to create ingestion ledger")
+            return False
+        phase_times['create_table'] = time.perf_counter() - start
+        
         # Process all CSV files
-        success = pg_manager.process_all_csv_files(str(csv_root_dir))
+        start = time.perf_counter()
+        if incremental:
+            success = pg_manager.process_csv_files_incremental(str(csv_root_dir))
+        else:
+            success = pg_manager.process_all_csv_files(str(csv_root_dir))
+        phase_times['load'] = time.perf_counter() - start
+        
+        if bulk:
+            start = time.perf_counter()
+            pg_manager.build_indexes(workers=index_workers)
+            phase_times['build_indexes'] = time.perf_counter() - start
+        
+        logger.info("⏱️  Phase timings:")
+        for phase, seconds in phase_times.items():
+            logger.info(f"   {phase}: {seconds:.1f}s")
         
         if success:
             logger.info("🎉 ARGO data import completed successfully!")
@@ -765,6 +1972,226 @@ def main():
         pg_manager.close()
 
 
+def run_index_maintenance(rebuild: bool = False, workers: int = 4, layout: str = "wide") -> bool:
+    """
+    Validate the argo_profiles indexes and build missing or invalid ones.
+    
+    Args:
+        rebuild: REINDEX every index, not just missing or invalid ones
+        workers: Number of indexes built concurrently
+        layout: Table layout whose indexes are checked
+        
+    Returns:
+        bool: True if all indexes are valid afterwards
+    """
+    DB_CONFIG = get_database_config()
+    pg_manager = ArgoPostgresManager(**DB_CONFIG, layout=layout)
+    
+    try:
+        if not pg_manager.connect():
+            logger.error("Failed to connect to database")
+            return False
+        
+        report = pg_manager.validate_indexes()
+        if rebuild or report['missing'] or report['invalid']:
+            start = time.perf_counter()
+            pg_manager.build_indexes(workers=workers, rebuild=rebuild)
+            logger.info(f"⏱️  Index build took {time.perf_counter() - start:.1f}s")
+            report = pg_manager.validate_indexes()
+        
+        return not (report['missing'] or report['invalid'])
+        
+    finally:
+        pg_manager.close()
+
+
+def run_insert_benchmark(csv_file: str) -> bool:
+    """
+    Benchmark the insert paths on one CSV file against the existing argo_profiles table.
+    
+    Args:
+        csv_file: CSV file produced by profiles.py
+        
+    Returns:
+        bool: True if both methods loaded the rows
+    """
+    DB_CONFIG = get_database_config()
+    pg_manager = ArgoPostgresManager(**DB_CONFIG)
+    
+    try:
+        if not pg_manager.connect():
+            logger.error("Failed to connect to database")
+            return False
+        
+        df = pg_manager.read_and_prepare_csv(csv_file)
+        if df is None or df.empty:
+            logger.error(f"No valid data in {csv_file}")
+            return False
+        
+        results = pg_manager.benchmark_insert(df)
+        return all(results[method]['ok'] for method in ("to_sql", "copy"))
+        
+    finally:
+        pg_manager.close()
+
+
+def run_layout_comparison(csv_file: str) -> bool:
+    """
+    Compare the table layouts on one CSV file in scratch schemas.
+    
+    Args:
+        csv_file: CSV file produced by profiles.py
+        
+    Returns:
+        bool: True if every layout was measured
+    """
+    DB_CONFIG = get_database_config()
+    pg_manager = ArgoPostgresManager(**DB_CONFIG)
+    
+    try:
+        if not pg_manager.connect():
+            logger.error("Failed to connect to database")
+            return False
+        
+        df = pg_manager.read_and_prepare_csv(csv_file)
+        if df is None or df.empty:
+            logger.error(f"No valid data in {csv_file}")
+            return False
+        
+        results = pg_manager.compare_layouts(df)
+        return set(results) == set(LAYOUT_TABLES)
+        
+    finally:
+        pg_manager.close()
+
+
+def run_table_stats(exact: bool = False) -> bool:
+    """
+    Log argo_profiles statistics from the summary table, or recompute them exactly.
+    
+    With `exact=True` the statistics are computed from argo_profiles, compared with
+    the summary, and the summary is rebuilt if the two disagree.
+    
+    Args:
+        exact: Scan argo_profiles instead of trusting the summary
+        
+    Returns:
+        bool: True if successful
+    """
+    DB_CONFIG = get_database_config()
+    pg_manager = ArgoPostgresManager(**DB_CONFIG)
+    
+    try:
+        if not pg_manager.connect():
+            logger.error("Failed to connect to database")
+            return False
+        
+        start = time.perf_counter()
+        cached = pg_manager.get_table_stats()
+        logger.info(f"⚡ Summary statistics read in {(time.perf_counter() - start) * 1000:.1f} ms")
+        if not exact:
+            pg_manager.log_table_stats()
+            return bool(cached)
+        
+        start = time.perf_counter()
+        stats = pg_manager.get_table_stats(exact=True)
+        logger.info(f"🔍 Exact statistics computed in {time.perf_counter() - start:.1f}s")
+        pg_manager.log_table_stats(exact=True)
+        
+        # The summary's bbox is an envelope rather than ST_Extent, so it is not compared
+        drifted = [
+            key for key in ('total_records', 'unique_floats', 'records_with_geometry', 'date_range')
+            if cached.get(key) != stats.get(key)
+        ]
+        if drifted:
+            logger.warning(f"⚠️ Summary statistics out of date ({', '.join(drifted)}), rebuilding")
+            return pg_manager.refresh_table_stats()
+        
+        logger.info("✅ Summary statistics match the table")
+        return bool(stats)
+        
+    finally:
+        pg_manager.close()
+
+
+def run_partition_maintenance(detach_month: Optional[str] = None, drop: bool = False) -> bool:
+    """
+    List the partitions of argo_profiles and optionally detach one month.
+    
+    Args:
+        detach_month: Month to detach, as 'YYYY-MM'
+        drop: Drop the detached partition
+        
+    Returns:
+        bool: True if successful
+    """
+    DB_CONFIG = get_database_config()
+    pg_manager = ArgoPostgresManager(**DB_CONFIG, layout="partitioned")
+    
+    try:
+        if not pg_manager.connect():
+            logger.error("Failed to connect to database")
+            return False
+        
+        if detach_month and not pg_manager.detach_partition(detach_month, drop=drop):
+            return False
+        
+        partitions = pg_manager.list_partitions()
+        if not partitions:
+            logger.warning("⚠️ argo_profiles has no partitions (is it the partitioned layout?)")
+        for partition in partitions:
+            logger.info(f"🗓️  {partition['name']}: ~{partition['rows']:,} rows, "
+                        f"{partition['size_bytes'] / 1e6:,.1f} MB ({partition['bounds']})")
+        return True
+        
+    finally:
+        pg_manager.close()
+
+
 if __name__ == "__main__":
-    success = main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Load ARGO CSV files into PostgreSQL/PostGIS.")
+    parser.add_argument('--benchmark', metavar='CSV_FILE',
+                        help="Compare to_sql + UPDATE against COPY on one CSV file instead of importing")
+    parser.add_argument('--compare-layouts', metavar='CSV_FILE',
+                        help="Compare size and query latency of every table layout on one CSV file")
+    parser.add_argument('--layout', choices=list(LAYOUT_TABLES), default='wide',
+                        help="Wide argo_profiles table, normalized profiles/measurements tables behind an "
+                             "argo_profiles view, or argo_profiles partitioned by month")
+    parser.add_argument('--stats', action='store_true',
+                        help="Print table statistics from the per-file summary, without loading data")
+    parser.add_argument('--exact', action='store_true',
+                        help="With --stats, compute the statistics from argo_profiles and rebuild the summary")
+    parser.add_argument('--list-partitions', action='store_true',
+                        help="List the monthly partitions of a partitioned argo_profiles table")
+    parser.add_argument('--detach-month', metavar='YYYY-MM',
+                        help="Detach one month from a partitioned argo_profiles table")
+    parser.add_argument('--drop-detached', action='store_true',
+                        help="Drop the partition detached with --detach-month")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Keep the existing table and load only new or changed files")
+    parser.add_argument('--bulk', action='store_true',
+                        help="Load into an unindexed table and build indexes in parallel afterwards")
+    parser.add_argument('--index-workers', type=int, default=4,
+                        help="Number of indexes built concurrently")
+    parser.add_argument('--validate-indexes', action='store_true',
+                        help="Check the indexes and build any that are missing or invalid, without loading data")
+    parser.add_argument('--rebuild-indexes', action='store_true',
+                        help="Rebuild every index, without loading data")
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        success = run_insert_benchmark(args.benchmark)
+    elif args.compare_layouts:
+        success = run_layout_comparison(args.compare_layouts)
+    elif args.stats:
+        success = run_table_stats(exact=args.exact)
+    elif args.list_partitions or args.detach_month:
+        success = run_partition_maintenance(detach_month=args.detach_month, drop=args.drop_detached)
+    elif args.validate_indexes or args.rebuild_indexes:
+        success = run_index_maintenance(rebuild=args.rebuild_indexes, workers=args.index_workers, layout=args.layout)
+    else:
+        success = main(incremental=args.incremental, bulk=args.bulk, index_workers=args.index_workers,
+                       layout=args.layout)
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -5,6 +5,12 @@ from datetime import datetime
 import os
 from pathlib import Path
 import glob
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pyarrow as pa
+import pyarrow.dataset as arrow_dataset
+import pyarrow.parquet as pq
 
 
 def safe_decode(val):
@@ -16,13 +22,352 @@ def safe_decode(val):
     return str(val).strip() if val is not None else ''
 
 
-def process_netcdf_file(file_path, verbose=False):
+# Columns every processed file has, in output order; anything else is a BGC column
+CORE_COLUMNS = [
+    'profile_id', 'float_id', 'cycle_number', 'latitude', 'longitude', 'datetime',
+    'pressure', 'temperature', 'salinity', 'pressure_qc', 'temperature_qc', 'salinity_qc',
+    'project_name', 'pi_name', 'platform_type', 'data_mode', 'data_centre'
+]
+
+
+def decode_array(values):
+    """
+    Vectorized `safe_decode`: decode each distinct value once and broadcast the result.
+
+    Args:
+        values (np.ndarray): Array of byte strings, strings or numbers (any shape)
+
+    Returns:
+        np.ndarray: Object array of decoded strings with the same shape
+    """
+    values = np.asarray(values)
+    if values.size == 0:
+        return np.empty(values.shape, dtype=object)
+    codes, uniques = pd.factorize(values.ravel(), use_na_sentinel=False)
+    decoded = np.array([safe_decode(u) for u in uniques], dtype=object)
+    return decoded[codes].reshape(values.shape)
+
+
+def extract_profile_arrays(ds, verbose=False):
+    """
+    Extract the per-profile and per-level arrays needed to flatten an ARGO dataset.
+
+    Args:
+        ds (xr.Dataset): Opened ARGO `*_prof.nc` dataset
+        verbose (bool): Print debugging information
+
+    Returns:
+        dict: Raw numpy arrays keyed by role, plus `bgc_vars` / `bgc_qc_vars` dicts
+    """
+    # 1. Extract georeferenced 1D arrays (one per profile)
+    lat = ds['LATITUDE'].values if 'LATITUDE' in ds else None
+    lon = ds['LONGITUDE'].values if 'LONGITUDE' in ds else None
+    juld = ds['JULD'].values if 'JULD' in ds else None
+    platform_numbers = ds['PLATFORM_NUMBER'].values if 'PLATFORM_NUMBER' in ds else None
+    cycle_numbers = ds['CYCLE_NUMBER'].values if 'CYCLE_NUMBER' in ds else None
+
+    # 2. Convert JULD to list of ISO datetime strings
+    if juld is not None:
+        raw = juld
+        if np.issubdtype(raw.dtype, np.datetime64):
+            datetimes = pd.to_datetime(raw).strftime('%Y-%m-%d %H:%M:%S').tolist()
+        else:
+            datetimes = pd.to_datetime(raw, unit='D', origin='1950-01-01') \
+                          .strftime('%Y-%m-%d %H:%M:%S').tolist()
+    else:
+        datetimes = [''] * (lat.shape[0] if lat is not None else 0)
+
+    # 3. Extract core 2D measurement arrays (profiles x levels)
+    pres = ds['PRES_ADJUSTED'].values if 'PRES_ADJUSTED' in ds else ds['PRES'].values
+    temp = ds['TEMP_ADJUSTED'].values if 'TEMP_ADJUSTED' in ds else ds['TEMP'].values
+    sal = ds['PSAL_ADJUSTED'].values if 'PSAL_ADJUSTED' in ds else ds['PSAL'].values
+
+    # 4. Extract QC arrays
+    pres_qc = ds['PRES_ADJUSTED_QC'].values if 'PRES_ADJUSTED_QC' in ds else ds.get('PRES_QC', np.full_like(pres, '1')).values
+    temp_qc = ds['TEMP_ADJUSTED_QC'].values if 'TEMP_ADJUSTED_QC' in ds else ds.get('TEMP_QC', np.full_like(temp, '1')).values
+    sal_qc = ds['PSAL_ADJUSTED_QC'].values if 'PSAL_ADJUSTED_QC' in ds else ds.get('PSAL_QC', np.full_like(sal, '1')).values
+
+    # 5. Extract 1D metadata arrays
+    project_names = ds['PROJECT_NAME'].values if 'PROJECT_NAME' in ds else None
+    pi_names = ds['PI_NAME'].values if 'PI_NAME' in ds else None
+    platform_types = ds['PLATFORM_TYPE'].values if 'PLATFORM_TYPE' in ds else None
+    data_modes = ds['DATA_MODE'].values if 'DATA_MODE' in ds else None
+    data_centres = ds['DATA_CENTRE'].values if 'DATA_CENTRE' in ds else None
+
+    # 6. BGC Detection - Check what's actually available
+    if verbose:
+        print("\n=== BGC PARAMETER DETECTION ===")
+
+    bgc_vars = {}
+    bgc_qc_vars = {}
+
+    # Check all variables in dataset for BGC parameters
+    available_vars = list(ds.data_vars.keys())
+    if verbose:
+        print(f"Total variables in dataset: {len(available_vars)}")
+
+    found_bgc_vars = []
+    for var in available_vars:
+        # Check if it's a BGC variable (not core P/T/S)
+        if var not in ['PRES', 'TEMP', 'PSAL', 'PRES_ADJUSTED', 'TEMP_ADJUSTED', 'PSAL_ADJUSTED']:
+            # Check if it's measurement data (has N_LEVELS dimension)
+            if hasattr(ds[var], 'dims') and 'N_LEVELS' in ds[var].dims:
+                if not var.endswith('_QC') and not var.endswith('_ERROR'):
+                    found_bgc_vars.append(var)
+
+    if verbose:
+        print(f"Potential BGC variables found: {found_bgc_vars}")
+
+    # Extract found BGC variables
+    for var in found_bgc_vars:
+        try:
+            # Check for adjusted version first
+            adj_var = f"{var}_ADJUSTED"
+            if adj_var in ds:
+                bgc_vars[var.lower()] = ds[adj_var].values
+                # Look for QC flag
+                qc_var = f"{adj_var}_QC"
+                if qc_var in ds:
+                    bgc_qc_vars[f"{var.lower()}_qc"] = ds[qc_var].values
+            else:
+                bgc_vars[var.lower()] = ds[var].values
+                # Look for QC flag
+                qc_var = f"{var}_QC"
+                if qc_var in ds:
+                    bgc_qc_vars[f"{var.lower()}_qc"] = ds[qc_var].values
+
+            if verbose:
+                print(f"✅ Extracted BGC variable: {var}")
+        except Exception as e:
+            if verbose:
+                print(f"❌ Failed to extract {var}: {e}")
+
+    if verbose:
+        print(f"\n🔬 BGC variables successfully extracted: {list(bgc_vars.keys())}")
+        print(f"📊 BGC QC variables: {list(bgc_qc_vars.keys())}")
+
+    # Check if this file has any BGC data at all
+    if not bgc_vars and verbose:
+        print("⚠️  NO BGC DATA FOUND - This appears to be a CORE-only ARGO file")
+
+    return {
+        'lat': lat, 'lon': lon, 'datetimes': datetimes,
+        'platform_numbers': platform_numbers, 'cycle_numbers': cycle_numbers,
+        'pres': pres, 'temp': temp, 'sal': sal,
+        'pres_qc': pres_qc, 'temp_qc': temp_qc, 'sal_qc': sal_qc,
+        'project_names': project_names, 'pi_names': pi_names, 'platform_types': platform_types,
+        'data_modes': data_modes, 'data_centres': data_centres,
+        'bgc_vars': bgc_vars, 'bgc_qc_vars': bgc_qc_vars,
+    }
+
+
+def _level_grid(arr, n_profiles, n_levels, fill):
+    """Return `arr` as an (n_profiles, n_levels) view, padding 1D per-level arrays with `fill`."""
+    if arr.ndim == 2:
+        return arr
+    if len(arr) < n_levels:
+        padded = np.full(n_levels, fill, dtype=object if isinstance(fill, str) else np.result_type(arr, float))
+        padded[:len(arr)] = arr
+        arr = padded
+    return np.broadcast_to(arr[:n_levels], (n_profiles, n_levels))
+
+
+def flatten_profiles(arrays):
+    """
+    Build the long-format measurement table straight from the (N_PROF, N_LEVELS) arrays.
+
+    Produces the same rows and columns as the per-level loop in `flatten_profiles_loop`,
+    but selects valid measurements with a single NumPy mask and decodes every QC and
+    metadata byte array once per column instead of once per cell.
+
+    Args:
+        arrays (dict): Output of `extract_profile_arrays`
+
+    Returns:
+        pd.DataFrame: One row per valid (profile, level) measurement
+    """
+    lat, lon, pres = arrays['lat'], arrays['lon'], arrays['pres']
+    n_profiles = lat.shape[0] if lat is not None else 0
+    n_levels = pres.shape[1] if pres.ndim == 2 else pres.shape[0]
+    if n_profiles == 0:
+        return pd.DataFrame()
+
+    # Profiles without a position are skipped, as are levels missing any of P/T/S
+    lat_arr = np.asarray(lat, dtype=float)
+    lon_arr = np.asarray(lon, dtype=float) if lon is not None else np.full(n_profiles, np.nan)
+    profile_ok = ~(np.isnan(lat_arr) | np.isnan(lon_arr))
+
+    pres2 = _level_grid(pres, n_profiles, n_levels, np.nan)
+    temp2 = _level_grid(arrays['temp'], n_profiles, n_levels, np.nan)
+    sal2 = _level_grid(arrays['sal'], n_profiles, n_levels, np.nan)
+    mask = profile_ok[:, None] & ~(np.isnan(pres2) | np.isnan(temp2) | np.isnan(sal2))
+
+    # Row-major nonzero keeps the (profile, level) order of the nested loop
+    prof_idx, _ = np.nonzero(mask)
+    if prof_idx.size == 0:
+        return pd.DataFrame()
+
+    def per_profile_text(values):
+        if values is None:
+            return np.full(prof_idx.size, '', dtype=object)
+        return decode_array(values)[prof_idx]
+
+    cycle_numbers = arrays['cycle_numbers']
+    if cycle_numbers is None:
+        cycles = np.full(n_profiles, '', dtype=object)
+    else:
+        cyc_valid = ~np.isnan(cycle_numbers.astype(float))
+        if cyc_valid.all():
+            cycles = cycle_numbers.astype(np.int64)
+        else:
+            cycles = np.full(n_profiles, '', dtype=object)
+            cycles[cyc_valid] = cycle_numbers[cyc_valid].astype(np.int64)
+
+    datetimes = arrays['datetimes']
+    if len(datetimes) < n_profiles:
+        datetimes = list(datetimes) + [''] * (n_profiles - len(datetimes))
+    datetimes = np.asarray(datetimes[:n_profiles], dtype=object)
+
+    columns = {
+        'profile_id': prof_idx,
+        'float_id': per_profile_text(arrays['platform_numbers']),
+        'cycle_number': cycles[prof_idx],
+        'latitude': lat[prof_idx],
+        'longitude': lon[prof_idx],
+        'datetime': datetimes[prof_idx],
+        'pressure': pres2[mask],
+        'temperature': temp2[mask],
+        'salinity': sal2[mask],
+        'pressure_qc': decode_array(_level_grid(arrays['pres_qc'], n_profiles, n_levels, '')[mask]),
+        'temperature_qc': decode_array(_level_grid(arrays['temp_qc'], n_profiles, n_levels, '')[mask]),
+        'salinity_qc': decode_array(_level_grid(arrays['sal_qc'], n_profiles, n_levels, '')[mask]),
+        'project_name': per_profile_text(arrays['project_names']),
+        'pi_name': per_profile_text(arrays['pi_names']),
+        'platform_type': per_profile_text(arrays['platform_types']),
+        'data_mode': per_profile_text(arrays['data_modes']),
+        'data_centre': per_profile_text(arrays['data_centres']),
+    }
+
+    # Add BGC columns (and their QC flags) in detection order
+    bgc_qc_vars = arrays['bgc_qc_vars']
+    for name, arr in arrays['bgc_vars'].items():
+        columns[name] = _level_grid(arr, n_profiles, n_levels, np.nan)[mask]
+        qc_key = f"{name}_qc"
+        if qc_key in bgc_qc_vars:
+            qc_grid = _level_grid(bgc_qc_vars[qc_key], n_profiles, n_levels, '9')
+            columns[qc_key] = decode_array(qc_grid[mask])
+
+    return pd.DataFrame(columns)
+
+
+def flatten_profiles_loop(arrays):
+    """
+    Reference implementation of `flatten_profiles` using per-profile, per-level loops.
+
+    Kept to check the vectorized flattener against (see `check_flattener_equivalence`).
+
+    Args:
+        arrays (dict): Output of `extract_profile_arrays`
+
+    Returns:
+        pd.DataFrame: One row per valid (profile, level) measurement
+    """
+    lat, lon = arrays['lat'], arrays['lon']
+    datetimes = arrays['datetimes']
+    platform_numbers, cycle_numbers = arrays['platform_numbers'], arrays['cycle_numbers']
+    pres, temp, sal = arrays['pres'], arrays['temp'], arrays['sal']
+    pres_qc, temp_qc, sal_qc = arrays['pres_qc'], arrays['temp_qc'], arrays['sal_qc']
+    project_names, pi_names = arrays['project_names'], arrays['pi_names']
+    platform_types, data_modes, data_centres = arrays['platform_types'], arrays['data_modes'], arrays['data_centres']
+    bgc_vars, bgc_qc_vars = arrays['bgc_vars'], arrays['bgc_qc_vars']
+
+    rows = []
+    n_profiles = lat.shape[0] if lat is not None else 0
+    n_levels = pres.shape[1] if pres.ndim == 2 else pres.shape[0]
+
+    for i in range(n_profiles):
+        plat, cyc = '', ''
+        if platform_numbers is not None: 
+            plat = safe_decode(platform_numbers[i])
+        if cycle_numbers is not None and not np.isnan(cycle_numbers[i]):
+            cyc = int(cycle_numbers[i])
+        
+        date_str = datetimes[i] if i < len(datetimes) else ''
+        p_lat = lat[i] if lat is not None else np.nan
+        p_lon = lon[i] if lon is not None else np.nan
+        if np.isnan(p_lat) or np.isnan(p_lon): 
+            continue
+        
+        proj = safe_decode(project_names[i]) if project_names is not None else ''
+        pi = safe_decode(pi_names[i]) if pi_names is not None else ''
+        ptype = safe_decode(platform_types[i]) if platform_types is not None else ''
+        mode = safe_decode(data_modes[i]) if data_modes is not None else ''
+        dc = safe_decode(data_centres[i]) if data_centres is not None else ''
+        
+        for j in range(n_levels):
+            pr = pres[i, j] if pres.ndim == 2 else pres[j]
+            te = temp[i, j] if temp.ndim == 2 else temp[j]
+            sa = sal[i, j] if sal.ndim == 2 else sal[j]
+            
+            if np.isnan(pr) or np.isnan(te) or np.isnan(sa): 
+                continue
+            
+            pr_qc = safe_decode(pres_qc[i, j]) if pres_qc.ndim == 2 else safe_decode(pres_qc[j])
+            te_qc = safe_decode(temp_qc[i, j]) if temp_qc.ndim == 2 else safe_decode(temp_qc[j])
+            sa_qc = safe_decode(sal_qc[i, j]) if sal_qc.ndim == 2 else safe_decode(sal_qc[j])
+            
+            row = {
+                'profile_id': i,
+                'float_id': plat,
+                'cycle_number': cyc,
+                'latitude': p_lat,
+                'longitude': p_lon,
+                'datetime': date_str,
+                'pressure': pr,
+                'temperature': te,
+                'salinity': sa,
+                'pressure_qc': pr_qc,
+                'temperature_qc': te_qc,
+                'salinity_qc': sa_qc,
+                'project_name': proj,
+                'pi_name': pi,
+                'platform_type': ptype,
+                'data_mode': mode,
+                'data_centre': dc
+            }
+            
+            # Add BGC if exists
+            for name, arr in bgc_vars.items():
+                if arr.ndim == 2:
+                    val = arr[i, j]
+                else:
+                    val = arr[j] if j < len(arr) else np.nan
+                
+                row[name] = None if np.isnan(val) else val
+                
+                # Add QC flag if available
+                qc_key = f"{name}_qc"
+                if qc_key in bgc_qc_vars:
+                    qcarr = bgc_qc_vars[qc_key]
+                    if qcarr.ndim == 2:
+                        qcval = qcarr[i, j]
+                    else:
+                        qcval = qcarr[j] if j < len(qcarr) else '9'
+                    row[qc_key] = safe_decode(qcval)
+            
+            rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+def process_netcdf_file(file_path, verbose=False, vectorized=True):
     """
     Process a single NetCDF file and return a DataFrame with ARGO profile data.
     
     Args:
         file_path (str): Path to the NetCDF file
         verbose (bool): Print debugging information
+        vectorized (bool): Use the NumPy-mask flattener (False falls back to the per-level loop)
         
     Returns:
         pd.DataFrame: Processed ARGO data or None if processing fails
@@ -36,211 +381,33 @@ def process_netcdf_file(file_path, verbose=False):
             print("Available variables:", list(ds.data_vars.keys()))
             print("Dataset dimensions:", dict(ds.dims))
 
-        # 1. Extract georeferenced 1D arrays (one per profile)
-        lat = ds['LATITUDE'].values if 'LATITUDE' in ds else None
-        lon = ds['LONGITUDE'].values if 'LONGITUDE' in ds else None
-        juld = ds['JULD'].values if 'JULD' in ds else None
-        platform_numbers = ds['PLATFORM_NUMBER'].values if 'PLATFORM_NUMBER' in ds else None
-        cycle_numbers = ds['CYCLE_NUMBER'].values if 'CYCLE_NUMBER' in ds else None
-
-        # 2. Convert JULD to list of ISO datetime strings
-        if juld is not None:
-            raw = juld
-            if np.issubdtype(raw.dtype, np.datetime64):
-                datetimes = pd.to_datetime(raw).strftime('%Y-%m-%d %H:%M:%S').tolist()
-            else:
-                datetimes = pd.to_datetime(raw, unit='D', origin='1950-01-01') \
-                              .strftime('%Y-%m-%d %H:%M:%S').tolist()
-        else:
-            datetimes = [''] * (lat.shape[0] if lat is not None else 0)
-
-        # 3. Extract core 2D measurement arrays (profiles x levels)
-        pres = ds['PRES_ADJUSTED'].values if 'PRES_ADJUSTED' in ds else ds['PRES'].values
-        temp = ds['TEMP_ADJUSTED'].values if 'TEMP_ADJUSTED' in ds else ds['TEMP'].values
-        sal = ds['PSAL_ADJUSTED'].values if 'PSAL_ADJUSTED' in ds else ds['PSAL'].values
-
-        # 4. Extract QC arrays
-        pres_qc = ds['PRES_ADJUSTED_QC'].values if 'PRES_ADJUSTED_QC' in ds else ds.get('PRES_QC', np.full_like(pres, '1')).values
-        temp_qc = ds['TEMP_ADJUSTED_QC'].values if 'TEMP_ADJUSTED_QC' in ds else ds.get('TEMP_QC', np.full_like(temp, '1')).values
-        sal_qc = ds['PSAL_ADJUSTED_QC'].values if 'PSAL_ADJUSTED_QC' in ds else ds.get('PSAL_QC', np.full_like(sal, '1')).values
-
-        # 5. Extract 1D metadata arrays
-        project_names = ds['PROJECT_NAME'].values if 'PROJECT_NAME' in ds else None
-        pi_names = ds['PI_NAME'].values if 'PI_NAME' in ds else None
-        platform_types = ds['PLATFORM_TYPE'].values if 'PLATFORM_TYPE' in ds else None
-        data_modes = ds['DATA_MODE'].values if 'DATA_MODE' in ds else None
-        data_centres = ds['DATA_CENTRE'].values if 'DATA_CENTRE' in ds else None
-
-        # 6. BGC Detection - Check what's actually available
-        if verbose:
-            print("\n=== BGC PARAMETER DETECTION ===")
-        
-        bgc_vars = {}
-        bgc_qc_vars = {}
-
-        # Extended BGC parameter list with common variations
-        all_possible_bgc = [
-            'DOXY', 'DOXY2',  # Dissolved Oxygen
-            'CHLA', 'FLUORESCENCE_CHLA',  # Chlorophyll-a
-            'NITRATE',  # Nitrate
-            'PH_IN_SITU_TOTAL', 'PH_IN_SITU_FREE',  # pH
-            'BBP700', 'BBP532',  # Backscattering
-            'CDOM', 'FDOM',  # Colored/Fluorescent Dissolved Organic Matter
-            'TURBIDITY',  # Turbidity
-            'CP660',  # Beam attenuation
-            'DOWN_IRRADIANCE412', 'DOWN_IRRADIANCE443', 'DOWN_IRRADIANCE490', 'DOWN_IRRADIANCE555',
-            'DOWNWELLING_PAR',  # Photosynthetically Available Radiation
-            'BISULFIDE',  # Hydrogen Sulfide
-            'TRANSMITTANCE_PARTICLE_BEAM_ATTENUATION660'
-        ]
-
-        # Check all variables in dataset for BGC parameters
-        available_vars = list(ds.data_vars.keys())
-        if verbose:
-            print(f"Total variables in dataset: {len(available_vars)}")
-
-        found_bgc_vars = []
-        for var in available_vars:
-            # Check if it's a BGC variable (not core P/T/S)
-            if var not in ['PRES', 'TEMP', 'PSAL', 'PRES_ADJUSTED', 'TEMP_ADJUSTED', 'PSAL_ADJUSTED']:
-                # Check if it's measurement data (has N_LEVELS dimension)
-                if hasattr(ds[var], 'dims') and 'N_LEVELS' in ds[var].dims:
-                    if not var.endswith('_QC') and not var.endswith('_ERROR'):
-                        found_bgc_vars.append(var)
-
-        if verbose:
-            print(f"Potential BGC variables found: {found_bgc_vars}")
-
-        # Extract found BGC variables
-        for var in found_bgc_vars:
-            try:
-                # Check for adjusted version first
-                adj_var = f"{var}_ADJUSTED"
-                if adj_var in ds:
-                    bgc_vars[var.lower()] = ds[adj_var].values
-                    # Look for QC flag
-                    qc_var = f"{adj_var}_QC"
-                    if qc_var in ds:
-                        bgc_qc_vars[f"{var.lower()}_qc"] = ds[qc_var].values
-                else:
-                    bgc_vars[var.lower()] = ds[var].values
-                    # Look for QC flag
-                    qc_var = f"{var}_QC"
-                    if qc_var in ds:
-                        bgc_qc_vars[f"{var.lower()}_qc"] = ds[qc_var].values
-                
-                if verbose:
-                    print(f"✅ Extracted BGC variable: {var}")
-            except Exception as e:
-                if verbose:
-                    print(f"❌ Failed to extract {var}: {e}")
-
-        if verbose:
-            print(f"\n🔬 BGC variables successfully extracted: {list(bgc_vars.keys())}")
-            print(f"📊 BGC QC variables: {list(bgc_qc_vars.keys())}")
-
-        # Check if this file has any BGC data at all
-        if not bgc_vars and verbose:
-            print("⚠️  NO BGC DATA FOUND - This appears to be a CORE-only ARGO file")
+        arrays = extract_profile_arrays(ds, verbose=verbose)
 
         # 7. Flatten into rows
-        rows = []
-        n_profiles = lat.shape[0] if lat is not None else 0
-        n_levels = pres.shape[1] if pres.ndim == 2 else pres.shape[0]
-
         if verbose:
+            n_profiles = arrays['lat'].shape[0] if arrays['lat'] is not None else 0
+            n_levels = arrays['pres'].shape[-1]
             print(f"\n📈 Processing {n_profiles} profiles with up to {n_levels} levels each...")
 
-        for i in range(n_profiles):
-            plat, cyc = '', ''
-            if platform_numbers is not None: 
-                plat = safe_decode(platform_numbers[i])
-            if cycle_numbers is not None and not np.isnan(cycle_numbers[i]):
-                cyc = int(cycle_numbers[i])
-            
-            date_str = datetimes[i] if i < len(datetimes) else ''
-            p_lat = lat[i] if lat is not None else np.nan
-            p_lon = lon[i] if lon is not None else np.nan
-            if np.isnan(p_lat) or np.isnan(p_lon): 
-                continue
-            
-            proj = safe_decode(project_names[i]) if project_names is not None else ''
-            pi = safe_decode(pi_names[i]) if pi_names is not None else ''
-            ptype = safe_decode(platform_types[i]) if platform_types is not None else ''
-            mode = safe_decode(data_modes[i]) if data_modes is not None else ''
-            dc = safe_decode(data_centres[i]) if data_centres is not None else ''
-            
-            for j in range(n_levels):
-                pr = pres[i, j] if pres.ndim == 2 else pres[j]
-                te = temp[i, j] if temp.ndim == 2 else temp[j]
-                sa = sal[i, j] if sal.ndim == 2 else sal[j]
-                
-                if np.isnan(pr) or np.isnan(te) or np.isnan(sa): 
-                    continue
-                
-                pr_qc = safe_decode(pres_qc[i, j]) if pres_qc.ndim == 2 else safe_decode(pres_qc[j])
-                te_qc = safe_decode(temp_qc[i, j]) if temp_qc.ndim == 2 else safe_decode(temp_qc[j])
-                sa_qc = safe_decode(sal_qc[i, j]) if sal_qc.ndim == 2 else safe_decode(sal_qc[j])
-                
-                row = {
-                    'profile_id': i,
-                    'float_id': plat,
-                    'cycle_number': cyc,
-                    'latitude': p_lat,
-                    'longitude': p_lon,
-                    'datetime': date_str,
-                    'pressure': pr,
-                    'temperature': te,
-                    'salinity': sa,
-                    'pressure_qc': pr_qc,
-                    'temperature_qc': te_qc,
-                    'salinity_qc': sa_qc,
-                    'project_name': proj,
-                    'pi_name': pi,
-                    'platform_type': ptype,
-                    'data_mode': mode,
-                    'data_centre': dc
-                }
-                
-                # Add BGC if exists
-                for name, arr in bgc_vars.items():
-                    if arr.ndim == 2:
-                        val = arr[i, j]
-                    else:
-                        val = arr[j] if j < len(arr) else np.nan
-                    
-                    row[name] = None if np.isnan(val) else val
-                    
-                    # Add QC flag if available
-                    qc_key = f"{name}_qc"
-                    if qc_key in bgc_qc_vars:
-                        qcarr = bgc_qc_vars[qc_key]
-                        if qcarr.ndim == 2:
-                            qcval = qcarr[i, j]
-                        else:
-                            qcval = qcarr[j] if j < len(qcarr) else '9'
-                        row[qc_key] = safe_decode(qcval)
-                
-                rows.append(row)
+        # 8. Build DataFrame
+        df = flatten_profiles(arrays) if vectorized else flatten_profiles_loop(arrays)
 
         # Close the dataset
         ds.close()
-
-        # 8. Build DataFrame
-        df = pd.DataFrame(rows)
         
         if verbose:
             print(f"\n📊 RESULTS:")
             print(f"Total measurements: {len(df)}")
             print(f"Columns: {len(df.columns)}")
-            print(f"BGC columns found: {len([col for col in df.columns if col not in ['profile_id', 'float_id', 'cycle_number', 'latitude', 'longitude', 'datetime', 'pressure', 'temperature', 'salinity', 'pressure_qc', 'temperature_qc', 'salinity_qc', 'project_name', 'pi_name', 'platform_type', 'data_mode', 'data_centre']])}")
+            print(f"BGC columns found: {len([col for col in df.columns if col not in CORE_COLUMNS])}")
 
             # Show first few datetime values
-            print(f"\nDatetime range:")
-            valid_dates = df[df['datetime'] != '']['datetime']
-            if len(valid_dates) > 0:
-                print(f"  First: {valid_dates.iloc[0]}")
-                print(f"  Last: {valid_dates.iloc[-1]}")
+            if 'datetime' in df.columns:
+                print(f"\nDatetime range:")
+                valid_dates = df[df['datetime'] != '']['datetime']
+                if len(valid_dates) > 0:
+                    print(f"  First: {valid_dates.iloc[0]}")
+                    print(f"  Last: {valid_dates.iloc[-1]}")
 
         return df
 
@@ -249,6 +416,43 @@ def process_netcdf_file(file_path, verbose=False):
         return None
 
 
+def check_flattener_equivalence(file_path, verbose=False):
+    """
+    Check that the vectorized flattener reproduces the per-level loop output for a file.
+    
+    Args:
+        file_path (str): Path to the NetCDF file
+        verbose (bool): Print timings and the first mismatch, if any
+        
+    Returns:
+        bool: True if both flatteners produce the same columns and values
+    """
+    with xr.open_dataset(file_path) as ds:
+        arrays = extract_profile_arrays(ds)
+
+        start = time.perf_counter()
+        expected = flatten_profiles_loop(arrays)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = flatten_profiles(arrays)
+        vector_time = time.perf_counter() - start
+
+    try:
+        # The loop upcasts float32 columns that contain NaN to float64; compare values, not dtypes
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    except AssertionError as e:
+        if verbose:
+            print(f"❌ Flatteners disagree on {file_path}:\n{e}")
+        return False
+
+    if verbose:
+        speedup = loop_time / vector_time if vector_time > 0 else float('inf')
+        print(f"✅ {Path(file_path).name}: {len(actual)} rows identical "
+              f"(loop {loop_time:.2f}s, vectorized {vector_time:.2f}s, {speedup:.0f}x faster)")
+    return True
+
+
 def find_netcdf_files(root_dir):
     """
     Recursively find all NetCDF files in the given directory.
@@ -302,14 +506,321 @@ def create_output_path(input_file_path, input_root, output_root):
     return str(output_dir / csv_filename)
 
 
-def process_all_argo_files():
+def parquet_file_name(input_file_path, input_root):
+    """
+    Name (without extension) of a NetCDF file's Parquet outputs inside each partition.
+    
+    Built from the path relative to the input root, like `create_output_path` keeps the
+    directory structure for CSV, so same-named files from different directories (e.g.
+    geo/indian_ocean/.../20250130_prof.nc and geo/pacific_ocean/.../20250130_prof.nc)
+    do not overwrite each other.
+    
+    Args:
+        input_file_path (str): Path to input NetCDF file
+        input_root (str): Root directory of input files
+        
+    Returns:
+        str: e.g. 'geo__indian_ocean__2025__01__20250130_prof'
     """
-    Process all NetCDF files in the argo_data directory and create corresponding CSV files.
+    relative_path = Path(input_file_path).relative_to(Path(input_root))
+    return '__'.join(relative_path.with_suffix('').parts)
+
+
+# Underscore-prefixed so Parquet dataset readers skip them in the output root
+MANIFEST_NAME = "_conversion_manifest.jsonl"
+REPORT_NAME = "_conversion_report.json"
+
+OUTPUT_FORMATS = ('csv', 'parquet')
+HIVE_DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+# Columns stored as float32 in Parquet output (BGC measurement columns are added dynamically)
+MEASUREMENT_COLUMNS = ['pressure', 'temperature', 'salinity']
+
+# Low-cardinality text columns stored as dictionary-encoded categoricals in Parquet output
+CATEGORICAL_COLUMNS = ['float_id', 'project_name', 'pi_name', 'platform_type', 'data_mode', 'data_centre']
+
+
+def to_typed_frame(df):
+    """
+    Convert a flattened profile DataFrame to the compact column types used for Parquet output.
+    
+    Measurements become float32, QC flags and per-profile metadata become categoricals,
+    `datetime` becomes a real timestamp and `cycle_number` a nullable integer.
+    
+    Args:
+        df (pd.DataFrame): Output of `process_netcdf_file`
+        
+    Returns:
+        pd.DataFrame: Typed copy of the data
+    """
+    typed = pd.DataFrame(index=df.index)
+    for col in df.columns:
+        values = df[col]
+        if col == 'profile_id':
+            typed[col] = values.astype(np.int32)
+        elif col == 'cycle_number':
+            typed[col] = pd.to_numeric(values.replace('', np.nan), errors='coerce').astype('Int32')
+        elif col == 'datetime':
+            typed[col] = pd.to_datetime(values.replace('', np.nan), errors='coerce')
+        elif col in ('latitude', 'longitude'):
+            typed[col] = values.astype(np.float64)
+        elif col in CATEGORICAL_COLUMNS or col.endswith('_qc'):
+            typed[col] = values.astype(str).astype('category')
+        elif col in MEASUREMENT_COLUMNS or col not in CORE_COLUMNS:
+            typed[col] = pd.to_numeric(values, errors='coerce').astype(np.float32)
+        else:
+            typed[col] = values
+    return typed
+
+
+def write_parquet_partitions(df, output_root, name):
+    """
+    Write a flattened profile DataFrame as typed Parquet, partitioned by year and month.
+    
+    Files are laid out as `output_root/year=YYYY/month=M/<name>.parquet` (hive style), so
+    readers can prune partitions from the path alone. Rows without a valid datetime go to
+    the `__HIVE_DEFAULT_PARTITION__` directories, which hive-aware readers read as null.
+    
+    Args:
+        df (pd.DataFrame): Output of `process_netcdf_file`
+        output_root (str): Root directory of the Parquet dataset
+        name (str): File name (without extension) used inside each partition
+        
+    Returns:
+        list: Paths of the Parquet files written
+    """
+    typed = to_typed_frame(df)
+    timestamps = typed['datetime'] if 'datetime' in typed.columns else pd.Series(pd.NaT, index=typed.index)
+    years = timestamps.dt.year.astype('Int32')
+    months = timestamps.dt.month.astype('Int32')
+    
+    written = []
+    for (year, month), part in typed.groupby([years, months], dropna=False, sort=True, observed=True):
+        year_dir = f"year={year}" if pd.notna(year) else f"year={HIVE_DEFAULT_PARTITION}"
+        month_dir = f"month={month}" if pd.notna(month) else f"month={HIVE_DEFAULT_PARTITION}"
+        part_dir = Path(output_root) / year_dir / month_dir
+        part_dir.mkdir(parents=True, exist_ok=True)
+        
+        output_path = part_dir / f"{name}.parquet"
+        # Dot-prefixed temp files are ignored by Parquet dataset readers
+        tmp_path = part_dir / f".{name}.{os.getpid()}.parquet.tmp"
+        part.reset_index(drop=True).to_parquet(tmp_path, index=False, compression='zstd')
+        os.replace(tmp_path, output_path)
+        written.append(str(output_path))
+    
+    return written
+
+
+def archive_schema(dataset):
+    """
+    Schema covering every file of a Parquet dataset.
+    
+    Files only hold the columns of their own input (a core file has no `doxy`), while a
+    dataset otherwise takes its schema from the first file it finds.
+    
+    Args:
+        dataset (pyarrow.dataset.Dataset): Dataset discovered over the archive
+        
+    Returns:
+        pyarrow.Schema: Union of the file schemas and the partition fields
+    """
+    schemas = [fragment.physical_schema for fragment in dataset.get_fragments()]
+    schemas.append(dataset.partitioning.schema)
+    return pa.unify_schemas(schemas, promote_options='permissive')
+
+
+def read_parquet_archive(root, columns=None, filters=None):
+    """
+    Read a partitioned Parquet archive written by `write_parquet_partitions`.
+    
+    Only the partitions matching `filters` and the requested `columns` are read. Columns
+    missing from some files (e.g. BGC columns in core files) are read as nulls there.
+    
+    Args:
+        root (str): Root directory of the Parquet dataset
+        columns (list): Columns to read (None reads all, including `year` and `month`)
+        filters (list): PyArrow filters, e.g. [('year', '=', 2025), ('month', 'in', [1, 2])]
+        
+    Returns:
+        pd.DataFrame: Matching rows
+    """
+    partitioning = arrow_dataset.HivePartitioning.discover(null_fallback=HIVE_DEFAULT_PARTITION)
+    dataset = arrow_dataset.dataset(root, format='parquet', partitioning=partitioning)
+    dataset = arrow_dataset.dataset(root, format='parquet', partitioning=partitioning, schema=archive_schema(dataset))
+    expression = pq.filters_to_expression(filters) if filters else None
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+
+def load_manifest(manifest_path):
+    """
+    Load the conversion manifest, keeping the latest record for each input file.
+    
+    Args:
+        manifest_path (str): Path to the JSON-lines manifest
+        
+    Returns:
+        dict: Manifest records keyed by input file path
+    """
+    records = {}
+    manifest_file = Path(manifest_path)
+    if not manifest_file.exists():
+        return records
+    
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write can leave a truncated last line; ignore it
+                continue
+            records[record['path']] = record
+    return records
+
+
+def append_manifest(manifest_path, record):
+    """Append one conversion record to the manifest and flush it to disk."""
+    with open(manifest_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def is_already_converted(nc_file, record, output_format='csv'):
+    """
+    Check whether a manifest record shows the file was converted and is unchanged since.
+    Files that held no data (status 'empty') count as converted: they have no outputs to check.
+    
+    Args:
+        nc_file (str): Path to the NetCDF file
+        record (dict): Manifest record for the file, or None
+        output_format (str): Format the current run writes
+        
+    Returns:
+        bool: True if the file can be skipped
+    """
+    if not record or record.get('status') not in ('ok', 'empty'):
+        return False
+    if record.get('format', 'csv') != output_format:
+        return False
+    stat = Path(nc_file).stat()
+    if record.get('size') != stat.st_size or record.get('mtime') != stat.st_mtime:
+        return False
+    if record['status'] == 'empty':
+        return True
+    outputs = record.get('outputs') or []
+    return bool(outputs) and all(Path(output_path).exists() for output_path in outputs)
+
+
+def remove_stale_outputs(previous_outputs, outputs):
+    """
+    Delete the outputs of an earlier conversion of a file that the new one did not rewrite.
+    
+    Args:
+        previous_outputs (list): Output paths recorded in the file's previous manifest record
+        outputs (list): Output paths written now
+    """
+    for output_path in set(previous_outputs or []) - set(outputs):
+        Path(output_path).unlink(missing_ok=True)
+
+
+def previous_outputs(record, output_format):
+    """Outputs recorded for a file by an earlier conversion to the same format."""
+    if not record or record.get('format', 'csv') != output_format:
+        return []
+    return record.get('outputs') or []
+
+
+def convert_netcdf_file(nc_file, input_root, output_root, output_format='csv', previous_outputs=None):
+    """
+    Convert one NetCDF file to CSV or partitioned Parquet. Runs inside a worker process.
+    
+    Args:
+        nc_file (str): Path to the NetCDF file
+        input_root (str): Root directory of input files
+        output_root (str): Root directory for output files
+        output_format (str): 'csv' or 'parquet'
+        previous_outputs (list): Outputs of the file's previous conversion in this format; those
+            not written again (e.g. months the file no longer covers) are deleted
+        
+    Returns:
+        dict: Manifest record (path, size, mtime, format, status, rows, duration, outputs, error)
+    """
+    start = time.perf_counter()
+    stat = Path(nc_file).stat()
+    record = {
+        'path': nc_file,
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'format': output_format,
+        'status': 'failed',
+        'rows': 0,
+        'duration': 0.0,
+        'outputs': [],
+        'error': None,
+    }
+    
+    try:
+        df = process_netcdf_file(nc_file, verbose=False)
+        
+        if df is not None and not df.empty:
+            if output_format == 'parquet':
+                outputs = write_parquet_partitions(df, output_root, parquet_file_name(nc_file, input_root))
+            else:
+                output_path = create_output_path(nc_file, input_root, output_root)
+                
+                # Write to a temporary file first so a crash never leaves a half-written CSV behind
+                tmp_path = output_path + '.tmp'
+                df.to_csv(tmp_path, index=False)
+                os.replace(tmp_path, output_path)
+                outputs = [output_path]
+            
+            remove_stale_outputs(previous_outputs, outputs)
+            record.update(status='ok', rows=len(df), outputs=outputs)
+        elif df is not None:
+            remove_stale_outputs(previous_outputs, [])
+            record.update(status='empty', error='No data extracted')
+        else:
+            record['error'] = 'Could not read NetCDF file'
+            
+    except Exception as e:
+        record['error'] = str(e)
+    
+    if record['status'] == 'failed':
+        # Still on disk, and removed once a later conversion succeeds
+        record['outputs'] = list(previous_outputs or [])
+    record['duration'] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def process_all_argo_files(input_root=None, output_root=None, workers=None, force=False, output_format='csv'):
+    """
+    Process all NetCDF files in the argo_data directory and create corresponding CSV files
+    (or a year/month partitioned Parquet dataset with `output_format='parquet'`).
+    
+    Files are converted in parallel worker processes. Every finished file is appended to a
+    manifest in the output directory, so a rerun skips files that were already converted
+    and have not changed since (same size and mtime).
+    
+    Args:
+        input_root (str): Directory containing NetCDF files (default: ../../../argo_data)
+        output_root (str): Directory for output (default: utils/argo_data, or utils/argo_parquet for Parquet)
+        workers (int): Number of worker processes (default: CPU count)
+        force (bool): Reconvert every file, ignoring the manifest
+        output_format (str): 'csv' or 'parquet'
+        
+    Returns:
+        dict: Summary report of the run
     """
     # Define paths
     current_dir = Path(__file__).parent
-    input_root = current_dir.parent.parent.parent / "argo_data"
-    output_root = current_dir / "argo_data"
+    input_root = Path(input_root) if input_root else current_dir.parent.parent.parent / "argo_data"
+    default_output = current_dir / ("argo_parquet" if output_format == 'parquet' else "argo_data")
+    output_root = Path(output_root) if output_root else default_output
+    workers = workers or os.cpu_count() or 1
     
     print(f"Input directory: {input_root}")
     print(f"Output directory: {output_root}")
@@ -319,45 +830,127 @@ def process_all_argo_files():
     
     if not netcdf_files:
         print("❌ No NetCDF files found in the argo_data directory!")
-        return
+        return None
     
-    print(f"Found {len(netcdf_files)} NetCDF files to process.")
+    output_root.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_root / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
     
-    processed_count = 0
-    failed_count = 0
+    pending = [f for f in netcdf_files if force or not is_already_converted(f, manifest.get(f), output_format)]
+    skipped_count = len(netcdf_files) - len(pending)
     
-    for i, nc_file in enumerate(netcdf_files, 1):
-        try:
-            print(f"\n[{i}/{len(netcdf_files)}] Processing: {Path(nc_file).name}")
+    print(f"Found {len(netcdf_files)} NetCDF files, {skipped_count} already converted, "
+          f"{len(pending)} to process with {workers} workers.")
+    
+    records = []
+    run_start = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(convert_netcdf_file, nc_file, str(input_root), str(output_root), output_format,
+                            previous_outputs(manifest.get(nc_file), output_format)): nc_file
+            for nc_file in pending
+        }
+        for i, future in enumerate(as_completed(futures), 1):
+            nc_file = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. out of memory); record it as a failure
+                stat = Path(nc_file).stat()
+                record = {'path': nc_file, 'size': stat.st_size, 'mtime': stat.st_mtime, 'format': output_format,
+                          'status': 'failed', 'rows': 0, 'duration': 0.0,
+                          'outputs': previous_outputs(manifest.get(nc_file), output_format), 'error': str(e)}
             
-            # Process the NetCDF file
-            df = process_netcdf_file(nc_file, verbose=False)
+            append_manifest(manifest_path, record)
+            records.append(record)
             
-            if df is not None and not df.empty:
-                # Create output path
-                output_path = create_output_path(nc_file, str(input_root), str(output_root))
-                
-                # Save CSV
-                df.to_csv(output_path, index=False)
-                print(f"✅ Saved CSV: {output_path} ({len(df)} measurements)")
-                processed_count += 1
+            name = Path(nc_file).name
+            if record['status'] == 'ok':
+                print(f"✅ [{i}/{len(pending)}] {name}: {record['rows']} measurements in {record['duration']:.1f}s")
+            elif record['status'] == 'empty':
+                print(f"⚠️  [{i}/{len(pending)}] No data extracted from {name}")
             else:
-                print(f"⚠️  No data extracted from {nc_file}")
-                failed_count += 1
-                
-        except Exception as e:
-            print(f"❌ Failed to process {nc_file}: {str(e)}")
-            failed_count += 1
+                print(f"❌ [{i}/{len(pending)}] Failed to process {name}: {record['error']}")
+    
+    elapsed = time.perf_counter() - run_start
+    report = build_conversion_report(records, skipped_count, elapsed, workers)
+    
+    with open(output_root / REPORT_NAME, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
     
     print(f"\n🎉 Processing complete!")
-    print(f"✅ Successfully processed: {processed_count} files")
-    print(f"❌ Failed to process: {failed_count} files")
+    print(f"✅ Successfully processed: {report['processed']} files")
+    print(f"⏭️  Skipped (already converted): {report['skipped']} files")
+    print(f"⚠️  Empty: {report['empty']} files")
+    print(f"❌ Failed to process: {report['failed']} files")
+    print(f"📊 Rows written: {report['rows']:,} in {report['elapsed_seconds']:.1f}s "
+          f"({report['files_per_second']:.2f} files/s, {report['rows_per_second']:,.0f} rows/s)")
+    for failure in report['failures']:
+        print(f"   ❌ {failure['path']}: {failure['error']}")
     print(f"📁 Output directory: {output_root}")
+    
+    return report
+
+
+def build_conversion_report(records, skipped_count, elapsed, workers):
+    """
+    Summarize throughput and failures of a conversion run.
+    
+    Args:
+        records (list): Manifest records produced during this run
+        skipped_count (int): Files skipped because they were already converted
+        elapsed (float): Wall-clock duration of the run in seconds
+        workers (int): Number of worker processes used
+        
+    Returns:
+        dict: Summary report
+    """
+    ok = [r for r in records if r['status'] == 'ok']
+    total_rows = sum(r['rows'] for r in ok)
+    total_bytes = sum(r['size'] for r in records)
+    
+    return {
+        'finished_at': datetime.now().isoformat(timespec='seconds'),
+        'workers': workers,
+        'attempted': len(records),
+        'processed': len(ok),
+        'skipped': skipped_count,
+        'empty': sum(1 for r in records if r['status'] == 'empty'),
+        'failed': sum(1 for r in records if r['status'] == 'failed'),
+        'rows': total_rows,
+        'elapsed_seconds': round(elapsed, 3),
+        'files_per_second': len(records) / elapsed if elapsed > 0 else 0.0,
+        'rows_per_second': total_rows / elapsed if elapsed > 0 else 0.0,
+        'megabytes_per_second': total_bytes / 1e6 / elapsed if elapsed > 0 else 0.0,
+        'mean_file_seconds': sum(r['duration'] for r in records) / len(records) if records else 0.0,
+        'failures': [{'path': r['path'], 'error': r['error']} for r in records if r['status'] == 'failed'],
+    }
 
 
 if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Convert ARGO NetCDF profile files to CSV.")
+    parser.add_argument('--input', help="Directory containing NetCDF files")
+    parser.add_argument('--output', help="Directory for the converted files")
+    parser.add_argument('--workers', type=int, default=None, help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="Reconvert files already recorded in the manifest")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv',
+                        help="Write one CSV per file, or typed Parquet partitioned by year/month")
+    parser.add_argument('--check', nargs='+', metavar='NC_FILE',
+                        help="Compare the vectorized flattener against the per-level loop for these files")
+    args = parser.parse_args()
+
+    if args.check:
+        results = [check_flattener_equivalence(nc_file, verbose=True) for nc_file in args.check]
+        sys.exit(0 if all(results) else 1)
+
     # Process all ARGO files
-    process_all_argo_files()
+    report = process_all_argo_files(args.input, args.output, workers=args.workers, force=args.force,
+                                    output_format=args.format)
+    sys.exit(1 if report is None or report['failed'] else 0)
     
     # Alternatively, you can process a single file like this:
     # df = process_netcdf_file('20250101_prof.nc', verbose=True)
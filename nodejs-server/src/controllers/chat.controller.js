@@ -39,9 +39,14 @@ export const postMessage = async (req, res) => {
         const context = chat.messages.length > 5 ? chat.messages.slice(-5) : chat.messages;
         const contextMessage = context.map(msg => `User Message: ${msg.userMessage}\nAI Message: ${msg.AIMessage}`).join("\n");
         console.log("Context for AI:", contextMessage);
+        // The FastAPI server keeps the chat's history per user and chat id; the text
+        // context is only used when it has none (eg. after a restart)
         const response = await axiosInstance.post('/chat', {
             request: {
-                message: `Context: ${contextMessage}\n Query: ${message}`,
+                message,
+                context: contextMessage,
+                chat_id: String(chatId),
+                user_id: String(userId),
                 deps: {
                     mode: mode || 0
                 }
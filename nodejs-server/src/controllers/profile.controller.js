@@ -13,7 +13,7 @@ export const getProfile = async (req, res) => {
     project_name,
     platform_type
 FROM argo_profiles
-WHERE DATE(datetime) = $1
+WHERE datetime >= $1::date AND datetime < $1::date + 1
 ORDER BY profile_id, pressure ASC;
     `;
     const { rows } = await pool.query(query, [date]);